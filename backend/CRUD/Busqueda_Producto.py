@@ -0,0 +1,194 @@
+# backend/CRUD/Busqueda_Producto.py
+"""
+Búsqueda de catálogo con filtros, ranking y facetas por categoría.
+
+- Postgres: full-text sobre nombre + descripcion con el índice GIN
+  ix_productos_busqueda_fts (creado en la migración indices_busqueda, db/migraciones.py).
+  La expresión de _tsvector() debe ser idéntica a la del índice.
+- Otros motores (SQLite en local/tests): índice invertido en memoria,
+  reconstruido cuando cambia la "versión" del catálogo (count + max updated_at).
+"""
+import re
+import threading
+import unicodedata
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import func, literal_column
+from sqlmodel import Session, select
+
+from backend.Modelos.Producto import Producto
+from backend.Modelos.Tienda import Tienda
+
+_TS_CONFIG = literal_column("'spanish'::regconfig")
+
+
+@dataclass
+class FiltrosBusqueda:
+    q: Optional[str] = None
+    precio_min: Optional[float] = None
+    precio_max: Optional[float] = None
+    category_id: Optional[int] = None
+    tienda: Optional[str] = None  # slug
+    destacado: Optional[bool] = None
+    en_stock: bool = False
+
+
+@dataclass
+class ResultadoBusqueda:
+    total: int
+    productos: List[Producto]
+    facetas: Dict[Optional[int], int] = field(default_factory=dict)
+
+
+def _tsvector():
+    return func.to_tsvector(
+        _TS_CONFIG,
+        func.coalesce(Producto.nombre, "") + " " + func.coalesce(Producto.descripcion, ""),
+    )
+
+
+def _condiciones(f: FiltrosBusqueda, con_categoria: bool = True) -> list:
+    """Filtros estructurados (todo menos el texto)."""
+    conds = []
+    if f.precio_min is not None:
+        conds.append(Producto.precio >= f.precio_min)
+    if f.precio_max is not None:
+        conds.append(Producto.precio <= f.precio_max)
+    if con_categoria and f.category_id is not None:
+        conds.append(Producto.category_id == f.category_id)
+    if f.tienda:
+        vendedor_de_tienda = select(Tienda.vendedor_id).where(Tienda.slug == f.tienda)
+        conds.append(Producto.vendedor_id == vendedor_de_tienda.scalar_subquery())
+    if f.destacado is not None:
+        conds.append(Producto.destacado == f.destacado)
+    if f.en_stock:
+        conds.append(Producto.stock > 0)
+    return conds
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Postgres: tsvector + ts_rank
+# ──────────────────────────────────────────────────────────────────────────────
+def _buscar_postgres(session: Session, f: FiltrosBusqueda, limit: int, offset: int) -> ResultadoBusqueda:
+    texto = []
+    rank = None
+    if f.q and f.q.strip():
+        tsquery = func.websearch_to_tsquery(_TS_CONFIG, f.q)
+        texto.append(_tsvector().op("@@")(tsquery))
+        rank = func.ts_rank(_tsvector(), tsquery)
+
+    conds = texto + _condiciones(f)
+    total = session.exec(select(func.count()).select_from(Producto).where(*conds)).one()
+
+    facet_stmt = (
+        select(Producto.category_id, func.count())
+        .where(*texto, *_condiciones(f, con_categoria=False))
+        .group_by(Producto.category_id)
+    )
+    facetas = {cat: n for cat, n in session.exec(facet_stmt).all()}
+
+    orden = [Producto.created_at.desc(), Producto.id.desc()]
+    if rank is not None:
+        orden.insert(0, rank.desc())
+    stmt = select(Producto).where(*conds).order_by(*orden).offset(offset).limit(limit)
+    return ResultadoBusqueda(total=total, productos=session.exec(stmt).all(), facetas=facetas)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Fallback: índice invertido en memoria
+# ──────────────────────────────────────────────────────────────────────────────
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenizar(texto: Optional[str]) -> List[str]:
+    if not texto:
+        return []
+    plano = unicodedata.normalize("NFKD", texto.lower())
+    plano = "".join(c for c in plano if not unicodedata.combining(c))
+    return _TOKEN_RE.findall(plano)
+
+
+class IndiceInvertido:
+    """token -> {producto_id: peso}. Nombre pesa el doble que descripción."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version: Optional[Tuple] = None
+        self._postings: Dict[str, Dict[int, int]] = {}
+
+    def _reconstruir(self, session: Session) -> None:
+        postings: Dict[str, Dict[int, int]] = defaultdict(dict)
+        rows = session.exec(select(Producto.id, Producto.nombre, Producto.descripcion)).all()
+        for pid, nombre, descripcion in rows:
+            for peso, texto in ((2, nombre), (1, descripcion)):
+                for tok in tokenizar(texto):
+                    postings[tok][pid] = postings[tok].get(pid, 0) + peso
+        self._postings = dict(postings)
+
+    def asegurar(self, session: Session) -> None:
+        version = tuple(session.exec(select(func.count(), func.max(Producto.updated_at))).one())
+        with self._lock:
+            if version != self._version:
+                self._reconstruir(session)
+                self._version = version
+
+    def invalidar(self) -> None:
+        with self._lock:
+            self._version = None
+
+    def puntajes(self, q: str) -> Dict[int, int]:
+        """AND de todos los tokens; puntaje = suma de pesos."""
+        tokens = tokenizar(q)
+        if not tokens:
+            return {}
+        listas = [self._postings.get(t, {}) for t in tokens]
+        comunes: Set[int] = set(min(listas, key=len))
+        for l in listas:
+            comunes &= l.keys()
+        return {pid: sum(l[pid] for l in listas) for pid in comunes}
+
+
+indice_invertido = IndiceInvertido()
+
+
+def _buscar_fallback(session: Session, f: FiltrosBusqueda, limit: int, offset: int) -> ResultadoBusqueda:
+    puntajes: Optional[Dict[int, int]] = None
+    if f.q and f.q.strip():
+        indice_invertido.asegurar(session)
+        puntajes = indice_invertido.puntajes(f.q)
+
+    # (id, category_id, created_at) de los que cumplen los filtros estructurados
+    stmt = select(Producto.id, Producto.category_id, Producto.created_at).where(
+        *_condiciones(f, con_categoria=False)
+    )
+    candidatos = [r for r in session.exec(stmt).all() if puntajes is None or r[0] in puntajes]
+
+    facetas = Counter(cat for _, cat, _ in candidatos)
+    if f.category_id is not None:
+        candidatos = [r for r in candidatos if r[1] == f.category_id]
+
+    candidatos.sort(
+        key=lambda r: ((puntajes or {}).get(r[0], 0), r[2], r[0]),
+        reverse=True,
+    )
+    pagina_ids = [r[0] for r in candidatos[offset: offset + limit]]
+
+    productos: List[Producto] = []
+    if pagina_ids:
+        por_id = {p.id: p for p in session.exec(select(Producto).where(Producto.id.in_(pagina_ids))).all()}
+        productos = [por_id[i] for i in pagina_ids if i in por_id]
+
+    return ResultadoBusqueda(total=len(candidatos), productos=productos, facetas=dict(facetas))
+
+
+def buscar_productos(
+    session: Session,
+    filtros: FiltrosBusqueda,
+    limit: int = 20,
+    offset: int = 0,
+) -> ResultadoBusqueda:
+    if session.get_bind().dialect.name == "postgresql":
+        return _buscar_postgres(session, filtros, limit, offset)
+    return _buscar_fallback(session, filtros, limit, offset)
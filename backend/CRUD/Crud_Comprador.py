@@ -1,10 +1,13 @@
 # backend/CRUD/Crud_Comprador.py
 from typing import List, Optional
 from datetime import datetime
+from sqlalchemy import func
 from sqlmodel import Session, select
 from sqlalchemy.exc import IntegrityError
 from backend.Modelos.Comprador import Comprador
+from backend.core.tokens import ROL_COMPRADOR, invalida_sesiones, revocar
 
+# password llega ya hasheado (core/contrasenas.py: con_hash en el router)
 def crear_comprador(session: Session, **data) -> Comprador:
     obj = Comprador(**data)
     try:
@@ -19,6 +22,28 @@ def crear_comprador(session: Session, **data) -> Comprador:
 def listar_compradores(session: Session) -> List[Comprador]:
     return session.exec(select(Comprador)).all()
 
+def buscar_compradores(
+    session: Session,
+    direccion: Optional[str] = None,
+    email: Optional[str] = None,
+    limit: int = 50,
+    offset: int = 0,
+    columnas: Optional[list] = None,
+) -> List[Comprador]:
+    """
+    Filtra y pagina en SQL: la memoria por request queda acotada a `limit`.
+    - email: igualdad case-insensitive (índice ix_compradores_email_lower)
+    - direccion: "contains" case-insensitive (ILIKE; índice trigram en Postgres)
+    """
+    # columnas: solo esas columnas (filas en vez de modelos), ver core/serializacion.py
+    stmt = select(*columnas) if columnas else select(Comprador)
+    if email:
+        stmt = stmt.where(func.lower(Comprador.email) == email.lower())
+    if direccion:
+        stmt = stmt.where(Comprador.direccion.icontains(direccion, autoescape=True))
+    stmt = stmt.order_by(Comprador.id).offset(offset).limit(limit)
+    return session.exec(stmt).all()
+
 def obtener_comprador(session: Session, comprador_id: int) -> Optional[Comprador]:
     return session.get(Comprador, comprador_id)
 
@@ -33,6 +58,8 @@ def actualizar_comprador(session: Session, comprador_id: int, **data) -> Optiona
         session.add(obj)
         session.commit()
         session.refresh(obj)
+        if invalida_sesiones(data):
+            revocar(ROL_COMPRADOR, obj.id)
         return obj
     except IntegrityError as e:
         session.rollback()
@@ -44,4 +71,5 @@ def eliminar_comprador(session: Session, comprador_id: int) -> bool:
         return False
     session.delete(obj)
     session.commit()
+    revocar(ROL_COMPRADOR, comprador_id)
     return True
@@ -0,0 +1,199 @@
+# backend/CRUD/Crud_Pedido.py
+from typing import List, Optional, Dict, Any, Iterable, Tuple
+from datetime import datetime
+from sqlalchemy import Integer, update
+from sqlmodel import Session, select
+from backend.db.valores import tabla_valores
+from backend.Modelos.Pedido import Pedido, PedidoDetalle
+from backend.Modelos.Producto import Producto
+from backend.Modelos.Tienda import Tienda
+
+# Campos de cabecera que se pueden editar después de crear el pedido
+_ALLOWED_UPDATE_FIELDS = {"estado", "direccion", "telefono"}
+
+ESTADO_CANCELADO = "cancelado"
+# Estados con el stock todavía reservado: cancelar desde aquí lo devuelve
+# (un pedido ya entregado no repone stock)
+ESTADOS_INICIALES = ("pendiente_pago", "pendiente_entrega")
+
+
+class StockInsuficiente(ValueError):
+    def __init__(self, producto_ids: List[int]):
+        self.producto_ids = producto_ids
+        super().__init__(f"Stock insuficiente para los productos {producto_ids}")
+
+
+# ============ STOCK ============
+def _cantidades(items: Iterable[Dict[str, Any]]) -> Dict[int, int]:
+    """producto_id -> cantidad total (un producto puede venir en varias líneas)."""
+    cantidades: Dict[int, int] = {}
+    for it in items:
+        if it["cantidad"] <= 0:
+            raise ValueError("La cantidad debe ser mayor que 0")
+        cantidades[it["producto_id"]] = cantidades.get(it["producto_id"], 0) + it["cantidad"]
+    return cantidades
+
+
+def _ajustar_stock(session: Session, cantidades: Dict[int, int], signo: int, condicional: bool):
+    """
+    UPDATE productos SET stock = stock ± v.n FROM (VALUES (id, n), ...) v
+    [WHERE stock >= v.n] RETURNING id, nombre, precio — una sola sentencia.
+    """
+    t = Producto.__table__
+    v = tabla_valores(
+        session,
+        [("id", Integer()), ("n", Integer())],
+        [(pid, cantidades[pid]) for pid in sorted(cantidades)],
+    )
+    conds = [t.c.id == v.c.id]
+    if condicional:
+        conds.append(t.c.stock >= v.c.n)
+    stmt = (
+        update(t)
+        .where(*conds)
+        .values(stock=t.c.stock + signo * v.c.n, updated_at=datetime.utcnow())
+        .returning(t.c.id, t.c.nombre, t.c.precio)
+    )
+    return session.connection().execute(stmt).all()
+
+
+def reservar_stock(session: Session, cantidades: Dict[int, int]) -> Dict[int, Tuple[str, float]]:
+    """
+    Descuenta el stock de todos los productos o de ninguno. Devuelve
+    producto_id -> (nombre, precio) vigentes, leídos en la misma sentencia.
+    Deja la transacción abierta: el llamador hace commit.
+    """
+    ids = sorted(cantidades)
+    if session.get_bind().dialect.name == "postgresql":
+        # Bloquear en orden de id evita deadlocks entre pedidos con productos en común
+        session.exec(select(Producto.id).where(Producto.id.in_(ids)).order_by(Producto.id).with_for_update()).all()
+
+    reservados = {pid: (nombre, precio) for pid, nombre, precio in _ajustar_stock(session, cantidades, -1, True)}
+    faltantes = [pid for pid in ids if pid not in reservados]
+    if faltantes:
+        session.rollback()
+        existentes = set(session.exec(select(Producto.id).where(Producto.id.in_(faltantes))).all())
+        inexistentes = [pid for pid in faltantes if pid not in existentes]
+        if inexistentes:
+            raise ValueError(f"Productos no existen: {inexistentes}")
+        raise StockInsuficiente(faltantes)
+    return reservados
+
+
+def liberar_stock(session: Session, pedido_id: int) -> None:
+    """Devuelve al stock las cantidades de un pedido. No hace commit."""
+    items = items_de_pedidos(session, [pedido_id])[pedido_id]
+    if items:
+        _ajustar_stock(session, _cantidades(it.model_dump() for it in items), +1, False)
+
+
+# ============ CREATE ============
+def crear_pedido(session: Session, items: List[Dict[str, Any]], **data) -> Pedido:
+    """
+    Reserva stock, fija nombre/precio de cada línea desde el catálogo,
+    recalcula el total e inserta cabecera + líneas, todo en una transacción.
+    Lanza StockInsuficiente (sin reservar nada) si algún producto no alcanza.
+    """
+    reservados = reservar_stock(session, _cantidades(items))
+
+    lineas = []
+    for it in items:
+        nombre, precio = reservados[it["producto_id"]]
+        lineas.append({"producto_id": it["producto_id"], "nombre": nombre, "precio": precio, "cantidad": it["cantidad"]})
+    data["total"] = round(sum(l["precio"] * l["cantidad"] for l in lineas), 2)
+
+    pedido = Pedido(**data)
+    session.add(pedido)
+    session.flush()  # asigna pedido.id sin cerrar la transacción
+
+    session.add_all([PedidoDetalle(pedido_id=pedido.id, **l) for l in lineas])
+    session.commit()
+    session.refresh(pedido)
+    return pedido
+
+
+# ============ READ ============
+def consulta_pedidos(comprador_id: Optional[int] = None):
+    """SELECT de pedidos (de un comprador, si viene), sin orden ni página."""
+    stmt = select(Pedido)
+    if comprador_id is not None:
+        stmt = stmt.where(Pedido.comprador_id == comprador_id)
+    return stmt
+
+
+def listar_pedidos(
+    session: Session,
+    comprador_id: Optional[int] = None,
+    limit: Optional[int] = None,
+    offset: int = 0,
+) -> List[Pedido]:
+    """Usa ix_pedidos_comprador_created cuando se filtra por comprador."""
+    stmt = consulta_pedidos(comprador_id).order_by(Pedido.created_at.desc(), Pedido.id.desc()).offset(offset)
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return session.exec(stmt).all()
+
+
+def obtener_pedido(session: Session, pedido_id: int) -> Optional[Pedido]:
+    return session.get(Pedido, pedido_id)
+
+
+def items_de_pedidos(session: Session, pedido_ids: Iterable[int]) -> Dict[int, List[PedidoDetalle]]:
+    """
+    Carga las líneas de varios pedidos con UNA consulta (IN sobre el índice
+    de pedido_id) y las agrupa por pedido, evitando el N+1.
+    """
+    ids = list(pedido_ids)
+    agrupados: Dict[int, List[PedidoDetalle]] = {pid: [] for pid in ids}
+    if not ids:
+        return agrupados
+
+    stmt = (
+        select(PedidoDetalle)
+        .where(PedidoDetalle.pedido_id.in_(ids))
+        .order_by(PedidoDetalle.pedido_id, PedidoDetalle.id)
+    )
+    for it in session.exec(stmt).all():
+        agrupados[it.pedido_id].append(it)
+    return agrupados
+
+
+def slugs_de_pedido(session: Session, pedido_id: int) -> List[str]:
+    """Tiendas cuyos productos aparecen en el pedido (para invalidar su caché)."""
+    stmt = (
+        select(Tienda.slug)
+        .join(Producto, Producto.vendedor_id == Tienda.vendedor_id)
+        .join(PedidoDetalle, PedidoDetalle.producto_id == Producto.id)
+        .where(PedidoDetalle.pedido_id == pedido_id)
+        .distinct()
+    )
+    return list(session.exec(stmt).all())
+
+
+# ============ UPDATE ============
+def actualizar_pedido(session: Session, pedido_id: int, **data) -> Optional[Pedido]:
+    obj = session.get(Pedido, pedido_id)
+    if not obj:
+        return None
+
+    nuevo_estado = data.get("estado")
+    if obj.estado == ESTADO_CANCELADO and nuevo_estado not in (None, ESTADO_CANCELADO):
+        raise ValueError("Un pedido cancelado no se puede reabrir")
+    if nuevo_estado == ESTADO_CANCELADO:
+        # Transición condicional: si dos cancelaciones compiten, solo una libera el stock
+        t = Pedido.__table__
+        res = session.connection().execute(
+            update(t).where(t.c.id == pedido_id, t.c.estado.in_(ESTADOS_INICIALES)).values(estado=ESTADO_CANCELADO)
+        )
+        if res.rowcount:
+            liberar_stock(session, pedido_id)
+
+    for k, v in data.items():
+        if k in _ALLOWED_UPDATE_FIELDS and v is not None:
+            setattr(obj, k, v)
+
+    obj.updated_at = datetime.utcnow()
+    session.add(obj)
+    session.commit()
+    session.refresh(obj)
+    return obj
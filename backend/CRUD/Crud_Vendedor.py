@@ -1,11 +1,16 @@
 # backend/CRUD/Crud_Vendedor.py
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterable
 from datetime import datetime
+from sqlalchemy import func
 from sqlalchemy.exc import IntegrityError
 from sqlmodel import Session, select
 from backend.Modelos import Producto, Tienda
 from backend.Modelos.Vendedor import Vendedor
 from backend.Modelos.common import EstadoCuenta
+from backend.core.cache import cache
+from backend.core.identidad import mapa_vendedores, invalidar_vendedor
+from backend.core.tokens import ROL_VENDEDOR, invalida_sesiones, revocar
+from backend.db.restricciones import mensaje_unicidad
 
 # Campos que realmente existen en el modelo de BD
 _ALLOWED_FIELDS = {"id_vendedor", "nombre", "email", "password", "estado_cuenta", "telefono"}
@@ -16,6 +21,17 @@ def _filter_allowed(data: Dict[str, Any]) -> Dict[str, Any]:
     return {k: v for k, v in data.items() if k in _ALLOWED_FIELDS}
 
 
+# Unicidad: la valida la BD (ver db/restricciones.py), no un SELECT previo
+_DUPLICADO_AL_CREAR = {
+    "uq_vendedores_id_vendedor": "Ya existe un vendedor con ese id_vendedor",
+    "uq_vendedores_email": "Ya existe un vendedor con ese email",
+}
+_DUPLICADO_AL_ACTUALIZAR = {
+    "uq_vendedores_id_vendedor": "Ya existe otro vendedor con ese id_vendedor",
+    "uq_vendedores_email": "Ya existe otro vendedor con ese email",
+}
+
+
 # ============ CREATE ============
 def crear_vendedor(session: Session, **data) -> Vendedor:
     data = _filter_allowed(data)
@@ -28,20 +44,7 @@ def crear_vendedor(session: Session, **data) -> Vendedor:
     if "password" not in data:
         raise ValueError("password es obligatorio")
 
-    # Unicidad lógica previa (mensaje más claro que el de la BD)
-    existente_id = session.exec(
-        select(Vendedor).where(Vendedor.id_vendedor == data["id_vendedor"])
-    ).first()
-    if existente_id:
-        raise ValueError("Ya existe un vendedor con ese id_vendedor")
-
-    existente_email = session.exec(
-        select(Vendedor).where(Vendedor.email == data["email"])
-    ).first()
-    if existente_email:
-        raise ValueError("Ya existe un vendedor con ese email")
-
-    obj = Vendedor(**data)
+    obj = Vendedor(**data)  # password ya hasheado (con_hash en el router)
     try:
         session.add(obj)
         session.commit()
@@ -49,8 +52,9 @@ def crear_vendedor(session: Session, **data) -> Vendedor:
         return obj
     except IntegrityError as e:
         session.rollback()
-        # Si por condiciones de carrera se disparó la constraint de la BD:
-        raise ValueError("Email o id_vendedor duplicado") from e
+        raise ValueError(mensaje_unicidad(
+            e, Vendedor.__table__, _DUPLICADO_AL_CREAR, "Email o id_vendedor duplicado"
+        )) from e
 
 
 # ============ READ ============
@@ -58,6 +62,22 @@ def listar_vendedores(session: Session) -> List[Vendedor]:
     return session.exec(select(Vendedor)).all()
 
 
+def buscar_vendedores(
+    session: Session,
+    email: Optional[str] = None,
+    limit: int = 50,
+    offset: int = 0,
+    columnas: Optional[list] = None,
+) -> List[Vendedor]:
+    """Filtra y pagina en SQL (email case-insensitive vía ix_vendedores_email_lower)."""
+    # columnas: solo esas columnas (filas en vez de modelos), ver core/serializacion.py
+    stmt = select(*columnas) if columnas else select(Vendedor)
+    if email:
+        stmt = stmt.where(func.lower(Vendedor.email) == email.lower())
+    stmt = stmt.order_by(Vendedor.id).offset(offset).limit(limit)
+    return session.exec(stmt).all()
+
+
 def obtener_vendedor(session: Session, id_vendedor: int) -> Optional[Vendedor]:
     """Busca por el ID MANUAL (id_vendedor), no por PK."""
     return session.exec(
@@ -65,12 +85,54 @@ def obtener_vendedor(session: Session, id_vendedor: int) -> Optional[Vendedor]:
     ).first()
 
 
+# ============ ID MANUAL <-> PK ============
+def resolver_vendedor_pk(session: Session, id_vendedor: int) -> Optional[int]:
+    """PK del vendedor a partir del ID MANUAL; sin consulta si ya está en el mapa."""
+    cache.sincronizar()  # aplica invalidaciones de otros workers
+    pk = mapa_vendedores.pk(id_vendedor)
+    if pk is None:
+        pk = session.exec(select(Vendedor.id).where(Vendedor.id_vendedor == id_vendedor)).first()
+        if pk is not None:
+            mapa_vendedores.guardar(id_vendedor, pk)
+    return pk
+
+
+def resolver_vendedor_pks(session: Session, ids_vendedor: Iterable[int]) -> Dict[int, int]:
+    """Varios ID MANUALES -> PK; los que falten en el mapa se traen con un solo IN."""
+    cache.sincronizar()
+    pks: Dict[int, int] = {}
+    faltan = []
+    for manual in set(ids_vendedor):
+        pk = mapa_vendedores.pk(manual)
+        if pk is None:
+            faltan.append(manual)
+        else:
+            pks[manual] = pk
+    if faltan:
+        for manual, pk in session.exec(
+            select(Vendedor.id_vendedor, Vendedor.id).where(Vendedor.id_vendedor.in_(faltan))
+        ).all():
+            mapa_vendedores.guardar(manual, pk)
+            pks[manual] = pk
+    return pks
+
+
+def id_manual_de_vendedor(session: Session, vendedor_pk: int) -> Optional[int]:
+    cache.sincronizar()
+    manual = mapa_vendedores.manual(vendedor_pk)
+    if manual is None:
+        manual = session.exec(select(Vendedor.id_vendedor).where(Vendedor.id == vendedor_pk)).first()
+        if manual is not None:
+            mapa_vendedores.guardar(manual, vendedor_pk)
+    return manual
+
+
 # ============ UPDATE ============
 def actualizar_vendedor(session: Session, id_vendedor: int, **data) -> Optional[Vendedor]:
     """
     Actualiza buscando por el ID MANUAL (id_vendedor).
     Permite cambiar email / telefono / nombre / password / estado_cuenta.
-    Si intentas cambiar id_vendedor, valida que no choque con otro registro.
+    Si el nuevo id_vendedor o email chocan con otro registro, ValueError.
     """
     obj = obtener_vendedor(session, id_vendedor)
     if not obj:
@@ -78,24 +140,6 @@ def actualizar_vendedor(session: Session, id_vendedor: int, **data) -> Optional[
 
     data = _filter_allowed(data)
 
-    # Si cambia id_vendedor, validar colisión
-    nuevo_id_v = data.get("id_vendedor")
-    if nuevo_id_v is not None and nuevo_id_v != obj.id_vendedor:
-        choque = session.exec(
-            select(Vendedor).where(Vendedor.id_vendedor == nuevo_id_v)
-        ).first()
-        if choque:
-            raise ValueError("Ya existe otro vendedor con ese id_vendedor")
-
-    # Si cambia email, validar unicidad
-    nuevo_email = data.get("email")
-    if nuevo_email is not None and nuevo_email != obj.email:
-        choque = session.exec(
-            select(Vendedor).where(Vendedor.email == nuevo_email)
-        ).first()
-        if choque:
-            raise ValueError("Ya existe otro vendedor con ese email")
-
     try:
         for k, v in data.items():
             setattr(obj, k, v)
@@ -104,10 +148,30 @@ def actualizar_vendedor(session: Session, id_vendedor: int, **data) -> Optional[
         session.add(obj)
         session.commit()
         session.refresh(obj)
+        invalidar_vendedor(id_vendedor, obj.id_vendedor)
+        if invalida_sesiones(data):
+            revocar(ROL_VENDEDOR, obj.id)
         return obj
     except IntegrityError as e:
         session.rollback()
-        raise ValueError("Email o id_vendedor duplicado") from e
+        raise ValueError(mensaje_unicidad(
+            e, Vendedor.__table__, _DUPLICADO_AL_ACTUALIZAR, "Email o id_vendedor duplicado"
+        )) from e
+
+
+def cambiar_estado_vendedor(session: Session, id_vendedor: int, estado: EstadoCuenta) -> Optional[Vendedor]:
+    vendedor = obtener_vendedor(session, id_vendedor)
+    if not vendedor:
+        return None
+    vendedor.estado_cuenta = estado
+    vendedor.updated_at = datetime.utcnow()
+    session.add(vendedor)
+    session.commit()
+    session.refresh(vendedor)
+    invalidar_vendedor(id_vendedor)
+    if estado != EstadoCuenta.activo:
+        revocar(ROL_VENDEDOR, vendedor.id)
+    return vendedor
 
 
 # ============ DELETE ============
@@ -122,33 +186,52 @@ def eliminar_vendedor(session: Session, id_vendedor: int) -> bool:
 
     # 👇 soft delete: sólo bloqueamos la cuenta, no borramos la fila
     vendedor.estado_cuenta = EstadoCuenta.bloqueado
+    vendedor.updated_at = datetime.utcnow()
     session.add(vendedor)
     session.commit()
     session.refresh(vendedor)
+    invalidar_vendedor(id_vendedor)
+    revocar(ROL_VENDEDOR, vendedor.id)
     return True
 
 def productos_de_vendedor(session: Session, id_vendedor: int):
     """
     Devuelve todos los productos que pertenecen a un vendedor,
-    recibiendo el ID MANUAL (id_vendedor).
+    recibiendo el ID MANUAL (id_vendedor). Un solo JOIN, sin traducir antes.
     """
-    vendedor = obtener_vendedor(session, id_vendedor)
-    if not vendedor:
-        return []
-
-    stmt = select(Producto).where(Producto.vendedor_id == vendedor.id)  # FK usa PK
+    stmt = (
+        select(Producto)
+        .join(Vendedor, Producto.vendedor_id == Vendedor.id)
+        .where(Vendedor.id_vendedor == id_vendedor)
+    )
     return session.exec(stmt).all()
 
 
 def tienda_de_vendedor(session: Session, id_vendedor: int):
     """
     Devuelve la tienda asociada a un vendedor (si existe),
-    recibiendo el ID MANUAL (id_vendedor).
+    recibiendo el ID MANUAL (id_vendedor). Un solo JOIN.
     """
-    vendedor = obtener_vendedor(session, id_vendedor)
-    if not vendedor:
-        return None
-
-    stmt = select(Tienda).where(Tienda.vendedor_id == vendedor.id)
+    stmt = (
+        select(Tienda)
+        .join(Vendedor, Tienda.vendedor_id == Vendedor.id)
+        .where(Vendedor.id_vendedor == id_vendedor)
+    )
     return session.exec(stmt).first()
 
+
+def vendedor_y_tienda(session: Session, id_vendedor: int):
+    """
+    (PK del vendedor, Tienda o None) con un solo LEFT JOIN, o None si el
+    vendedor no existe. Permite distinguir "no existe" de "no tiene tienda".
+    """
+    stmt = (
+        select(Vendedor.id, Tienda)
+        .outerjoin(Tienda, Tienda.vendedor_id == Vendedor.id)
+        .where(Vendedor.id_vendedor == id_vendedor)
+    )
+    fila = session.exec(stmt).first()
+    if fila is not None:
+        mapa_vendedores.guardar(id_vendedor, fila[0])
+    return fila
+
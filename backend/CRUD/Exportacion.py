@@ -0,0 +1,85 @@
+# backend/CRUD/Exportacion.py
+"""
+Exportación completa (o incremental por updated_at) de productos,
+compradores y pedidos, en lotes con memoria constante.
+
+Las filas se leen con un cursor del lado servidor (stream_results + yield_per:
+en Postgres un cursor con nombre, no se materializa el resultado) y se
+entregan en lotes de TAMANO_LOTE dicts. Orden (updated_at, id): un cliente
+que sincroniza guarda el último updated_at y lo pasa como ``updated_since``.
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+
+from sqlmodel import Session, select
+
+from backend.Modelos.Comprador import Comprador
+from backend.Modelos.Pedido import Pedido, PedidoDetalle
+from backend.Modelos.Producto import Producto
+
+TAMANO_LOTE = 1000
+
+
+@dataclass(frozen=True)
+class Entidad:
+    modelo: type
+    campos: List[str]
+
+
+# Columnas exportadas (nunca password)
+ENTIDADES: Dict[str, Entidad] = {
+    "productos": Entidad(Producto, [
+        "id", "vendedor_id", "nombre", "descripcion", "precio", "stock", "category_id",
+        "external_id", "source", "imagen_url", "destacado", "created_at", "updated_at",
+    ]),
+    "compradores": Entidad(Comprador, [
+        "id", "id_comprador", "nombre", "email", "estado_cuenta", "direccion", "telefono",
+        "created_at", "updated_at",
+    ]),
+    "pedidos": Entidad(Pedido, [
+        "id", "comprador_id", "nombre_cliente", "email_cliente", "direccion", "telefono",
+        "metodo_pago", "total", "estado", "created_at", "updated_at",
+    ]),
+}
+
+_CAMPOS_ITEM = ["producto_id", "nombre", "precio", "cantidad"]
+
+
+def _items_por_pedido(session: Session, pedido_ids: List[int]) -> Dict[int, List[dict]]:
+    agrupados: Dict[int, List[dict]] = {pid: [] for pid in pedido_ids}
+    stmt = (
+        select(PedidoDetalle.pedido_id, *(getattr(PedidoDetalle, c) for c in _CAMPOS_ITEM))
+        .where(PedidoDetalle.pedido_id.in_(pedido_ids))
+        .order_by(PedidoDetalle.pedido_id, PedidoDetalle.id)
+    )
+    for pedido_id, *valores in session.exec(stmt).all():
+        agrupados[pedido_id].append(dict(zip(_CAMPOS_ITEM, valores)))
+    return agrupados
+
+
+def exportar_lotes(
+    session: Session,
+    entidad: str,
+    updated_since: Optional[datetime] = None,
+    tamano_lote: int = TAMANO_LOTE,
+) -> Iterator[List[dict]]:
+    """Lotes de dicts de ``entidad``; los pedidos traen sus ``items`` (un IN por lote)."""
+    e = ENTIDADES[entidad]
+    stmt = select(*(getattr(e.modelo, c) for c in e.campos))
+    if updated_since is not None:
+        stmt = stmt.where(e.modelo.updated_at >= updated_since)
+    stmt = stmt.order_by(e.modelo.updated_at, e.modelo.id)
+
+    conn = session.connection(execution_options={"stream_results": True, "yield_per": tamano_lote})
+    result = conn.execute(stmt)
+    try:
+        for filas in result.partitions():
+            lote = [dict(zip(e.campos, f)) for f in filas]
+            if entidad == "pedidos":
+                items = _items_por_pedido(session, [p["id"] for p in lote])
+                for p in lote:
+                    p["items"] = items[p["id"]]
+            yield lote
+    finally:
+        result.close()
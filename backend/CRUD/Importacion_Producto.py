@@ -0,0 +1,254 @@
+# backend/CRUD/Importacion_Producto.py
+"""
+Importación masiva de productos desde CSV o JSONL.
+
+Las filas se leen en streaming y se procesan por lotes:
+- los id_vendedor (manuales) del lote se resuelven con UNA consulta IN;
+- el lote se escribe con un INSERT ... ON CONFLICT ejecutado por lotes
+  (vendedor_id, source, external_id) DO UPDATE, así reimportar el mismo
+  catálogo actualiza en vez de duplicar;
+- si el lote choca con la BD (p. ej. category_id inexistente o un valor
+  fuera de rango) se reintenta fila por fila con SAVEPOINT para reportar
+  exactamente qué filas fallaron;
+- un archivo que no es UTF-8 se reporta como error en la fila donde se cortó.
+"""
+import csv
+import json
+import math
+from dataclasses import dataclass, field
+from datetime import datetime
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import DataError, IntegrityError
+from sqlmodel import Session
+
+from backend.Modelos.Producto import Producto
+from backend.CRUD.Crud_Vendedor import resolver_vendedor_pks
+
+TAMANO_LOTE = 1000
+MAX_ERRORES_REPORTADOS = 1000
+
+_CLAVE_UPSERT = ["vendedor_id", "source", "external_id"]
+# En UNIQUE, NULL nunca choca con NULL: sin source fijo, reimportar duplicaría
+SOURCE_POR_DEFECTO = ""
+_COLUMNAS_ACTUALIZABLES = [
+    "nombre", "descripcion", "precio", "stock", "category_id", "imagen_url", "destacado", "updated_at",
+]
+_VERDADERO = {"1", "true", "t", "si", "sí", "s", "yes", "y"}
+_MAX_ENTERO = 2**31 - 1  # INTEGER de Postgres
+_NO_UTF8 = "El archivo no está en UTF-8: se importó hasta la fila anterior"
+
+
+@dataclass
+class ResultadoImportacion:
+    filas: int = 0
+    escritas: int = 0
+    errores: List[Dict[str, Any]] = field(default_factory=list)
+    total_errores: int = 0
+    lotes: int = 0
+
+    def error(self, fila: int, mensaje: str) -> None:
+        self.total_errores += 1
+        if len(self.errores) < MAX_ERRORES_REPORTADOS:
+            self.errores.append({"fila": fila, "error": mensaje})
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Lectura
+# ──────────────────────────────────────────────────────────────────────────────
+def leer_csv(texto: TextIO) -> Iterator[Tuple[int, Any]]:
+    """(número de fila, dict) — la fila 1 es el encabezado."""
+    n = 1
+    try:
+        for n, fila in enumerate(csv.DictReader(texto), start=2):
+            yield n, fila
+    except UnicodeDecodeError:
+        # El decodificador lee por bloques: no se puede seguir después del byte malo
+        yield n + 1, ValueError(_NO_UTF8)
+
+
+def leer_jsonl(texto: TextIO) -> Iterator[Tuple[int, Any]]:
+    n = 0
+    try:
+        for n, linea in enumerate(texto, start=1):
+            linea = linea.strip()
+            if not linea:
+                continue
+            try:
+                yield n, json.loads(linea)
+            except json.JSONDecodeError as e:
+                yield n, ValueError(f"JSON inválido: {e.msg}")
+    except UnicodeDecodeError:
+        yield n + 1, ValueError(_NO_UTF8)
+
+
+def lector(formato: str, texto: TextIO) -> Iterator[Tuple[int, Any]]:
+    if formato == "csv":
+        return leer_csv(texto)
+    if formato == "jsonl":
+        return leer_jsonl(texto)
+    raise ValueError("formato debe ser csv o jsonl")
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Normalización de filas
+# ──────────────────────────────────────────────────────────────────────────────
+def _vacio(v: Any) -> bool:
+    return v is None or (isinstance(v, str) and v.strip() == "")
+
+
+def _texto(v: Any) -> Optional[str]:
+    return None if _vacio(v) else str(v).strip()
+
+
+def _normalizar(crudo: Dict[str, Any], id_vendedor_default: Optional[int]) -> Dict[str, Any]:
+    if not isinstance(crudo, dict):
+        raise ValueError("la fila debe ser un objeto")
+
+    nombre = _texto(crudo.get("nombre"))
+    if not nombre:
+        raise ValueError("nombre es obligatorio")
+
+    id_vendedor = crudo.get("id_vendedor")
+    try:
+        id_vendedor = id_vendedor_default if _vacio(id_vendedor) else int(id_vendedor)
+    except (TypeError, ValueError, OverflowError):
+        raise ValueError("id_vendedor debe ser un entero")
+    if id_vendedor is None:
+        raise ValueError("id_vendedor es obligatorio")
+
+    try:
+        precio = float(crudo.get("precio"))
+        stock = int(crudo.get("stock"))
+    except (TypeError, ValueError, OverflowError):
+        raise ValueError("precio y stock deben ser numéricos")
+    if not math.isfinite(precio):
+        raise ValueError("precio debe ser un número finito")
+    if precio < 0 or stock < 0:
+        raise ValueError("precio y stock no pueden ser negativos")
+
+    category_id = crudo.get("category_id")
+    try:
+        category_id = None if _vacio(category_id) else int(category_id)
+    except (TypeError, ValueError, OverflowError):
+        raise ValueError("category_id debe ser un entero")
+    if stock > _MAX_ENTERO or (category_id or 0) > _MAX_ENTERO:
+        raise ValueError("stock o category_id fuera de rango")
+
+    destacado = crudo.get("destacado")
+    if isinstance(destacado, str):
+        destacado = destacado.strip().lower() in _VERDADERO
+
+    return {
+        "id_vendedor": id_vendedor,
+        "nombre": nombre,
+        "descripcion": _texto(crudo.get("descripcion")),
+        "precio": precio,
+        "stock": stock,
+        "category_id": category_id,
+        "external_id": _texto(crudo.get("external_id")),
+        "source": _texto(crudo.get("source")) or SOURCE_POR_DEFECTO,
+        "imagen_url": _texto(crudo.get("imagen_url")),
+        "destacado": bool(destacado),
+    }
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Escritura
+# ──────────────────────────────────────────────────────────────────────────────
+def _upsert(session: Session):
+    """
+    INSERT ... ON CONFLICT sobre la tabla Core (sin maquinaria ORM), compilado
+    una vez y cacheado. Ejecutado con una lista de filas, SQLAlchemy lo envía
+    como INSERT multi-fila en páginas ("insertmanyvalues") en Postgres y como
+    executemany en SQLite.
+    """
+    dialecto = session.get_bind().dialect.name
+    if dialecto == "postgresql":
+        insert = postgresql.insert
+    elif dialecto == "sqlite":
+        insert = sqlite.insert
+    else:
+        raise RuntimeError(f"Importación masiva no soportada en {dialecto}")
+
+    stmt = insert(Producto.__table__)
+    return stmt.on_conflict_do_update(
+        index_elements=_CLAVE_UPSERT,
+        set_={c: stmt.excluded[c] for c in _COLUMNAS_ACTUALIZABLES},
+    )
+
+
+def _procesar_lote(
+    session: Session,
+    lote: List[Tuple[int, Any]],
+    id_vendedor_default: Optional[int],
+    res: ResultadoImportacion,
+) -> None:
+    res.lotes += 1
+    validas: List[Tuple[int, Dict[str, Any]]] = []
+    for n, crudo in lote:
+        res.filas += 1
+        if isinstance(crudo, Exception):
+            res.error(n, str(crudo))
+            continue
+        try:
+            validas.append((n, _normalizar(crudo, id_vendedor_default)))
+        except ValueError as e:
+            res.error(n, str(e))
+
+    # id_vendedor manual -> PK: mapa en memoria, y una sola consulta IN para lo que falte
+    pks = resolver_vendedor_pks(session, (f["id_vendedor"] for _, f in validas))
+
+    ahora = datetime.utcnow()
+    por_clave: Dict[Any, Tuple[int, Dict[str, Any]]] = {}
+    sin_clave: List[Tuple[int, Dict[str, Any]]] = []
+    for n, f in validas:
+        pk = pks.get(f.pop("id_vendedor"))
+        if pk is None:
+            res.error(n, "Vendedor (id_vendedor) no existe")
+            continue
+        f.update(vendedor_id=pk, tenant_id=1, created_at=ahora, updated_at=ahora)
+        if f["external_id"] is None:
+            sin_clave.append((n, f))
+        else:
+            # Un mismo ON CONFLICT no puede tocar dos veces la misma fila: gana la última
+            por_clave[(pk, f["source"], f["external_id"])] = (n, f)
+
+    filas = sin_clave + list(por_clave.values())
+    if not filas:
+        return
+
+    try:
+        session.connection().execute(_upsert(session), [f for _, f in filas])
+        session.commit()
+        res.escritas += len(filas)
+    except (IntegrityError, DataError):
+        session.rollback()
+        for n, f in filas:
+            try:
+                with session.begin_nested():
+                    session.connection().execute(_upsert(session), [f])
+                res.escritas += 1
+            except IntegrityError as e:
+                res.error(n, f"Violación de FK o unicidad: {e.orig}")
+            except DataError as e:
+                res.error(n, f"Valor no válido para la BD: {e.orig}")
+        session.commit()
+
+
+def importar_productos(
+    session: Session,
+    filas: Iterable[Tuple[int, Any]],
+    id_vendedor_default: Optional[int] = None,
+    tamano_lote: int = TAMANO_LOTE,
+) -> ResultadoImportacion:
+    res = ResultadoImportacion()
+    it = iter(filas)
+    while True:
+        lote = list(islice(it, tamano_lote))
+        if not lote:
+            break
+        _procesar_lote(session, lote, id_vendedor_default, res)
+    return res
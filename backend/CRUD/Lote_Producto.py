@@ -0,0 +1,138 @@
+# backend/CRUD/Lote_Producto.py
+"""
+Actualización y borrado de productos por lotes.
+
+Un lote se valida con pocas consultas IN (ids existentes, categorías,
+vendedores) y se aplica en UNA transacción con sentencias por conjuntos:
+
+    UPDATE productos SET precio = v.precio, ...
+    FROM (VALUES (:id, :precio), ...) AS v (id, precio)
+    WHERE productos.id = v.id
+
+Los ítems se agrupan por el conjunto de campos que traen, así un cambio de
+precios de 5.000 SKUs es una sentencia por trozo de TAMANO_TROZO filas.
+Cada ítem recibe su propio código de resultado (200/204, 400, 404, 409, 422).
+"""
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import Integer, cast, delete, update
+from sqlmodel import Session, select
+
+from backend.db.valores import tabla_valores
+from backend.Modelos.Categoria import Categoria
+from backend.Modelos.Producto import Producto
+from backend.CRUD.Crud_Vendedor import resolver_vendedor_pks
+
+TAMANO_TROZO = 1000
+
+_NO_NULOS = ("nombre", "precio", "stock", "destacado")
+_NO_NEGATIVOS = ("precio", "stock")
+
+
+@dataclass
+class ResultadoItem:
+    id: int
+    status: int
+    detail: Optional[str] = None
+
+
+def _trozos(seq: Sequence, n: int = TAMANO_TROZO):
+    for i in range(0, len(seq), n):
+        yield seq[i:i + n]
+
+
+def _existentes(session: Session, ids: List[int]) -> set:
+    encontrados = set()
+    for trozo in _trozos(ids):
+        encontrados.update(session.exec(select(Producto.id).where(Producto.id.in_(trozo))).all())
+    return encontrados
+
+
+def actualizar_lote(session: Session, cambios: List[Dict[str, Any]]) -> List[ResultadoItem]:
+    """
+    ``cambios``: dicts con ``id`` y los campos a modificar (como en el PUT;
+    ``id_vendedor`` es el id manual). Devuelve un resultado por ítem, en orden.
+    Si la BD rechaza el lote (p. ej. unicidad) no se aplica nada y se propaga
+    la IntegrityError.
+    """
+    resultados: List[Optional[ResultadoItem]] = [None] * len(cambios)
+    vistos = set()
+    pendientes: List[tuple] = []  # (posición, id, campos)
+
+    for pos, item in enumerate(cambios):
+        campos = dict(item)
+        pid = campos.pop("id")
+        if pid in vistos:
+            resultados[pos] = ResultadoItem(pid, 409, "id repetido en el lote")
+            continue
+        vistos.add(pid)
+        if not campos:
+            resultados[pos] = ResultadoItem(pid, 422, "Sin campos para actualizar")
+        elif any(c in campos and campos[c] is None for c in _NO_NULOS + ("id_vendedor",)):
+            resultados[pos] = ResultadoItem(pid, 422, "nombre, precio, stock, destacado e id_vendedor no pueden ser nulos")
+        elif any(c in campos and campos[c] < 0 for c in _NO_NEGATIVOS):
+            resultados[pos] = ResultadoItem(pid, 422, "precio y stock no pueden ser negativos")
+        else:
+            pendientes.append((pos, pid, campos))
+
+    existentes = _existentes(session, [pid for _, pid, _ in pendientes])
+    cat_ids = {c["category_id"] for _, _, c in pendientes if c.get("category_id") is not None}
+    cats = set(session.exec(select(Categoria.id).where(Categoria.id.in_(cat_ids))).all()) if cat_ids else set()
+    manuales = {c["id_vendedor"] for _, _, c in pendientes if "id_vendedor" in c}
+    vendedores = resolver_vendedor_pks(session, manuales)
+
+    grupos: Dict[tuple, List[tuple]] = defaultdict(list)
+    for pos, pid, campos in pendientes:
+        if pid not in existentes:
+            resultados[pos] = ResultadoItem(pid, 404, "Producto no encontrado")
+            continue
+        if campos.get("category_id") is not None and campos["category_id"] not in cats:
+            resultados[pos] = ResultadoItem(pid, 400, "Categoría no existe")
+            continue
+        if "id_vendedor" in campos:
+            vendedor_pk = vendedores.get(campos.pop("id_vendedor"))
+            if vendedor_pk is None:
+                resultados[pos] = ResultadoItem(pid, 400, "Vendedor (id_vendedor) no existe")
+                continue
+            campos["vendedor_id"] = vendedor_pk
+        nombres = tuple(sorted(campos))
+        grupos[nombres].append((pid, *(campos[c] for c in nombres)))
+        resultados[pos] = ResultadoItem(pid, 200)
+
+    tabla = Producto.__table__
+    ahora = datetime.utcnow()
+    for nombres, filas in grupos.items():
+        for trozo in _trozos(filas):
+            columnas = [("id", Integer())] + [(c, tabla.c[c].type) for c in nombres]
+            v = tabla_valores(session, columnas, trozo)
+            stmt = (
+                update(tabla)
+                .where(tabla.c.id == v.c.id)
+                # CAST: en Postgres una columna de VALUES toda NULL queda como text
+                .values({**{c: cast(v.c[c], tabla.c[c].type) for c in nombres}, "updated_at": ahora})
+            )
+            session.connection().execute(stmt)
+    session.commit()
+    return resultados
+
+
+def eliminar_lote(session: Session, ids: List[int]) -> List[ResultadoItem]:
+    resultados: List[Optional[ResultadoItem]] = [None] * len(ids)
+    vistos = set()
+    for pos, pid in enumerate(ids):
+        if pid in vistos:
+            resultados[pos] = ResultadoItem(pid, 409, "id repetido en el lote")
+        vistos.add(pid)
+
+    existentes = _existentes(session, list(vistos))
+    for pos, pid in enumerate(ids):
+        if resultados[pos] is None:
+            resultados[pos] = ResultadoItem(pid, 204) if pid in existentes else ResultadoItem(pid, 404, "Producto no encontrado")
+
+    for trozo in _trozos(list(existentes)):
+        session.connection().execute(delete(Producto.__table__).where(Producto.__table__.c.id.in_(trozo)))
+    session.commit()
+    return resultados
@@ -0,0 +1,24 @@
+# backend/CRUD/aio/Crud_Comprador.py
+"""Versión async de las lecturas de backend/CRUD/Crud_Comprador.py (AsyncSession)."""
+from typing import List, Optional
+from sqlalchemy import func
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from backend.Modelos.Comprador import Comprador
+
+async def buscar_compradores(
+    session: AsyncSession,
+    direccion: Optional[str] = None,
+    email: Optional[str] = None,
+    limit: int = 50,
+    offset: int = 0,
+    columnas: Optional[list] = None,
+) -> List[Comprador]:
+    # columnas: solo esas columnas (filas en vez de modelos), ver core/serializacion.py
+    stmt = select(*columnas) if columnas else select(Comprador)
+    if email:
+        stmt = stmt.where(func.lower(Comprador.email) == email.lower())
+    if direccion:
+        stmt = stmt.where(Comprador.direccion.icontains(direccion, autoescape=True))
+    stmt = stmt.order_by(Comprador.id).offset(offset).limit(limit)
+    return (await session.exec(stmt)).all()
@@ -0,0 +1,34 @@
+# backend/CRUD/aio/Crud_Pedido.py
+"""Versión async de las lecturas de backend/CRUD/Crud_Pedido.py (AsyncSession)."""
+from typing import Dict, Iterable, List, Optional
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from backend.CRUD.Crud_Pedido import consulta_pedidos
+from backend.Modelos.Pedido import Pedido, PedidoDetalle
+
+
+async def listar_pedidos(
+    session: AsyncSession,
+    comprador_id: Optional[int] = None,
+    limit: Optional[int] = None,
+    offset: int = 0,
+) -> List[Pedido]:
+    stmt = consulta_pedidos(comprador_id).order_by(Pedido.created_at.desc(), Pedido.id.desc()).offset(offset)
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return (await session.exec(stmt)).all()
+
+
+async def items_de_pedidos(session: AsyncSession, pedido_ids: Iterable[int]) -> Dict[int, List[PedidoDetalle]]:
+    ids = list(pedido_ids)
+    agrupados: Dict[int, List[PedidoDetalle]] = {pid: [] for pid in ids}
+    if not ids:
+        return agrupados
+    stmt = (
+        select(PedidoDetalle)
+        .where(PedidoDetalle.pedido_id.in_(ids))
+        .order_by(PedidoDetalle.pedido_id, PedidoDetalle.id)
+    )
+    for it in (await session.exec(stmt)).all():
+        agrupados[it.pedido_id].append(it)
+    return agrupados
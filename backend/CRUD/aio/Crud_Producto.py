@@ -0,0 +1,12 @@
+# backend/CRUD/aio/Crud_Producto.py
+"""Versión async de las lecturas de backend/CRUD/Crud_Producto.py (AsyncSession)."""
+from typing import List, Optional
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from backend.Modelos.Producto import Producto
+
+async def listar_destacados(session: AsyncSession) -> List[Producto]:
+    return (await session.exec(select(Producto).where(Producto.destacado == True))).all()
+
+async def obtener_producto(session: AsyncSession, producto_id: int) -> Optional[Producto]:
+    return await session.get(Producto, producto_id)
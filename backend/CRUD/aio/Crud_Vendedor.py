@@ -0,0 +1,35 @@
+# backend/CRUD/aio/Crud_Vendedor.py
+"""Versión async de las lecturas de backend/CRUD/Crud_Vendedor.py (AsyncSession)."""
+from typing import List, Optional
+from sqlalchemy import func
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from backend.Modelos.Vendedor import Vendedor
+from backend.core.cache import cache
+from backend.core.identidad import mapa_vendedores
+
+
+async def buscar_vendedores(
+    session: AsyncSession,
+    email: Optional[str] = None,
+    limit: int = 50,
+    offset: int = 0,
+    columnas: Optional[list] = None,
+) -> List[Vendedor]:
+    # columnas: solo esas columnas (filas en vez de modelos), ver core/serializacion.py
+    stmt = select(*columnas) if columnas else select(Vendedor)
+    if email:
+        stmt = stmt.where(func.lower(Vendedor.email) == email.lower())
+    stmt = stmt.order_by(Vendedor.id).offset(offset).limit(limit)
+    return (await session.exec(stmt)).all()
+
+
+async def resolver_vendedor_pk(session: AsyncSession, id_vendedor: int) -> Optional[int]:
+    """Mismo mapa en memoria que la versión sync (Crud_Vendedor.resolver_vendedor_pk)."""
+    cache.sincronizar()
+    pk = mapa_vendedores.pk(id_vendedor)
+    if pk is None:
+        pk = (await session.exec(select(Vendedor.id).where(Vendedor.id_vendedor == id_vendedor))).first()
+        if pk is not None:
+            mapa_vendedores.guardar(id_vendedor, pk)
+    return pk
@@ -2,7 +2,7 @@
 from typing import Optional
 from datetime import datetime
 from sqlmodel import SQLModel, Field
-from sqlalchemy import UniqueConstraint
+from sqlalchemy import UniqueConstraint, Index, text
 from backend.Modelos.common import EstadoCuenta
 
 class Comprador(SQLModel, table=True):
@@ -10,6 +10,8 @@ class Comprador(SQLModel, table=True):
     __table_args__ = (
         UniqueConstraint("id_comprador", name="uq_compradores_id_comprador"),
         UniqueConstraint("email", name="uq_compradores_email"),  # <-- NUEVO (recomendado)
+        # Búsqueda de email case-insensitive: WHERE lower(email) = :email
+        Index("ix_compradores_email_lower", text("lower(email)")),
     )
 
     id: Optional[int] = Field(default=None, primary_key=True, index=True)
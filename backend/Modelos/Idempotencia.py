@@ -0,0 +1,22 @@
+# backend/Modelos/Idempotencia.py
+from __future__ import annotations
+
+from typing import Optional
+from datetime import datetime
+from sqlmodel import SQLModel, Field
+
+
+class ClaveIdempotencia(SQLModel, table=True):
+    """
+    Respuesta guardada para un Idempotency-Key (ver core/idempotencia.py).
+    status_code NULL = la petición original todavía está en curso.
+    """
+    __tablename__ = "idempotencia"
+
+    # blake2b(alcance + clave del cliente): tamaño fijo, sin datos del cliente
+    clave: str = Field(primary_key=True, max_length=32)
+    huella: str = Field(max_length=32)  # hash del cuerpo de la petición
+    status_code: Optional[int] = None
+    cuerpo: Optional[str] = None  # JSON de la respuesta
+    creada_en: datetime = Field(default_factory=datetime.utcnow)
+    expira_en: datetime = Field(index=True)
@@ -1,9 +1,9 @@
 # backend/Modelos/Pedido.py
 from __future__ import annotations
-from typing import Optional, List
+from typing import Optional
 from datetime import datetime
 from sqlmodel import SQLModel, Field
-import json
+from sqlalchemy import Index
 
 class ItemPedido(SQLModel):
     producto_id: int
@@ -21,13 +21,24 @@ class PedidoBase(SQLModel):
     estado: str = Field(default="pendiente_entrega")  # pendiente_pago, entregado, etc.
 
 class Pedido(PedidoBase, table=True):
+    # Bases con la tabla vieja (items_json, sin comprador_id/updated_at): las
+    # lleva a esta forma la migración pedidos_normalizados (db/migraciones.py)
     __tablename__ = "pedidos"
+    __table_args__ = (
+        # "pedidos de un comprador, más recientes primero" = un solo index seek
+        Index("ix_pedidos_comprador_created", "comprador_id", "created_at"),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
-    items_json: str = Field(description="JSON con los productos del pedido")
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    # ID MANUAL del comprador (id_comprador), el que guarda el frontend
+    comprador_id: int = Field(index=True)
+    created_at: datetime = Field(default_factory=datetime.utcnow, index=True)
+    updated_at: datetime = Field(default_factory=datetime.utcnow, index=True)
 
-    # helper para leer items
-    def items(self) -> List[ItemPedido]:
-        data = json.loads(self.items_json)
-        return [ItemPedido(**d) for d in data]
+
+class PedidoDetalle(ItemPedido, table=True):
+    """Línea de un pedido (tabla hija normalizada, reemplaza items_json)."""
+    __tablename__ = "pedido_items"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    pedido_id: int = Field(foreign_key="pedidos.id", index=True)
@@ -4,10 +4,15 @@ from __future__ import annotations
 from typing import Optional
 from datetime import datetime
 from sqlmodel import SQLModel, Field
+from sqlalchemy import UniqueConstraint
 
 
 class Producto(SQLModel, table=True):
     __tablename__ = "productos"
+    __table_args__ = (
+        # Clave natural de catálogos importados (upsert en /productos/bulk)
+        UniqueConstraint("vendedor_id", "source", "external_id", name="uq_productos_vendedor_source_external"),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True, index=True)
     tenant_id: int = Field(default=1, index=True)
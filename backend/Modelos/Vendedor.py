@@ -5,7 +5,7 @@ from typing import Optional
 from datetime import datetime
 
 from sqlmodel import SQLModel, Field
-from sqlalchemy import UniqueConstraint
+from sqlalchemy import UniqueConstraint, Index, text
 from backend.Modelos.common import EstadoCuenta
 
 
@@ -14,6 +14,8 @@ class Vendedor(SQLModel, table=True):
     __table_args__ = (
         UniqueConstraint("id_vendedor", name="uq_vendedores_id_vendedor"),
         UniqueConstraint("email", name="uq_vendedores_email"),
+        # Búsqueda de email case-insensitive: WHERE lower(email) = :email
+        Index("ix_vendedores_email_lower", text("lower(email)")),
     )
 
     id: Optional[int] = Field(default=None, primary_key=True, index=True)
@@ -6,10 +6,13 @@ from .Categoria import Categoria
 from .Producto import Producto
 from .Vendedor import Vendedor
 from .Tienda import Tienda
+from .Pedido import Pedido, PedidoDetalle
+from .Idempotencia import ClaveIdempotencia
 
 
 
 __all__ = [
     "Administrador", "Comprador", "Usuario",
-    "Categoria", "Producto", "Vendedor", "Tienda"
+    "Categoria", "Producto", "Vendedor", "Tienda",
+    "Pedido", "PedidoDetalle", "ClaveIdempotencia",
 ]
\ No newline at end of file
@@ -1,9 +1,15 @@
 # backend/Routers/Administradores.py
 
 from typing import Optional, List
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Response
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.exc import IntegrityError
 from sqlmodel import SQLModel, Session, select
 from backend.db.engine import get_session
+from backend.db.restricciones import mensaje_unicidad
+from backend.core.contrasenas import autenticar, con_hash
+from backend.core.paginacion import Paginacion, paginacion
+from backend.core.tokens import ROL_ADMIN, datos_sesion, emitir_token, invalida_sesiones, revocar
 from backend.Modelos.Administrador import Administrador
 from backend.Modelos.common import EstadoCuenta
 
@@ -37,75 +43,83 @@ class AdminLogin(SQLModel):
     password: str
 
 
+class AdminSesion(SQLModel):
+    id: int
+    id_admin: int
+    nombre: str
+    email: str
+    nivel_acceso: str
+    estado_cuenta: EstadoCuenta
+    token: str
+    token_type: str = "bearer"
+    expira_en: int  # epoch (s)
+
+
+def _guardar(session: Session, admin: Administrador, mensaje_duplicado: str) -> None:
+    # Email único: lo valida uq_admin_email al escribir, sin SELECT previo
+    session.add(admin)
+    try:
+        session.commit()
+    except IntegrityError as e:
+        session.rollback()
+        raise HTTPException(status_code=400, detail=mensaje_unicidad(
+            e, Administrador.__table__, {"uq_admin_email": mensaje_duplicado}, mensaje_duplicado,
+        ))
+    session.refresh(admin)
+
+
 # --------- CRUD ADMINISTRADORES ---------
 
 @router.post("/", response_model=Administrador)
-def crear_admin(
+async def crear_admin(
     data: AdminCreate,
     session: Session = Depends(get_session),
 ):
-    # Validar email único
-    existe = session.exec(
-        select(Administrador).where(Administrador.email == data.email)
-    ).first()
-    if existe:
-        raise HTTPException(status_code=400, detail="El email ya está en uso")
-
     admin = Administrador(
-        id_admin=data.id_admin,
-        nombre=data.nombre,
-        email=data.email,
-        password=data.password,
-        nivel_acceso=data.nivel_acceso,
+        **await con_hash(data.model_dump()),
         estado_cuenta=EstadoCuenta.activo,
     )
 
-    session.add(admin)
-    session.commit()
-    session.refresh(admin)
+    await run_in_threadpool(_guardar, session, admin, "El email ya está en uso")
     return admin
 
 
 @router.get("/", response_model=List[Administrador])
 def listar_administradores(
-    limit: int = 50,
-    offset: int = 0,
+    response: Response,
+    pag: Paginacion = Depends(paginacion),
     session: Session = Depends(get_session),
 ):
-    stmt = select(Administrador).offset(offset).limit(limit)
-    return session.exec(stmt).all()
+    return pag.ejecutar(session, select(Administrador), response, Administrador.id)
 
 
-@router.put("/{id_admin}", response_model=Administrador)
-def actualizar_admin(
-    id_admin: int,
-    data: AdministradorUpdate,
-    session: Session = Depends(get_session),
-):
+def _actualizar_admin(session: Session, id_admin: int, cambios: dict) -> Administrador:
     admin = session.exec(
         select(Administrador).where(Administrador.id_admin == id_admin)
     ).first()
     if not admin:
         raise HTTPException(status_code=404, detail="Administrador no encontrado")
 
-    # Si cambia el email, valida unicidad
-    if data.email and data.email != admin.email:
-        existe = session.exec(
-            select(Administrador).where(Administrador.email == data.email)
-        ).first()
-        if existe:
-            raise HTTPException(status_code=400, detail="Email ya está en uso")
-
-    # Actualiza sólo lo enviado
-    for campo, valor in data.model_dump(exclude_unset=True).items():
+    for campo, valor in cambios.items():
         setattr(admin, campo, valor)
 
-    session.add(admin)
-    session.commit()
-    session.refresh(admin)
+    _guardar(session, admin, "Email ya está en uso")
+    if invalida_sesiones(cambios):
+        revocar(ROL_ADMIN, admin.id)
     return admin
 
 
+@router.put("/{id_admin}", response_model=Administrador)
+async def actualizar_admin(
+    id_admin: int,
+    data: AdministradorUpdate,
+    session: Session = Depends(get_session),
+):
+    # Actualiza sólo lo enviado; el hash va al pool de contraseñas
+    cambios = await con_hash(data.model_dump(exclude_unset=True))
+    return await run_in_threadpool(_actualizar_admin, session, id_admin, cambios)
+
+
 @router.patch("/{id_admin}/estado", response_model=Administrador)
 def cambiar_estado_admin(
     id_admin: int,
@@ -122,6 +136,8 @@ def cambiar_estado_admin(
     session.add(admin)
     session.commit()
     session.refresh(admin)
+    if payload.estado_cuenta != EstadoCuenta.activo:
+        revocar(ROL_ADMIN, admin.id)
     return admin
 
 
@@ -139,24 +155,23 @@ def desactivar_admin(
     admin.estado_cuenta = EstadoCuenta.bloqueado
     session.add(admin)
     session.commit()
+    revocar(ROL_ADMIN, admin.id)
     return {"message": f"Administrador {admin.nombre} desactivado"}
 
 
 # --------- LOGIN ADMIN ---------
 
-@router.post("/login", response_model=Administrador)
-def login_admin(
+@router.post("/login", response_model=AdminSesion)
+async def login_admin(
     credenciales: AdminLogin,
     session: Session = Depends(get_session),
 ):
-    admin = session.exec(
-        select(Administrador).where(Administrador.email == credenciales.email)
-    ).first()
-
-    if not admin or admin.password != credenciales.password:
+    admin = await autenticar(session, Administrador, credenciales.email, credenciales.password)
+    if not admin:
         raise HTTPException(status_code=401, detail="Credenciales inválidas")
 
     if admin.estado_cuenta != EstadoCuenta.activo:
         raise HTTPException(status_code=403, detail="Cuenta no activa")
 
-    return admin
+    token, sesion = emitir_token(ROL_ADMIN, admin.id, admin.id_admin, admin.estado_cuenta)
+    return AdminSesion(**admin.model_dump(exclude={"password"}), **datos_sesion(token, sesion))
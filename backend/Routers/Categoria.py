@@ -1,8 +1,13 @@
 # backend/Routers/Categoria.py
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
 from sqlmodel import SQLModel, Field, Session, select
 from backend.db.engine import get_session
+from backend.db.restricciones import mensaje_unicidad
+from backend.core.paginacion import Paginacion, paginacion
+from backend.core.cache import cache, clave_categorias, invalidar_categorias
 from backend.Modelos.Categoria import Categoria  # <-- solo el modelo de BD
 
 router = APIRouter(prefix="/categorias", tags=["Categorias"])
@@ -22,35 +27,49 @@ class CategoriaUpdate(SQLModel):
 class CategoriaRead(CategoriaBase):
     id: int
 
+
+def _guardar(session: Session, obj: Categoria, mensaje_duplicado: str) -> None:
+    # Nombre único: lo valida uq_categorias_nombre al escribir, sin SELECT previo
+    session.add(obj)
+    try:
+        session.commit()
+    except IntegrityError as e:
+        session.rollback()
+        raise HTTPException(status_code=400, detail=mensaje_unicidad(
+            e, Categoria.__table__, {"uq_categorias_nombre": mensaje_duplicado}, mensaje_duplicado,
+        ))
+    session.refresh(obj)
+
 # ========= Endpoints =========
 @router.post("/", response_model=CategoriaRead, status_code=status.HTTP_201_CREATED)
 def crear_categoria(payload: CategoriaCreate, session: Session = Depends(get_session)):
-    # Validar nombre único si agregaste UniqueConstraint en el modelo
-    existe = session.exec(select(Categoria).where(Categoria.nombre == payload.nombre)).first()
-    if existe:
-        raise HTTPException(status_code=400, detail="La categoría ya existe")
-
     obj = Categoria(nombre=payload.nombre, descripcion=payload.descripcion)
-    session.add(obj)
-    session.commit()
-    session.refresh(obj)
+    _guardar(session, obj, "La categoría ya existe")
+    invalidar_categorias()
     return CategoriaRead.model_validate(obj, from_attributes=True)
 
 @router.get("/", response_model=List[CategoriaRead])
 def listar_categorias(
+    response: Response,
     session: Session = Depends(get_session),
-    limit: int = Query(50, ge=1, le=200),
-    offset: int = Query(0, ge=0),
+    pag: Paginacion = Depends(paginacion),
     q: Optional[str] = Query(None, description="Filtro por nombre (contains)"),
 ):
-    stmt = select(Categoria).offset(offset).limit(limit)
-    if q:
-        # Filtro “contains” (lado Python para compatibilidad cross-DB)
-        rows = session.exec(stmt).all()
-        rows = [c for c in rows if q.lower() in c.nombre.lower()]
-    else:
-        rows = session.exec(stmt).all()
-    return [CategoriaRead.model_validate(c, from_attributes=True) for c in rows]
+    def cargar():
+        stmt = select(Categoria)
+        if q:
+            # Filtro “contains” en SQL (antes de paginar), case-insensitive cross-DB
+            stmt = stmt.where(func.lower(Categoria.nombre).contains(q.lower(), autoescape=True))
+        rows = pag.ejecutar(session, stmt, response, Categoria.id)
+        return [CategoriaRead.model_validate(c, from_attributes=True) for c in rows]
+
+    # El modo cursor depende de cabeceras de respuesta: no se cachea
+    if pag.usa_cursor:
+        return cargar()
+    return cache.obtener_o_cargar(
+        clave_categorias(pag.limit, pag.offset, q),
+        lambda: [c.model_dump(mode="json") for c in cargar()],
+    )
 
 @router.get("/{categoria_id}", response_model=CategoriaRead)
 def obtener_categoria(categoria_id: int, session: Session = Depends(get_session)):
@@ -68,20 +87,11 @@ def actualizar_categoria(
         raise HTTPException(status_code=404, detail="Categoría no encontrada")
 
     data = payload.model_dump(exclude_unset=True)
-
-    # Si se cambia el nombre, validar unicidad
-    nuevo_nombre = data.get("nombre")
-    if nuevo_nombre and nuevo_nombre != obj.nombre:
-        conflict = session.exec(select(Categoria).where(Categoria.nombre == nuevo_nombre)).first()
-        if conflict:
-            raise HTTPException(status_code=400, detail="Ya existe una categoría con ese nombre")
-
     for k, v in data.items():
         setattr(obj, k, v)
 
-    session.add(obj)
-    session.commit()
-    session.refresh(obj)
+    _guardar(session, obj, "Ya existe una categoría con ese nombre")
+    invalidar_categorias()
     return CategoriaRead.model_validate(obj, from_attributes=True)
 
 @router.delete("/{categoria_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -91,4 +101,5 @@ def eliminar_categoria(categoria_id: int, session: Session = Depends(get_session
         raise HTTPException(status_code=404, detail="Categoría no encontrada")
     session.delete(obj)
     session.commit()
+    invalidar_categorias()
     return
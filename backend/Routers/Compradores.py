@@ -1,14 +1,18 @@
 # backend/Routers/Compradores.py
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.concurrency import run_in_threadpool
 from sqlmodel import SQLModel, Session
 from backend.db.engine import get_session
 from backend.CRUD.Crud_Comprador import (
-    crear_comprador, listar_compradores, obtener_comprador,
+    crear_comprador, buscar_compradores, obtener_comprador,
     actualizar_comprador, eliminar_comprador,
 )
 from backend.Modelos.common import EstadoCuenta
 from backend.Modelos.Comprador import Comprador
+from backend.core.contrasenas import autenticar, con_hash
+from backend.core.tokens import ROL_COMPRADOR, datos_sesion, emitir_token, revocar
+from backend.core.serializacion import RespuestaJSONRapida, columnas_de, filas_a_dicts, respuesta_rapida
 from sqlmodel import select
 
 router = APIRouter(prefix="/compradores", tags=["Compradores"])
@@ -35,6 +39,11 @@ class CompradorRead(CompradorBase):
     id: int
     id_comprador: Optional[int] = None
 
+class CompradorSesion(CompradorRead):
+    token: str
+    token_type: str = "bearer"
+    expira_en: int  # epoch (s)
+
 class CompradorLogin(SQLModel):
     email: str
     password: str
@@ -44,14 +53,15 @@ class EstadoCompradorPayload(SQLModel):
 
 
 @router.post("/", response_model=CompradorRead, status_code=status.HTTP_201_CREATED)
-def create_comprador(payload: CompradorCreate, session: Session = Depends(get_session)):
+async def create_comprador(payload: CompradorCreate, session: Session = Depends(get_session)):
+    data = await con_hash(payload.model_dump(exclude_unset=True))
     try:
-        nuevo = crear_comprador(session, **payload.model_dump(exclude_unset=True))
+        nuevo = await run_in_threadpool(crear_comprador, session, **data)
         return CompradorRead.model_validate(nuevo, from_attributes=True)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
-@router.get("/", response_model=List[CompradorRead])
+@router.get("/", response_model=List[CompradorRead], response_class=RespuestaJSONRapida)
 def get_compradores(
     session: Session = Depends(get_session),
     direccion: Optional[str] = Query(None),
@@ -59,13 +69,11 @@ def get_compradores(
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
 ):
-    compradores = listar_compradores(session)
-    if direccion:
-        compradores = [c for c in compradores if (c.direccion or "").lower().find(direccion.lower()) >= 0]
-    if email:
-        compradores = [c for c in compradores if c.email.lower() == email.lower()]
-    compradores = compradores[offset: offset + limit]
-    return [CompradorRead.model_validate(c, from_attributes=True) for c in compradores]
+    filas = buscar_compradores(
+        session, direccion=direccion, email=email, limit=limit, offset=offset,
+        columnas=columnas_de(Comprador, CompradorRead),
+    )
+    return respuesta_rapida(filas_a_dicts(filas, CompradorRead.model_fields))
 
 @router.get("/{comprador_id}", response_model=CompradorRead)
 def get_comprador(comprador_id: int, session: Session = Depends(get_session)):
@@ -75,9 +83,10 @@ def get_comprador(comprador_id: int, session: Session = Depends(get_session)):
     return CompradorRead.model_validate(c, from_attributes=True)
 
 @router.put("/{comprador_id}", response_model=CompradorRead)
-def update_comprador(comprador_id: int, payload: CompradorUpdate, session: Session = Depends(get_session)):
+async def update_comprador(comprador_id: int, payload: CompradorUpdate, session: Session = Depends(get_session)):
+    data = await con_hash(payload.model_dump(exclude_unset=True))
     try:
-        actualizado = actualizar_comprador(session, comprador_id, **payload.model_dump(exclude_unset=True))
+        actualizado = await run_in_threadpool(actualizar_comprador, session, comprador_id, **data)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     if not actualizado:
@@ -91,22 +100,23 @@ def delete_comprador(comprador_id: int, session: Session = Depends(get_session))
         raise HTTPException(status_code=404, detail="Comprador no encontrado")
     return
 
-@router.post("/login", response_model=CompradorRead)
-def login_comprador(
+@router.post("/login", response_model=CompradorSesion)
+async def login_comprador(
     credenciales: CompradorLogin,
     session: Session = Depends(get_session),
 ):
-    comprador = session.exec(
-        select(Comprador).where(Comprador.email == credenciales.email)
-    ).first()
-
-    if not comprador or comprador.password != credenciales.password:
+    comprador = await autenticar(session, Comprador, credenciales.email, credenciales.password)
+    if not comprador:
         raise HTTPException(status_code=401, detail="Credenciales inválidas")
 
     if comprador.estado_cuenta != EstadoCuenta.activo:
         raise HTTPException(status_code=403, detail="Cuenta no activa")
 
-    return CompradorRead.model_validate(comprador, from_attributes=True)
+    token, sesion = emitir_token(ROL_COMPRADOR, comprador.id, comprador.id_comprador, comprador.estado_cuenta)
+    return CompradorSesion(
+        **CompradorRead.model_validate(comprador, from_attributes=True).model_dump(),
+        **datos_sesion(token, sesion),
+    )
 
 
 @router.put("/{id_comprador}/estado", response_model=Comprador)  
@@ -126,4 +136,6 @@ def cambiar_estado_comprador(
     session.add(comprador)
     session.commit()
     session.refresh(comprador)
+    if payload.estado_cuenta != EstadoCuenta.activo:
+        revocar(ROL_COMPRADOR, comprador.id)
     return comprador
\ No newline at end of file
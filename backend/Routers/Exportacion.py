@@ -0,0 +1,90 @@
+# backend/Routers/Exportacion.py
+import csv
+import io
+import zlib
+from datetime import datetime
+from typing import Iterator, Literal, Optional
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlmodel import Session
+
+from backend.db.engine import get_session
+from backend.core.serializacion import a_json
+from backend.core.tokens import ROL_ADMIN, requiere_rol
+from backend.CRUD.Exportacion import ENTIDADES, exportar_lotes
+
+# Vuelca emails, direcciones y teléfonos: solo con token de administrador
+router = APIRouter(prefix="/admin/export", tags=["Administradores"], dependencies=[Depends(requiere_rol(ROL_ADMIN))])
+
+_MEDIA = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+
+
+def _ndjson(lotes: Iterator[list]) -> Iterator[bytes]:
+    for lote in lotes:
+        yield b"".join(a_json(fila) + b"\n" for fila in lote)
+
+
+def _valor_csv(v):
+    if isinstance(v, datetime):
+        return v.isoformat()
+    if isinstance(v, list):
+        return a_json(v).decode()
+    return v
+
+
+def _csv(lotes: Iterator[list], campos: list) -> Iterator[bytes]:
+    buf = io.StringIO()
+    escritor = csv.writer(buf)
+    escritor.writerow(campos)
+    for lote in lotes:
+        escritor.writerows([_valor_csv(fila[c]) for c in campos] for fila in lote)
+        yield buf.getvalue().encode()
+        buf.seek(0)
+        buf.truncate()
+    if buf.tell():
+        yield buf.getvalue().encode()
+
+
+def _gzip(trozos: Iterator[bytes]) -> Iterator[bytes]:
+    comp = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31: formato gzip
+    for trozo in trozos:
+        salida = comp.compress(trozo)
+        if salida:
+            yield salida
+    yield comp.flush()
+
+
+@router.get("/{entidad}")
+def exportar(
+    entidad: Literal["productos", "compradores", "pedidos"],
+    formato: Literal["ndjson", "csv"] = "ndjson",
+    gzip: bool = Query(False, description="Comprimir la descarga (.gz)"),
+    updated_since: Optional[datetime] = Query(None, description="Solo filas con updated_at >= este instante (UTC)"),
+    session: Session = Depends(get_session),
+):
+    """
+    Descarga completa o incremental en streaming: NDJSON (una fila por línea;
+    los pedidos incluyen ``items``) o CSV (``items`` como JSON en una columna).
+    Memoria constante: se lee con cursor del servidor en lotes.
+    """
+    # Sesión propia sobre el mismo engine: el cuerpo se genera después de que
+    # el handler retorna y la sesión de la dependencia ya puede estar cerrada
+    bind = session.get_bind()
+
+    def generar() -> Iterator[bytes]:
+        with Session(bind) as s:
+            lotes = exportar_lotes(s, entidad, updated_since)
+            if formato == "csv":
+                campos = ENTIDADES[entidad].campos + (["items"] if entidad == "pedidos" else [])
+                trozos = _csv(lotes, campos)
+            else:
+                trozos = _ndjson(lotes)
+            yield from (_gzip(trozos) if gzip else trozos)
+
+    nombre = f"{entidad}.{formato}" + (".gz" if gzip else "")
+    return StreamingResponse(
+        generar(),
+        media_type="application/gzip" if gzip else _MEDIA[formato],
+        headers={"Content-Disposition": f'attachment; filename="{nombre}"'},
+    )
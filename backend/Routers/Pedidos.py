@@ -1,16 +1,33 @@
 # backend/Routers/Pedidos.py
 from typing import List, Optional, Literal
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
+from pydantic import BaseModel, Field
+from sqlmodel import Session
+from backend.db.engine import get_session
+from backend.core.cache import CLAVE_DESTACADOS, cache, invalidar_tienda, invalidar_validadores_productos
+from backend.core.idempotencia import ejecutar_idempotente
+from backend.core.paginacion import Paginacion, paginacion
+from backend.Modelos.Pedido import Pedido, PedidoDetalle
+from backend.CRUD.Crud_Pedido import (
+    crear_pedido as crud_crear_pedido,
+    listar_pedidos as crud_listar_pedidos,
+    actualizar_pedido as crud_actualizar_pedido,
+    consulta_pedidos,
+    items_de_pedidos,
+    slugs_de_pedido,
+    StockInsuficiente,
+    ESTADO_CANCELADO,
+)
 
 router = APIRouter(prefix="/pedidos", tags=["Pedidos"])
 
 
 class PedidoItem(BaseModel):
     producto_id: int
-    nombre: str
-    precio: float
-    cantidad: int
+    # nombre y precio se toman del catálogo al crear; lo que mande el cliente se ignora
+    nombre: Optional[str] = None
+    precio: Optional[float] = None
+    cantidad: int = Field(gt=0)
 
 
 class PedidoCreate(BaseModel):
@@ -22,13 +39,15 @@ class PedidoCreate(BaseModel):
     direccion: str
     telefono: Optional[str] = None
     metodo_pago: Literal["tarjeta", "contra_entrega"]
-    total: float
-    estado: str  # "pendiente_entrega", "entregado", etc.
+    total: Optional[float] = None  # se recalcula en el servidor
+    # Solo estados iniciales (Crud_Pedido.ESTADOS_INICIALES): entregado/cancelado llegan por PUT
+    estado: Literal["pendiente_pago", "pendiente_entrega"] = "pendiente_entrega"
     items: List[PedidoItem]
 
 
 class PedidoRead(PedidoCreate):
     id: int
+    estado: str  # "pendiente_entrega", "entregado", "cancelado", etc.
 
 
 class PedidoUpdate(BaseModel):
@@ -37,48 +56,91 @@ class PedidoUpdate(BaseModel):
     telefono: Optional[str] = None
 
 
-# “DB” en memoria solo para la simulación
-_FAKE_PEDIDOS: List[PedidoRead] = []
-_COUNTER_ID = 1
+def _invalidar_catalogo(session: Session, pedido_id: int) -> None:
+    """El pedido movió stock: destacados, validadores y las tiendas de sus productos (no todas)."""
+    cache.invalidar(CLAVE_DESTACADOS)
+    invalidar_validadores_productos()
+    invalidar_tienda(*slugs_de_pedido(session, pedido_id))
+
+
+def _to_read(pedido: Pedido, items: List[PedidoDetalle]) -> PedidoRead:
+    return PedidoRead(
+        id=pedido.id,
+        comprador_id=pedido.comprador_id,
+        nombre_cliente=pedido.nombre_cliente,
+        email_cliente=pedido.email_cliente,
+        direccion=pedido.direccion,
+        telefono=pedido.telefono,
+        metodo_pago=pedido.metodo_pago,
+        total=pedido.total,
+        estado=pedido.estado,
+        items=[
+            PedidoItem(
+                producto_id=it.producto_id,
+                nombre=it.nombre,
+                precio=it.precio,
+                cantidad=it.cantidad,
+            )
+            for it in items
+        ],
+    )
 
 
 @router.post("/", response_model=PedidoRead)
-def crear_pedido(payload: PedidoCreate):
-    global _COUNTER_ID
-
-    pedido = PedidoRead(id=_COUNTER_ID, **payload.model_dump())
-    _COUNTER_ID += 1
-    _FAKE_PEDIDOS.append(pedido)
-
-    return pedido
+def crear_pedido(
+    payload: PedidoCreate,
+    session: Session = Depends(get_session),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+):
+    def crear():
+        data = payload.model_dump()
+        items = data.pop("items")
+        if not items:
+            raise HTTPException(status_code=400, detail="El pedido no tiene items")
+        try:
+            pedido = crud_crear_pedido(session, items, **data)
+        except StockInsuficiente as e:
+            raise HTTPException(status_code=409, detail=str(e))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        _invalidar_catalogo(session, pedido.id)
+        return _to_read(pedido, items_de_pedidos(session, [pedido.id])[pedido.id])
+
+    return ejecutar_idempotente(session, idempotency_key, "POST /pedidos/", payload, crear)
 
 
 @router.get("/", response_model=List[PedidoRead])
-def listar_pedidos(comprador_id: Optional[int] = None):
+def listar_pedidos(
+    response: Response,
+    comprador_id: Optional[int] = None,
+    pag: Paginacion = Depends(paginacion),
+    session: Session = Depends(get_session),
+):
     """
     Si viene comprador_id, solo devolvemos los pedidos de ese comprador.
-    Si no viene, devolvemos todos (útil para debug o panel admin).
+    Si no viene, todos (útil para el panel admin), siempre de a una página:
+    los más recientes primero, o con ?cursor= en orden (created_at, id).
     """
-    if comprador_id is None:
-        return _FAKE_PEDIDOS
-
-    return [p for p in _FAKE_PEDIDOS if p.comprador_id == comprador_id]
+    if pag.usa_cursor:
+        pedidos = pag.ejecutar(session, consulta_pedidos(comprador_id), response, Pedido.created_at, Pedido.id)
+    else:
+        pedidos = crud_listar_pedidos(session, comprador_id=comprador_id, limit=pag.limit, offset=pag.offset)
+    items = items_de_pedidos(session, [p.id for p in pedidos])
+    return [_to_read(p, items[p.id]) for p in pedidos]
 
 
 @router.put("/{pedido_id}", response_model=PedidoRead)
-def actualizar_pedido(pedido_id: int, payload: PedidoUpdate):
-    for idx, p in enumerate(_FAKE_PEDIDOS):
-        if p.id == pedido_id:
-            data = p.model_dump()
-            if payload.estado is not None:
-                data["estado"] = payload.estado
-            if payload.direccion is not None:
-                data["direccion"] = payload.direccion
-            if payload.telefono is not None:
-                data["telefono"] = payload.telefono
-
-            actualizado = PedidoRead(**data)
-            _FAKE_PEDIDOS[idx] = actualizado
-            return actualizado
-
-    raise HTTPException(status_code=404, detail="Pedido no encontrado")
+def actualizar_pedido(
+    pedido_id: int,
+    payload: PedidoUpdate,
+    session: Session = Depends(get_session),
+):
+    try:
+        pedido = crud_actualizar_pedido(session, pedido_id, **payload.model_dump(exclude_unset=True))
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if not pedido:
+        raise HTTPException(status_code=404, detail="Pedido no encontrado")
+    if payload.estado == ESTADO_CANCELADO:
+        _invalidar_catalogo(session, pedido.id)  # se liberó stock
+    return _to_read(pedido, items_de_pedidos(session, [pedido.id])[pedido.id])
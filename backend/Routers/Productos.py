@@ -1,10 +1,25 @@
 # backend/Routers/Productos.py
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlmodel import SQLModel, Session, select
+import io
+import tempfile
+from typing import Any, Dict, List, Literal, Optional
+from datetime import datetime
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import SQLModel, Session, Field, select
 from backend.db.engine import get_session
+from backend.core.paginacion import Paginacion, paginacion
+from backend.core.cache import cache, CLAVE_DESTACADOS, clave_validadores_productos, invalidar_productos
+from backend.core.condicional import validadores, responder_condicional
+from backend.core.idempotencia import ejecutar_idempotente
+from backend.core.serializacion import RespuestaJSONRapida, columnas_de, filas_a_dicts, respuesta_rapida
 from backend.Modelos.Producto import Producto
-from backend.Modelos.Vendedor import Vendedor
+from backend.Modelos.Categoria import Categoria
+from backend.CRUD.Busqueda_Producto import FiltrosBusqueda, buscar_productos
+from backend.CRUD.Importacion_Producto import importar_productos, lector
+from backend.CRUD.Lote_Producto import actualizar_lote, eliminar_lote
+from backend.CRUD.Crud_Vendedor import resolver_vendedor_pk
 
 
 router = APIRouter(prefix="/productos", tags=["Productos"])
@@ -39,57 +54,244 @@ class ProductoRead(ProductoBase):
     id: int
     vendedor_id: int
 
+class ImportacionRead(SQLModel):
+    filas: int
+    escritas: int
+    total_errores: int
+    errores: List[Dict[str, Any]]
+    lotes: int
+
+MAX_LOTE = 10_000
+
+class ProductoLoteItem(ProductoUpdate):
+    id: int
+
+class LoteUpdate(SQLModel):
+    items: List[ProductoLoteItem] = Field(min_length=1, max_length=MAX_LOTE)
+
+class LoteDelete(SQLModel):
+    ids: List[int] = Field(min_length=1, max_length=MAX_LOTE)
+
+class ResultadoLoteItem(SQLModel):
+    id: int
+    status: int
+    detail: Optional[str] = None
+
+class LoteRead(SQLModel):
+    aplicados: int
+    errores: int
+    resultados: List[ResultadoLoteItem]
+
+def _lote_read(resultados) -> LoteRead:
+    aplicados = sum(1 for r in resultados if r.status < 300)
+    return LoteRead(
+        aplicados=aplicados,
+        errores=len(resultados) - aplicados,
+        resultados=[ResultadoLoteItem(**r.__dict__) for r in resultados],
+    )
+
+class FacetaCategoria(SQLModel):
+    category_id: Optional[int] = None
+    nombre: Optional[str] = None
+    total: int
+
+class BusquedaRead(SQLModel):
+    total: int
+    items: List[ProductoRead]
+    facetas: List[FacetaCategoria]
+
 def _resolver_vendedor_pk(session: Session, id_v_manual: int) -> int:
-    v = session.exec(select(Vendedor).where(Vendedor.id_vendedor == id_v_manual)).first()
-    if not v:
+    pk = resolver_vendedor_pk(session, id_v_manual)
+    if pk is None:
         raise HTTPException(status_code=400, detail="Vendedor (id_vendedor) no existe")
-    return v.id
+    return pk
 
 @router.post("/", response_model=ProductoRead, status_code=status.HTTP_201_CREATED)
-def crear_producto(payload: ProductoCreate, session: Session = Depends(get_session)):
-    vendedor_pk = _resolver_vendedor_pk(session, payload.id_vendedor)
-    obj = Producto(
-        nombre=payload.nombre,
-        descripcion=payload.descripcion,
-        precio=payload.precio,
-        stock=payload.stock,
-        vendedor_id=vendedor_pk,
-        category_id=payload.category_id,
-        external_id=payload.external_id,
-        source=payload.source,
-        imagen_url=payload.imagen_url,
-        destacado=payload.destacado,
-        
+def crear_producto(
+    payload: ProductoCreate,
+    session: Session = Depends(get_session),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+):
+    def crear():
+        vendedor_pk = _resolver_vendedor_pk(session, payload.id_vendedor)
+        obj = Producto(
+            nombre=payload.nombre,
+            descripcion=payload.descripcion,
+            precio=payload.precio,
+            stock=payload.stock,
+            vendedor_id=vendedor_pk,
+            category_id=payload.category_id,
+            external_id=payload.external_id,
+            source=payload.source,
+            imagen_url=payload.imagen_url,
+            destacado=payload.destacado,
+        )
+        session.add(obj)
+        session.commit()
+        session.refresh(obj)
+        invalidar_productos()
+        return ProductoRead.model_validate(obj, from_attributes=True)
+
+    return ejecutar_idempotente(
+        session, idempotency_key, "POST /productos/", payload, crear, status_code=status.HTTP_201_CREATED,
     )
-    session.add(obj)
-    session.commit()
-    session.refresh(obj)
-    return ProductoRead.model_validate(obj, from_attributes=True)
 
-@router.get("/", response_model=List[ProductoRead])
+def _formato_por_content_type(content_type: str) -> Optional[str]:
+    ct = content_type.split(";")[0].strip().lower()
+    if ct in ("text/csv", "application/csv"):
+        return "csv"
+    if ct in ("application/x-ndjson", "application/jsonl", "application/x-jsonlines"):
+        return "jsonl"
+    return None
+
+def _importar_archivo(session: Session, archivo, formato: str, id_vendedor: Optional[int]):
+    texto = io.TextIOWrapper(archivo, encoding="utf-8-sig", newline="")
+    try:
+        return importar_productos(session, lector(formato, texto), id_vendedor_default=id_vendedor)
+    finally:
+        texto.detach()
+
+@router.post("/bulk", response_model=ImportacionRead)
+async def importar_bulk(
+    request: Request,
+    formato: Optional[Literal["csv", "jsonl"]] = Query(None, description="Si no viene, se deduce del Content-Type"),
+    id_vendedor: Optional[int] = Query(None, description="id_vendedor (manual) para filas que no lo traen"),
+    session: Session = Depends(get_session),
+):
+    """
+    Cuerpo = archivo CSV (con encabezado) o JSONL, una fila por producto.
+    Se vuelca a disco mientras llega y se procesa por lotes: memoria constante.
+    """
+    formato = formato or _formato_por_content_type(request.headers.get("content-type", ""))
+    if formato is None:
+        raise HTTPException(status_code=415, detail="Use Content-Type text/csv o application/x-ndjson, o ?formato=")
+
+    with tempfile.TemporaryFile() as archivo:
+        async for chunk in request.stream():
+            archivo.write(chunk)
+        archivo.seek(0)
+        res = await run_in_threadpool(_importar_archivo, session, archivo, formato, id_vendedor)
+
+    invalidar_productos()
+    return ImportacionRead(**res.__dict__)
+
+# Rutas /batch antes de /{producto_id}
+@router.patch("/batch", response_model=LoteRead)
+def actualizar_productos_lote(payload: LoteUpdate, session: Session = Depends(get_session)):
+    """
+    Actualizaciones parciales de muchos productos en una sola transacción.
+    Cada ítem trae su código: 200, 400 (categoría/vendedor), 404, 409 (id repetido), 422.
+    """
+    try:
+        resultados = actualizar_lote(session, [i.model_dump(exclude_unset=True) for i in payload.items])
+    except IntegrityError:
+        session.rollback()
+        raise HTTPException(status_code=409, detail="El lote viola una restricción de unicidad; no se aplicó ningún cambio")
+    invalidar_productos()
+    return _lote_read(resultados)
+
+@router.delete("/batch", response_model=LoteRead)
+def eliminar_productos_lote(payload: LoteDelete, session: Session = Depends(get_session)):
+    resultados = eliminar_lote(session, payload.ids)
+    invalidar_productos()
+    return _lote_read(resultados)
+
+@router.get("/", response_model=List[ProductoRead], response_class=RespuestaJSONRapida)
 def listar_productos(
+    request: Request,
+    response: Response,
     session: Session = Depends(get_session),
-    limit: int = Query(50, ge=1, le=200),
-    offset: int = Query(0, ge=0),
+    pag: Paginacion = Depends(paginacion),
     id_vendedor: Optional[int] = Query(None, description="id_vendedor (manual)"),
 ):
-    stmt = select(Producto).offset(offset).limit(limit)
+    conds = []
     if id_vendedor is not None:
         vendedor_pk = _resolver_vendedor_pk(session, id_vendedor)
-        stmt = stmt.where(Producto.vendedor_id == vendedor_pk)
-    rows = session.exec(stmt).all()
-    return [ProductoRead.model_validate(r, from_attributes=True) for r in rows]
+        conds.append(Producto.vendedor_id == vendedor_pk)
+
+    # Validadores de la colección: max(updated_at) + count, cacheados hasta el
+    # próximo cambio de productos o de stock (invalidar_productos / pedidos)
+    def cargar():
+        total, max_updated = session.exec(
+            select(func.count(), func.max(Producto.updated_at)).select_from(Producto).where(*conds)
+        ).one()
+        return [total, max_updated.isoformat() if max_updated else None]
+
+    total, max_updated = cache.obtener_o_cargar(clave_validadores_productos(id_vendedor), cargar)
+    v = validadores(max_updated, total, id_vendedor, pag.limit, pag.offset, pag.cursor)
+    no_modificado = responder_condicional(request, response, v)
+    if no_modificado:
+        return no_modificado
+
+    # Solo las columnas de ProductoRead (+ created_at para el cursor), sin Pydantic por fila
+    stmt = select(*columnas_de(Producto, ProductoRead, Producto.created_at)).where(*conds)
+    rows = pag.ejecutar(session, stmt, response, Producto.created_at, Producto.id)
+    return respuesta_rapida(filas_a_dicts(rows, ProductoRead.model_fields), response)
 
 @router.get("/destacados", response_model=List[Producto])
 def productos_destacados(session: Session = Depends(get_session)):
-    stmt = select(Producto).where(Producto.destacado == True)
-    return session.exec(stmt).all()
+    def cargar():
+        stmt = select(Producto).where(Producto.destacado == True)
+        return [p.model_dump(mode="json") for p in session.exec(stmt).all()]
+
+    # Los modelos table=True no convierten tipos al serializar: rehidratar
+    return [Producto.model_validate(d) for d in cache.obtener_o_cargar(CLAVE_DESTACADOS, cargar)]
+
+@router.get("/search", response_model=BusquedaRead)
+def buscar(
+    session: Session = Depends(get_session),
+    q: Optional[str] = Query(None, description="Texto libre sobre nombre y descripción"),
+    precio_min: Optional[float] = Query(None, ge=0),
+    precio_max: Optional[float] = Query(None, ge=0),
+    category_id: Optional[int] = None,
+    tienda: Optional[str] = Query(None, description="slug de la tienda"),
+    destacado: Optional[bool] = None,
+    en_stock: bool = False,
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+):
+    filtros = FiltrosBusqueda(
+        q=q,
+        precio_min=precio_min,
+        precio_max=precio_max,
+        category_id=category_id,
+        tienda=tienda,
+        destacado=destacado,
+        en_stock=en_stock,
+    )
+    res = buscar_productos(session, filtros, limit=limit, offset=offset)
+
+    # Nombres de las categorías de las facetas (una consulta, pocas filas)
+    cat_ids = [c for c in res.facetas if c is not None]
+    nombres = {}
+    if cat_ids:
+        nombres = dict(session.exec(
+            select(Categoria.id, Categoria.nombre).where(Categoria.id.in_(cat_ids))
+        ).all())
+
+    facetas = [
+        FacetaCategoria(category_id=c, nombre=nombres.get(c), total=n)
+        for c, n in sorted(res.facetas.items(), key=lambda kv: -kv[1])
+    ]
+    return BusquedaRead(
+        total=res.total,
+        items=[ProductoRead.model_validate(p, from_attributes=True) for p in res.productos],
+        facetas=facetas,
+    )
 
 @router.get("/{producto_id}", response_model=ProductoRead)
-def obtener_producto(producto_id: int, session: Session = Depends(get_session)):
+def obtener_producto(
+    producto_id: int,
+    request: Request,
+    response: Response,
+    session: Session = Depends(get_session),
+):
     obj = session.get(Producto, producto_id)
     if not obj:
         raise HTTPException(status_code=404, detail="Producto no encontrado")
+    no_modificado = responder_condicional(request, response, validadores(obj.updated_at, 1, obj.id))
+    if no_modificado:
+        return no_modificado
     return ProductoRead.model_validate(obj, from_attributes=True)
 
 @router.put("/{producto_id}", response_model=ProductoRead)
@@ -104,10 +306,12 @@ def actualizar_producto(producto_id: int, payload: ProductoUpdate, session: Sess
 
     for k, v in data.items():
         setattr(obj, k, v)
+    obj.updated_at = datetime.utcnow()
 
     session.add(obj)
     session.commit()
     session.refresh(obj)
+    invalidar_productos()
     return ProductoRead.model_validate(obj, from_attributes=True)
 
 @router.delete("/{producto_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -117,6 +321,7 @@ def eliminar_producto(producto_id: int, session: Session = Depends(get_session))
         raise HTTPException(status_code=404, detail="Producto no encontrado")
     session.delete(obj)
     session.commit()
+    invalidar_productos()
     return
 
 
@@ -0,0 +1,25 @@
+# backend/Routers/Sesion.py
+from typing import Optional
+
+from fastapi import APIRouter, Depends
+from sqlmodel import SQLModel
+
+from backend.core.tokens import Sesion, sesion_actual
+
+router = APIRouter(prefix="/sesion", tags=["Sesión"])
+
+
+class SesionRead(SQLModel):
+    rol: str
+    pk: int
+    id_manual: Optional[int] = None
+    estado_cuenta: str
+    expira_en: int  # epoch (s)
+
+
+@router.get("/", response_model=SesionRead)
+def sesion(s: Sesion = Depends(sesion_actual)):
+    """Quién es el portador del token (sin consultar la BD)."""
+    return SesionRead(
+        rol=s.rol, pk=s.pk, id_manual=s.id_manual, estado_cuenta=s.estado_cuenta, expira_en=s.expira_ms // 1000,
+    )
@@ -1,14 +1,23 @@
 # backend/Routers/Tienda.py
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, List, Literal
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
 from sqlmodel import SQLModel, Session, select
 
 from backend.db.engine import get_session
+from backend.db.restricciones import mensaje_unicidad
+from backend.core.paginacion import Paginacion, paginacion
+from backend.core.cache import cache, clave_tienda, clave_tienda_pagina, clave_tienda_productos, invalidar_tienda
+from backend.core.condicional import validadores, validadores_lista, responder_condicional
 from backend.Modelos.Tienda import Tienda 
 from backend.Modelos.Vendedor import Vendedor
 from backend.Modelos.Producto import Producto 
+from backend.Modelos.Categoria import Categoria
+from backend.Routers.Productos import ProductoRead
+from backend.CRUD.Crud_Vendedor import resolver_vendedor_pk, vendedor_y_tienda
 router = APIRouter(prefix="/tiendas", tags=["Tiendas"])
 
 
@@ -42,6 +51,20 @@ class TiendaPublica(SQLModel):
     logo_url: Optional[str] = None
     slug: str
 
+class CategoriaEnUso(SQLModel):
+    id: Optional[int] = None      # None = productos sin categoría
+    nombre: Optional[str] = None
+    total: int
+
+class PaginaTienda(SQLModel):
+    tienda: TiendaPublica         # incluye vendedor_id_manual
+    productos: List[ProductoRead]
+    total: int
+    limit: int
+    offset: int
+    destacados: List[ProductoRead]
+    categorias: List[CategoriaEnUso]
+
 
 # ──────────────────────────────────────────────────────────────────────────────
 # LISTAR TIENDAS (para admin, pruebas, etc.)
@@ -49,12 +72,31 @@ class TiendaPublica(SQLModel):
 # ──────────────────────────────────────────────────────────────────────────────
 @router.get("/", response_model=List[Tienda])
 def listar_tiendas(
-    limit: int = 50,
-    offset: int = 0,
+    response: Response,
+    pag: Paginacion = Depends(paginacion),
     session: Session = Depends(get_session),
 ):
-    stmt = select(Tienda).offset(offset).limit(limit)
-    return session.exec(stmt).all()
+    return pag.ejecutar(session, select(Tienda), response, Tienda.created_at, Tienda.id)
+
+
+# Unicidad (un vendedor = una tienda, slug único): la valida la BD al escribir
+_TIENDA_DUPLICADA = {
+    "ix_tiendas_vendedor_id": "El vendedor ya tiene una tienda creada.",
+    "ix_tiendas_slug": "El slug ya está en uso, elija otro.",
+}
+
+
+def _guardar_tienda(session: Session, tienda: Tienda, mensajes: dict) -> None:
+    session.add(tienda)
+    try:
+        session.commit()
+    except IntegrityError as e:
+        session.rollback()
+        raise HTTPException(
+            status_code=400,
+            detail=mensaje_unicidad(e, Tienda.__table__, mensajes, "La tienda viola una restricción de unicidad."),
+        )
+    session.refresh(tienda)
 
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -66,36 +108,17 @@ def crear_tienda(
     payload: TiendaCreate,
     session: Session = Depends(get_session),
 ):
-    # 1) Resolver vendedor por ID MANUAL
-    vendedor = session.exec(
-        select(Vendedor).where(Vendedor.id_vendedor == payload.id_vendedor)
-    ).first()
-    if not vendedor:
+    # 1) Resolver vendedor por ID MANUAL (mapa en memoria)
+    vendedor_pk = resolver_vendedor_pk(session, payload.id_vendedor)
+    if vendedor_pk is None:
         raise HTTPException(
             status_code=400,
             detail="No existe un vendedor con ese id_vendedor.",
         )
 
-    # 2) Validar que el vendedor (PK) no tenga ya una tienda
-    stmt_vendedor = select(Tienda).where(Tienda.vendedor_id == vendedor.id)
-    tienda_existente = session.exec(stmt_vendedor).first()
-    if tienda_existente:
-        raise HTTPException(
-            status_code=400,
-            detail="El vendedor ya tiene una tienda creada.",
-        )
-
-    # 3) Validar que el slug no esté repetido
-    stmt_slug = select(Tienda).where(Tienda.slug == payload.slug)
-    slug_existente = session.exec(stmt_slug).first()
-    if slug_existente:
-        raise HTTPException(
-            status_code=400,
-            detail="El slug ya está en uso, elija otro.",
-        )
-
+    # 2) Insertar: tienda repetida del vendedor o slug en uso los rechaza la BD
     nueva_tienda = Tienda(
-        vendedor_id=vendedor.id,  # FK usa el PK del vendedor
+        vendedor_id=vendedor_pk,  # FK usa el PK del vendedor
         nombre_negocio=payload.nombre_negocio,
         descripcion=payload.descripcion,
         color_primario=payload.color_primario,
@@ -105,9 +128,8 @@ def crear_tienda(
         updated_at=datetime.utcnow(),
     )
 
-    session.add(nueva_tienda)
-    session.commit()
-    session.refresh(nueva_tienda)
+    _guardar_tienda(session, nueva_tienda, _TIENDA_DUPLICADA)
+    invalidar_tienda(nueva_tienda.slug)
     return nueva_tienda
 
 
@@ -118,8 +140,19 @@ def crear_tienda(
 @router.get("/{slug}", response_model=TiendaPublica)
 def obtener_tienda_por_slug(
     slug: str,
+    request: Request,
+    response: Response,
     session: Session = Depends(get_session),
 ):
+    entrada = cache.obtener_o_cargar(clave_tienda(slug), lambda: _cargar_tienda_publica(session, slug))
+    v = validadores(entrada["updated_at"], 1, entrada["tienda"]["id"])
+    no_modificado = responder_condicional(request, response, v)
+    if no_modificado:
+        return no_modificado
+    return entrada["tienda"]
+
+
+def _cargar_tienda_publica(session: Session, slug: str) -> dict:
     # Unimos Tienda con Vendedor para obtener también el id_vendedor manual
     stmt = (
         select(Tienda, Vendedor)
@@ -133,7 +166,7 @@ def obtener_tienda_por_slug(
 
     tienda, vendedor = result
 
-    return TiendaPublica(
+    publica = TiendaPublica(
         id=tienda.id,
         vendedor_id=tienda.vendedor_id,
         vendedor_id_manual=vendedor.id_vendedor,  # 👈 aquí mandamos el manual
@@ -143,6 +176,11 @@ def obtener_tienda_por_slug(
         logo_url=tienda.logo_url,
         slug=tienda.slug,
     )
+    # updated_at para ETag/Last-Modified: la respuesta depende de ambas filas
+    return {
+        "tienda": publica.model_dump(),
+        "updated_at": max(tienda.updated_at, vendedor.updated_at).isoformat(),
+    }
 
 
 
@@ -156,15 +194,16 @@ def obtener_tienda_por_vendedor(
     id_vendedor: int,
     session: Session = Depends(get_session),
 ):
-    vendedor = session.exec(
-        select(Vendedor).where(Vendedor.id_vendedor == id_vendedor)
-    ).first()
-    if not vendedor:
-        raise HTTPException(status_code=404, detail="Vendedor no encontrado")
+    return _tienda_de_vendedor_o_404(session, id_vendedor)
 
-    stmt = select(Tienda).where(Tienda.vendedor_id == vendedor.id)
-    tienda = session.exec(stmt).first()
 
+def _tienda_de_vendedor_o_404(session: Session, id_vendedor: int) -> Tienda:
+    # Un solo LEFT JOIN vendedores-tiendas por el ID MANUAL
+    fila = vendedor_y_tienda(session, id_vendedor)
+    if not fila:
+        raise HTTPException(status_code=404, detail="Vendedor no encontrado")
+
+    tienda = fila[1]
     if not tienda:
         raise HTTPException(status_code=404, detail="El vendedor no tiene tienda.")
 
@@ -177,40 +216,19 @@ def actualizar_tienda_por_vendedor(
     payload: TiendaUpdate,
     session: Session = Depends(get_session),
 ):
-    vendedor = session.exec(
-        select(Vendedor).where(Vendedor.id_vendedor == id_vendedor)
-    ).first()
-    if not vendedor:
-        raise HTTPException(status_code=404, detail="Vendedor no encontrado")
+    tienda = _tienda_de_vendedor_o_404(session, id_vendedor)
 
-    stmt = select(Tienda).where(Tienda.vendedor_id == vendedor.id)
-    tienda = session.exec(stmt).first()
-
-    if not tienda:
-        raise HTTPException(status_code=404, detail="El vendedor no tiene tienda.")
+    slug_anterior = tienda.slug
 
     # Actualizar solo los campos enviados
     data = payload.dict(exclude_unset=True)
-    # Si se cambia slug, validar que no se repita
-    if "slug" in data:
-        stmt_slug = select(Tienda).where(
-            Tienda.slug == data["slug"], Tienda.id != tienda.id
-        )
-        slug_existente = session.exec(stmt_slug).first()
-        if slug_existente:
-            raise HTTPException(
-                status_code=400,
-                detail="El nuevo slug ya está en uso, elija otro.",
-            )
-
     for campo, valor in data.items():
         setattr(tienda, campo, valor)
 
     tienda.updated_at = datetime.utcnow()
 
-    session.add(tienda)
-    session.commit()
-    session.refresh(tienda)
+    _guardar_tienda(session, tienda, {"ix_tiendas_slug": "El nuevo slug ya está en uso, elija otro."})
+    invalidar_tienda(slug_anterior, tienda.slug)
     return tienda
 
 
@@ -231,24 +249,141 @@ def eliminar_tienda_por_slug(
 
     session.delete(tienda)
     session.commit()
+    invalidar_tienda(slug)
     return None
 
 
 @router.get("/{slug}/productos")
 def listar_productos_por_tienda(
     slug: str,
+    request: Request,
+    response: Response,
     session: Session = Depends(get_session),
 ):
-    # Obtener la tienda
-    stmt = select(Tienda).where(Tienda.slug == slug)
-    tienda = session.exec(stmt).first()
+    productos = cache.obtener_o_cargar(
+        clave_tienda_productos(slug), lambda: _cargar_productos_tienda(session, slug)
+    )
+    no_modificado = responder_condicional(request, response, validadores_lista(productos, slug))
+    if no_modificado:
+        return no_modificado
+    return productos
 
-    if not tienda:
+
+def _cargar_productos_tienda(session: Session, slug: str) -> List[dict]:
+    # Un solo LEFT JOIN: sin filas = la tienda no existe; Producto None = tienda sin productos
+    stmt = (
+        select(Tienda.id, Producto)
+        .outerjoin(Producto, Producto.vendedor_id == Tienda.vendedor_id)
+        .where(Tienda.slug == slug)
+    )
+    filas = session.exec(stmt).all()
+
+    if not filas:
         raise HTTPException(status_code=404, detail="Tienda no encontrada")
 
-    # Obtener productos del vendedor dueño de la tienda
-    from backend.Modelos.Producto import Producto
-    stmt_prod = select(Producto).where(Producto.vendedor_id == tienda.vendedor_id)
-    productos = session.exec(stmt_prod).all()
+    # Se cachean dicts JSON planos, nunca instancias ligadas a una sesión
+    return [p.model_dump(mode="json") for _, p in filas if p is not None]
 
-    return productos
+
+# ──────────────────────────────────────────────────────────────────────────────
+# PÁGINA COMPLETA DE LA TIENDA (metadatos + productos + destacados + categorías)
+# GET /tiendas/{slug}/pagina
+# ──────────────────────────────────────────────────────────────────────────────
+_ORDENES = {
+    "recientes": (Producto.created_at.desc(), Producto.id.desc()),
+    "precio_asc": (Producto.precio.asc(), Producto.id.asc()),
+    "precio_desc": (Producto.precio.desc(), Producto.id.desc()),
+    "nombre": (Producto.nombre.asc(), Producto.id.asc()),
+}
+
+
+@router.get("/{slug}/pagina", response_model=PaginaTienda)
+def obtener_pagina_tienda(
+    slug: str,
+    request: Request,
+    response: Response,
+    limit: int = Query(24, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    orden: Literal["recientes", "precio_asc", "precio_desc", "nombre"] = "recientes",
+    category_id: Optional[int] = None,
+    destacados: int = Query(8, ge=0, le=50, description="Cuántos destacados incluir"),
+    session: Session = Depends(get_session),
+):
+    """
+    Todo lo que necesita la vitrina en una sola petición. Cantidad fija de
+    consultas (tienda, página con total, destacados, categorías en uso),
+    sin importar el tamaño del catálogo; el resultado se cachea por parámetros.
+    """
+    entrada = cache.obtener_o_cargar(
+        clave_tienda_pagina(slug, limit, offset, orden, category_id, destacados),
+        lambda: _cargar_pagina_tienda(session, slug, limit, offset, orden, category_id, destacados),
+    )
+    v = validadores(entrada["updated_at"], entrada["pagina"]["total"], slug, limit, offset, orden, category_id, destacados)
+    no_modificado = responder_condicional(request, response, v)
+    if no_modificado:
+        return no_modificado
+    return entrada["pagina"]
+
+
+def _cargar_pagina_tienda(
+    session: Session,
+    slug: str,
+    limit: int,
+    offset: int,
+    orden: str,
+    category_id: Optional[int],
+    n_destacados: int,
+) -> dict:
+    # 1) Tienda + vendedor (normalmente ya está en caché)
+    tienda = cache.obtener_o_cargar(clave_tienda(slug), lambda: _cargar_tienda_publica(session, slug))
+    vendedor_pk = tienda["tienda"]["vendedor_id"]
+    del_vendedor = Producto.vendedor_id == vendedor_pk
+
+    # 2) Página de productos + total con una función ventana
+    conds = [del_vendedor]
+    if category_id is not None:
+        conds.append(Producto.category_id == category_id)
+    stmt = (
+        select(Producto, func.count().over().label("total"))
+        .where(*conds)
+        .order_by(*_ORDENES[orden])
+        .offset(offset)
+        .limit(limit)
+    )
+    filas = session.exec(stmt).all()
+    if filas:
+        total = filas[0][1]
+    else:
+        # offset fuera de rango: la ventana no devuelve filas
+        total = session.exec(select(func.count()).select_from(Producto).where(*conds)).one()
+
+    # 3) Destacados
+    lista_destacados = []
+    if n_destacados:
+        lista_destacados = session.exec(
+            select(Producto)
+            .where(del_vendedor, Producto.destacado == True)
+            .order_by(Producto.created_at.desc(), Producto.id.desc())
+            .limit(n_destacados)
+        ).all()
+
+    # 4) Categorías en uso (con conteo) y max(updated_at) del catálogo para el ETag
+    categorias = session.exec(
+        select(Producto.category_id, Categoria.nombre, func.count(), func.max(Producto.updated_at))
+        .outerjoin(Categoria, Categoria.id == Producto.category_id)
+        .where(del_vendedor)
+        .group_by(Producto.category_id, Categoria.nombre)
+        .order_by(func.count().desc())
+    ).all()
+
+    marcas = [datetime.fromisoformat(tienda["updated_at"])] + [c[3] for c in categorias if c[3]]
+    pagina = PaginaTienda(
+        tienda=TiendaPublica(**tienda["tienda"]),
+        productos=[ProductoRead.model_validate(p, from_attributes=True) for p, _ in filas],
+        total=total,
+        limit=limit,
+        offset=offset,
+        destacados=[ProductoRead.model_validate(p, from_attributes=True) for p in lista_destacados],
+        categorias=[CategoriaEnUso(id=c, nombre=n, total=t) for c, n, t, _ in categorias],
+    )
+    return {"pagina": pagina.model_dump(mode="json"), "updated_at": max(marcas).isoformat()}
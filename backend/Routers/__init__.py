@@ -1,4 +1,4 @@
-from . import Administradores
+# Administradores se importa en la primera petición (ver backend/core/diferidos.py)
 from . import Compradores
 from . import Categoria
 from . import Productos
@@ -0,0 +1,26 @@
+# backend/Routers/aio/Compradores.py
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Query
+from sqlmodel.ext.asyncio.session import AsyncSession
+from backend.db.engine import get_async_session
+from backend.CRUD.aio.Crud_Comprador import buscar_compradores
+from backend.core.serializacion import RespuestaJSONRapida, columnas_de, filas_a_dicts, respuesta_rapida
+from backend.Modelos.Comprador import Comprador
+from backend.Routers.Compradores import CompradorRead
+
+router = APIRouter(prefix="/compradores", tags=["Compradores"])
+
+
+@router.get("/", response_model=List[CompradorRead], response_class=RespuestaJSONRapida)
+async def get_compradores(
+    session: AsyncSession = Depends(get_async_session),
+    direccion: Optional[str] = Query(None),
+    email: Optional[str] = Query(None),
+    limit: int = Query(50, ge=1, le=200),
+    offset: int = Query(0, ge=0),
+):
+    filas = await buscar_compradores(
+        session, direccion=direccion, email=email, limit=limit, offset=offset,
+        columnas=columnas_de(Comprador, CompradorRead),
+    )
+    return respuesta_rapida(filas_a_dicts(filas, CompradorRead.model_fields))
@@ -0,0 +1,29 @@
+# backend/Routers/aio/Pedidos.py
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Response
+from sqlmodel.ext.asyncio.session import AsyncSession
+from backend.db.engine import get_async_session
+from backend.core.paginacion import Paginacion, paginacion
+from backend.CRUD.Crud_Pedido import consulta_pedidos
+from backend.CRUD.aio.Crud_Pedido import listar_pedidos as crud_listar_pedidos, items_de_pedidos
+from backend.Modelos.Pedido import Pedido
+from backend.Routers.Pedidos import PedidoRead, _to_read
+
+router = APIRouter(prefix="/pedidos", tags=["Pedidos"])
+
+
+@router.get("/", response_model=List[PedidoRead])
+async def listar_pedidos(
+    response: Response,
+    comprador_id: Optional[int] = None,
+    pag: Paginacion = Depends(paginacion),
+    session: AsyncSession = Depends(get_async_session),
+):
+    if pag.usa_cursor:
+        pedidos = await pag.ejecutar_async(
+            session, consulta_pedidos(comprador_id), response, Pedido.created_at, Pedido.id
+        )
+    else:
+        pedidos = await crud_listar_pedidos(session, comprador_id=comprador_id, limit=pag.limit, offset=pag.offset)
+    items = await items_de_pedidos(session, [p.id for p in pedidos])
+    return [_to_read(p, items[p.id]) for p in pedidos]
@@ -0,0 +1,78 @@
+# backend/Routers/aio/Productos.py
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import func
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from backend.db.engine import get_async_session
+from backend.core.paginacion import Paginacion, paginacion
+from backend.core.cache import cache, CLAVE_DESTACADOS, clave_validadores_productos
+from backend.core.condicional import validadores, responder_condicional
+from backend.core.serializacion import RespuestaJSONRapida, columnas_de, filas_a_dicts, respuesta_rapida
+from backend.CRUD.aio.Crud_Producto import listar_destacados, obtener_producto as crud_obtener_producto
+from backend.Modelos.Producto import Producto
+from backend.CRUD.aio.Crud_Vendedor import resolver_vendedor_pk
+from backend.Routers.Productos import ProductoRead
+
+router = APIRouter(prefix="/productos", tags=["Productos"])
+
+
+async def _resolver_vendedor_pk(session: AsyncSession, id_v_manual: int) -> int:
+    pk = await resolver_vendedor_pk(session, id_v_manual)
+    if pk is None:
+        raise HTTPException(status_code=400, detail="Vendedor (id_vendedor) no existe")
+    return pk
+
+
+@router.get("/", response_model=List[ProductoRead], response_class=RespuestaJSONRapida)
+async def listar_productos(
+    request: Request,
+    response: Response,
+    session: AsyncSession = Depends(get_async_session),
+    pag: Paginacion = Depends(paginacion),
+    id_vendedor: Optional[int] = Query(None, description="id_vendedor (manual)"),
+):
+    conds = []
+    if id_vendedor is not None:
+        conds.append(Producto.vendedor_id == await _resolver_vendedor_pk(session, id_vendedor))
+
+    async def cargar():
+        total, max_updated = (await session.exec(
+            select(func.count(), func.max(Producto.updated_at)).select_from(Producto).where(*conds)
+        )).one()
+        return [total, max_updated.isoformat() if max_updated else None]
+
+    total, max_updated = await cache.obtener_o_cargar_async(clave_validadores_productos(id_vendedor), cargar)
+    v = validadores(max_updated, total, id_vendedor, pag.limit, pag.offset, pag.cursor)
+    no_modificado = responder_condicional(request, response, v)
+    if no_modificado:
+        return no_modificado
+
+    stmt = select(*columnas_de(Producto, ProductoRead, Producto.created_at)).where(*conds)
+    rows = await pag.ejecutar_async(session, stmt, response, Producto.created_at, Producto.id)
+    return respuesta_rapida(filas_a_dicts(rows, ProductoRead.model_fields), response)
+
+
+@router.get("/destacados", response_model=List[Producto])
+async def productos_destacados(session: AsyncSession = Depends(get_async_session)):
+    async def cargar():
+        return [p.model_dump(mode="json") for p in await listar_destacados(session)]
+
+    return [Producto.model_validate(d) for d in await cache.obtener_o_cargar_async(CLAVE_DESTACADOS, cargar)]
+
+
+# :int para no tapar /productos/search ni otras rutas fijas del router sync
+@router.get("/{producto_id:int}", response_model=ProductoRead)
+async def obtener_producto(
+    producto_id: int,
+    request: Request,
+    response: Response,
+    session: AsyncSession = Depends(get_async_session),
+):
+    obj = await crud_obtener_producto(session, producto_id)
+    if not obj:
+        raise HTTPException(status_code=404, detail="Producto no encontrado")
+    no_modificado = responder_condicional(request, response, validadores(obj.updated_at, 1, obj.id))
+    if no_modificado:
+        return no_modificado
+    return ProductoRead.model_validate(obj, from_attributes=True)
@@ -0,0 +1,78 @@
+# backend/Routers/aio/Tienda.py
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from backend.db.engine import get_async_session
+from backend.core.cache import cache, clave_tienda, clave_tienda_productos
+from backend.core.condicional import validadores, validadores_lista, responder_condicional
+from backend.Modelos.Tienda import Tienda
+from backend.Modelos.Vendedor import Vendedor
+from backend.Modelos.Producto import Producto
+from backend.Routers.Tienda import TiendaPublica
+
+router = APIRouter(prefix="/tiendas", tags=["Tiendas"])
+
+
+@router.get("/{slug}", response_model=TiendaPublica)
+async def obtener_tienda_por_slug(
+    slug: str,
+    request: Request,
+    response: Response,
+    session: AsyncSession = Depends(get_async_session),
+):
+    async def cargar():
+        stmt = (
+            select(Tienda, Vendedor)
+            .join(Vendedor, Tienda.vendedor_id == Vendedor.id)
+            .where(Tienda.slug == slug)
+        )
+        result = (await session.exec(stmt)).first()
+        if not result:
+            raise HTTPException(status_code=404, detail="Tienda no encontrada")
+        tienda, vendedor = result
+        publica = TiendaPublica(
+            id=tienda.id,
+            vendedor_id=tienda.vendedor_id,
+            vendedor_id_manual=vendedor.id_vendedor,
+            nombre_negocio=tienda.nombre_negocio,
+            descripcion=tienda.descripcion,
+            color_primario=tienda.color_primario,
+            logo_url=tienda.logo_url,
+            slug=tienda.slug,
+        )
+        return {
+            "tienda": publica.model_dump(),
+            "updated_at": max(tienda.updated_at, vendedor.updated_at).isoformat(),
+        }
+
+    entrada = await cache.obtener_o_cargar_async(clave_tienda(slug), cargar)
+    v = validadores(entrada["updated_at"], 1, entrada["tienda"]["id"])
+    no_modificado = responder_condicional(request, response, v)
+    if no_modificado:
+        return no_modificado
+    return entrada["tienda"]
+
+
+@router.get("/{slug}/productos")
+async def listar_productos_por_tienda(
+    slug: str,
+    request: Request,
+    response: Response,
+    session: AsyncSession = Depends(get_async_session),
+):
+    async def cargar():
+        stmt = (
+            select(Tienda.id, Producto)
+            .outerjoin(Producto, Producto.vendedor_id == Tienda.vendedor_id)
+            .where(Tienda.slug == slug)
+        )
+        filas = (await session.exec(stmt)).all()
+        if not filas:
+            raise HTTPException(status_code=404, detail="Tienda no encontrada")
+        return [p.model_dump(mode="json") for _, p in filas if p is not None]
+
+    productos = await cache.obtener_o_cargar_async(clave_tienda_productos(slug), cargar)
+    no_modificado = responder_condicional(request, response, validadores_lista(productos, slug))
+    if no_modificado:
+        return no_modificado
+    return productos
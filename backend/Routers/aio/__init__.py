@@ -0,0 +1,11 @@
+# backend/Routers/aio/__init__.py
+"""
+Versiones async (AsyncSession) de las rutas de lectura más calientes.
+Solo se montan con DB_ASYNC=1 y antes que los routers sync, así que atienden
+las mismas URLs; las escrituras siguen en los routers sync.
+"""
+from . import Productos, Tienda, vendedores, Compradores, Pedidos
+
+routers = [Productos.router, Tienda.router, vendedores.router, Compradores.router, Pedidos.router]
+
+__all__ = ["Productos", "Tienda", "vendedores", "Compradores", "Pedidos", "routers"]
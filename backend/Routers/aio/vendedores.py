@@ -0,0 +1,24 @@
+# backend/Routers/aio/vendedores.py
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Query
+from sqlmodel.ext.asyncio.session import AsyncSession
+from backend.db.engine import get_async_session
+from backend.CRUD.aio.Crud_Vendedor import buscar_vendedores
+from backend.core.serializacion import RespuestaJSONRapida, columnas_de, filas_a_dicts, respuesta_rapida
+from backend.Modelos.Vendedor import Vendedor
+from backend.Routers.vendedores import VendedorRead
+
+router = APIRouter(prefix="/vendedores", tags=["Vendedores"])
+
+
+@router.get("/", response_model=List[VendedorRead], response_class=RespuestaJSONRapida)
+async def get_vendedores(
+    limit: int = Query(50, ge=1, le=200),
+    offset: int = Query(0, ge=0),
+    email: Optional[str] = Query(None),
+    session: AsyncSession = Depends(get_async_session),
+):
+    filas = await buscar_vendedores(
+        session, email=email, limit=limit, offset=offset, columnas=columnas_de(Vendedor, VendedorRead)
+    )
+    return respuesta_rapida(filas_a_dicts(filas, VendedorRead.model_fields))
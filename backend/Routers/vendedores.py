@@ -1,19 +1,26 @@
 # backend/Routers/vendedores.py
 from typing import Optional, List
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlmodel import Session, SQLModel, Field, select
+from fastapi.concurrency import run_in_threadpool
+from sqlmodel import Session, SQLModel, Field
 from backend.db.engine import get_session
 from backend.Modelos.Vendedor import Vendedor
 from backend.CRUD.Crud_Vendedor import (
-    listar_vendedores,
+    buscar_vendedores,
     obtener_vendedor,
     crear_vendedor as crud_crear_vendedor,
     actualizar_vendedor as crud_actualizar_vendedor,
     eliminar_vendedor as crud_eliminar_vendedor,
     productos_de_vendedor,
     tienda_de_vendedor,
+    resolver_vendedor_pk,
+    cambiar_estado_vendedor as crud_cambiar_estado_vendedor,
 )
 from backend.Modelos.common import EstadoCuenta
+from backend.core.cache import invalidar_tiendas
+from backend.core.contrasenas import autenticar, con_hash
+from backend.core.tokens import ROL_VENDEDOR, datos_sesion, emitir_token
+from backend.core.serializacion import RespuestaJSONRapida, columnas_de, filas_a_dicts, respuesta_rapida
 from pydantic import EmailStr, constr
 from backend.Modelos.Producto import Producto
 
@@ -64,6 +71,11 @@ class VendedorRead(VendedorBase):
     id: int
     id_vendedor: int
 
+class VendedorSesion(VendedorRead):
+    token: str
+    token_type: str = "bearer"
+    expira_en: int  # epoch (s)
+
 class VendedorLogin(SQLModel):
     email: EmailStr
     password: constr(min_length=8)
@@ -72,15 +84,17 @@ class EstadoVendedorPayload(SQLModel):
     estado_cuenta: EstadoCuenta
 
 # ========= Endpoints =========
-@router.get("/", response_model=List[VendedorRead])
+@router.get("/", response_model=List[VendedorRead], response_class=RespuestaJSONRapida)
 def get_vendedores(
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
+    email: Optional[str] = Query(None),
     session: Session = Depends(get_session),
 ):
-    vendedores = listar_vendedores(session)
-    vendedores = vendedores[offset: offset + limit]
-    return [VendedorRead.model_validate(v, from_attributes=True) for v in vendedores]
+    filas = buscar_vendedores(
+        session, email=email, limit=limit, offset=offset, columnas=columnas_de(Vendedor, VendedorRead)
+    )
+    return respuesta_rapida(filas_a_dicts(filas, VendedorRead.model_fields))
 
 
 @router.get("/{id_vendedor}", response_model=VendedorRead)
@@ -92,25 +106,27 @@ def get_vendedor(id_vendedor: int, session: Session = Depends(get_session)):
 
 
 @router.post("/", response_model=VendedorRead, status_code=status.HTTP_201_CREATED)
-def create_vendedor(data: VendedorCreate, session: Session = Depends(get_session)):
+async def create_vendedor(data: VendedorCreate, session: Session = Depends(get_session)):
+    data_dict = await con_hash(data.model_dump(exclude_unset=True))
     try:
-        data_dict = data.model_dump(exclude_unset=True)
-        v = crud_crear_vendedor(session, **data_dict)
+        v = await run_in_threadpool(crud_crear_vendedor, session, **data_dict)
         return VendedorRead.model_validate(v, from_attributes=True)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.put("/{id_vendedor}", response_model=VendedorRead)
-def update_vendedor(
+async def update_vendedor(
     id_vendedor: int,
     data: VendedorUpdate,
     session: Session = Depends(get_session),
 ):
+    cambios = await con_hash(data.model_dump(exclude_unset=True))
     try:
-        v = crud_actualizar_vendedor(session, id_vendedor, **data.model_dump(exclude_unset=True))
+        v = await run_in_threadpool(crud_actualizar_vendedor, session, id_vendedor, **cambios)
         if not v:
             raise HTTPException(status_code=404, detail="Vendedor no encontrado")
+        invalidar_tiendas()  # TiendaPublica incluye el id_vendedor manual
         return VendedorRead.model_validate(v, from_attributes=True)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -143,44 +159,36 @@ def get_productos_vendedor(
     Devuelve los productos del vendedor identificado por su ID MANUAL (id_vendedor),
     que es el que guardas en localStorage y usas en el frontend.
     """
+    # Un solo JOIN productos-vendedores por el ID MANUAL
+    productos = productos_de_vendedor(session, id_vendedor)
 
-    # 1) Buscar al vendedor por su ID MANUAL (campo Vendedor.id_vendedor)
-    vendedor = session.exec(
-        select(Vendedor).where(Vendedor.id_vendedor == id_vendedor)
-    ).first()
-
-    if not vendedor:
+    # Lista vacía: solo entonces hace falta saber si el vendedor existe
+    if not productos and resolver_vendedor_pk(session, id_vendedor) is None:
         raise HTTPException(status_code=404, detail="Vendedor no encontrado")
 
-    # 2) Buscar productos cuyo FK vendedor_id = PK del vendedor
-    stmt = select(Producto).where(Producto.vendedor_id == vendedor.id)
-    productos = session.exec(stmt).all()
-
     return productos
 
 
 
 
-@router.post("/login", response_model=VendedorRead)
-    
-def login_vendedor(
+@router.post("/login", response_model=VendedorSesion)
+async def login_vendedor(
     credenciales: VendedorLogin,
     session: Session = Depends(get_session),
     ):
-    vendedor = session.exec(
-        select(Vendedor).where(Vendedor.email == credenciales.email)
-    ).first()
-
+    # async: el hash corre en su propio pool (core/contrasenas.py), no en el de requests
+    vendedor = await autenticar(session, Vendedor, credenciales.email, credenciales.password)
     if not vendedor:
         raise HTTPException(status_code=401, detail="Credenciales inválidas")
 
-    if vendedor.password != credenciales.password:
-        raise HTTPException(status_code=401, detail="Credenciales inválidas")
-
     if vendedor.estado_cuenta != EstadoCuenta.activo:
         raise HTTPException(status_code=403, detail="Cuenta no activa")
 
-    return VendedorRead.model_validate(vendedor, from_attributes=True)
+    token, sesion = emitir_token(ROL_VENDEDOR, vendedor.id, vendedor.id_vendedor, vendedor.estado_cuenta)
+    return VendedorSesion(
+        **VendedorRead.model_validate(vendedor, from_attributes=True).model_dump(),
+        **datos_sesion(token, sesion),
+    )
 
 
 @router.put("/{id_vendedor}/estado", response_model=Vendedor)   
@@ -189,15 +197,7 @@ def cambiar_estado_vendedor(
     payload: EstadoVendedorPayload,
     session: Session = Depends(get_session),
 ):
-    vendedor = session.exec(
-        select(Vendedor).where(Vendedor.id_vendedor == id_vendedor)
-    ).first()
-
+    vendedor = crud_cambiar_estado_vendedor(session, id_vendedor, payload.estado_cuenta)
     if not vendedor:
         raise HTTPException(status_code=404, detail="Vendedor no encontrado")
-
-    vendedor.estado_cuenta = payload.estado_cuenta
-    session.add(vendedor)
-    session.commit()
-    session.refresh(vendedor)
     return vendedor
\ No newline at end of file
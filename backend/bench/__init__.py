@@ -0,0 +1,2 @@
+# backend/bench/__init__.py
+"""Benchmark de carga de la API (ver backend/cli/bench_api.py)."""
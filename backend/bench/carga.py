@@ -0,0 +1,141 @@
+# backend/bench/carga.py
+"""
+Motor de carga: N usuarios virtuales (tareas asyncio) recorren escenarios
+contra un ``httpx.AsyncClient`` hasta completar una cantidad de peticiones
+o un tiempo, y se resume throughput y p50/p95/p99 por ruta.
+
+El cliente decide dónde corre la app: en el proceso (``httpx.ASGITransport``)
+o en un uvicorn aparte (``base_url``). Cada usuario tiene su propio
+``random.Random`` derivado de la semilla: con un usuario la secuencia de
+peticiones es idéntica entre corridas; con varios, el orden entre ellos
+depende de las latencias.
+"""
+import asyncio
+import math
+import random
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import httpx
+
+from backend.bench.datos import Referencias
+from backend.bench.escenarios import ESCENARIOS, Peticion
+
+
+@dataclass
+class Registro:
+    latencias: Dict[str, List[float]] = field(default_factory=lambda: defaultdict(list))
+    estados: Dict[str, Counter] = field(default_factory=lambda: defaultdict(Counter))
+    peticiones: int = 0
+    segundos: float = 0.0
+
+    def anotar(self, etiqueta: str, status: int, segundos: float) -> None:
+        self.latencias[etiqueta].append(segundos)
+        self.estados[etiqueta][status] += 1
+        self.peticiones += 1
+
+
+def percentil(ordenados: List[float], p: float) -> float:
+    """Percentil por rango más cercano sobre una lista ya ordenada."""
+    if not ordenados:
+        return 0.0
+    k = max(0, math.ceil(p / 100 * len(ordenados)) - 1)
+    return ordenados[k]
+
+
+async def _usuario(cliente: httpx.AsyncClient, refs: Referencias, mezcla: Dict[str, float],
+                   rng: random.Random, registro: Registro, cupo: List[int], fin: Optional[float]) -> None:
+    nombres, pesos = list(mezcla), list(mezcla.values())
+    while True:
+        escenario = ESCENARIOS[rng.choices(nombres, weights=pesos)[0]](refs, rng)
+        respuesta = None
+        try:
+            while True:
+                peticion: Peticion = escenario.send(respuesta)
+                if cupo[0] <= 0 or (fin is not None and time.perf_counter() >= fin):
+                    return
+                cupo[0] -= 1
+                inicio = time.perf_counter()
+                respuesta = await cliente.request(
+                    peticion.metodo, peticion.url, json=peticion.json,
+                    params=peticion.params, headers=peticion.headers,
+                )
+                registro.anotar(peticion.etiqueta, respuesta.status_code, time.perf_counter() - inicio)
+        except StopIteration:
+            continue
+
+
+async def ejecutar(cliente: httpx.AsyncClient, refs: Referencias, mezcla: Dict[str, float], *,
+                   usuarios: int = 10, peticiones: int = 1000, segundos: Optional[float] = None,
+                   semilla: int = 42) -> Registro:
+    """Corre la carga; termina al llegar a ``peticiones`` o a ``segundos`` (lo primero)."""
+    registro = Registro()
+    cupo = [peticiones]
+    inicio = time.perf_counter()
+    fin = inicio + segundos if segundos else None
+    await asyncio.gather(*(
+        _usuario(cliente, refs, mezcla, random.Random(semilla * 1000 + u), registro, cupo, fin)
+        for u in range(usuarios)
+    ))
+    registro.segundos = time.perf_counter() - inicio
+    return registro
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Resumen y comparación
+# ──────────────────────────────────────────────────────────────────────────────
+def _estadisticas(latencias: List[float], estados: Counter, segundos: float) -> dict:
+    ordenados = sorted(latencias)
+    n = len(ordenados)
+    return {
+        "peticiones": n,
+        "errores": sum(c for s, c in estados.items() if s >= 400),
+        "estados": {str(s): c for s, c in sorted(estados.items())},
+        "rps": round(n / segundos, 1) if segundos else None,
+        "media_ms": round(1000 * sum(ordenados) / n, 2) if n else 0.0,
+        "p50_ms": round(1000 * percentil(ordenados, 50), 2),
+        "p95_ms": round(1000 * percentil(ordenados, 95), 2),
+        "p99_ms": round(1000 * percentil(ordenados, 99), 2),
+        "max_ms": round(1000 * ordenados[-1], 2) if n else 0.0,
+    }
+
+
+def resumir(registro: Registro) -> dict:
+    todas, estados = [], Counter()
+    for etiqueta, lat in registro.latencias.items():
+        todas += lat
+        estados.update(registro.estados[etiqueta])
+    return {
+        "segundos": round(registro.segundos, 3),
+        "total": _estadisticas(todas, estados, registro.segundos),
+        "rutas": {
+            etiqueta: _estadisticas(lat, registro.estados[etiqueta], registro.segundos)
+            for etiqueta, lat in sorted(registro.latencias.items())
+        },
+    }
+
+
+def comparar(base: dict, actual: dict, metrica: str = "p95_ms", tolerancia: float = 0.15,
+             piso_ms: float = 1.0, min_peticiones: int = 20) -> List[dict]:
+    """
+    Cambio de ``metrica`` por ruta respecto a ``base``; ``regresion`` si empeoró
+    más de ``tolerancia`` (fracción). Se ignoran diferencias menores a
+    ``piso_ms`` y rutas con menos de ``min_peticiones`` en alguna corrida
+    (un p95 de pocas muestras es ruido).
+    """
+    cambios = []
+    for etiqueta, datos in actual["rutas"].items():
+        previo = base.get("rutas", {}).get(etiqueta)
+        if not previo or not previo.get(metrica):
+            continue
+        if min(previo["peticiones"], datos["peticiones"]) < min_peticiones:
+            continue
+        antes, ahora = previo[metrica], datos[metrica]
+        cambios.append({
+            "ruta": etiqueta, "antes": antes, "ahora": ahora,
+            "cambio": round(ahora / antes - 1, 3),
+            "regresion": ahora > antes * (1 + tolerancia) and ahora - antes >= piso_ms,
+        })
+    return cambios
@@ -0,0 +1,49 @@
+# backend/bench/datos.py
+"""
+Datos del benchmark: siembra una BD con un volumen fijo y una semilla, y
+lee de vuelta lo que los escenarios necesitan (slugs, ids, emails).
+
+La misma (volumen, semilla) produce exactamente las mismas filas, así dos
+corridas en commits distintos miden lo mismo. La generación y la carga
+masiva están en bench/sintetico.py (también la usa cli/generar_datos).
+"""
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+from sqlalchemy.engine import Engine
+from sqlmodel import Session, select
+
+from backend.bench.sintetico import PASSWORD, SUSTANTIVOS, VOLUMENES, Volumen, generar  # noqa: F401
+from backend.Modelos import Categoria, Comprador, Producto, Tienda, Vendedor
+
+
+@dataclass
+class Referencias:
+    """Lo que los escenarios sacan de la BD sembrada."""
+    slugs: List[str] = field(default_factory=list)
+    vendedores: List[tuple] = field(default_factory=list)  # (id_vendedor, email)
+    compradores: List[tuple] = field(default_factory=list)  # (id_comprador, nombre, email)
+    productos: List[int] = field(default_factory=list)
+    categorias: List[int] = field(default_factory=list)
+    palabras: List[str] = field(default_factory=lambda: list(SUSTANTIVOS))
+
+
+def sembrar(engine: Engine, volumen: Volumen, semilla: int = 42) -> Dict[str, int]:
+    """Esquema + volumen pedido (ver bench/sintetico.py); filas escritas por tabla."""
+    return {tabla: r["filas"] for tabla, r in generar(engine, volumen, semilla).items()}
+
+
+def referencias(engine: Engine, max_productos: int = 50_000) -> Referencias:
+    """Lee de la BD lo que usan los escenarios (sirve también para una BD sembrada antes)."""
+    with Session(engine) as session:
+        return Referencias(
+            slugs=list(session.exec(select(Tienda.slug).order_by(Tienda.id)).all()),
+            vendedores=[tuple(f) for f in session.exec(
+                select(Vendedor.id_vendedor, Vendedor.email).order_by(Vendedor.id)
+            ).all()],
+            compradores=[tuple(f) for f in session.exec(
+                select(Comprador.id_comprador, Comprador.nombre, Comprador.email).order_by(Comprador.id)
+            ).all()],
+            productos=list(session.exec(select(Producto.id).order_by(Producto.id).limit(max_productos)).all()),
+            categorias=list(session.exec(select(Categoria.id).order_by(Categoria.id)).all()),
+        )
@@ -0,0 +1,102 @@
+# backend/bench/escenarios.py
+"""
+Escenarios del benchmark: recorridos típicos de un usuario, como generadores.
+
+Cada escenario hace ``yield Peticion(...)`` y recibe la respuesta httpx con
+``send``, así puede encadenar pasos (el token del login, el id del producto
+creado). ``ruta`` es la plantilla con la que se agrupan las latencias
+("GET /tiendas/{slug}/pagina"), no la URL concreta.
+"""
+import random
+import uuid
+from dataclasses import dataclass
+from typing import Callable, Dict, Generator, Optional
+
+from backend.bench.datos import PASSWORD, Referencias
+
+
+@dataclass(frozen=True)
+class Peticion:
+    metodo: str
+    ruta: str
+    url: str
+    json: Optional[dict] = None
+    params: Optional[dict] = None
+    headers: Optional[dict] = None
+
+    @property
+    def etiqueta(self) -> str:
+        return f"{self.metodo} {self.ruta}"
+
+
+Escenario = Callable[[Referencias, random.Random], Generator[Peticion, object, None]]
+
+
+def vitrina(refs: Referencias, rng: random.Random):
+    """Comprador navegando: página de tienda, búsqueda, detalle, catálogo."""
+    slug = rng.choice(refs.slugs)
+    yield Peticion("GET", "/tiendas/{slug}/pagina", f"/tiendas/{slug}/pagina",
+                   params={"orden": rng.choice(["recientes", "precio_asc", "nombre"])})
+    yield Peticion("GET", "/productos/search", "/productos/search", params={
+        "q": rng.choice(refs.palabras), "limit": 20,
+        **({"category_id": rng.choice(refs.categorias)} if refs.categorias and rng.random() < 0.3 else {}),
+    })
+    for _ in range(rng.randint(1, 3)):
+        pid = rng.choice(refs.productos)
+        yield Peticion("GET", "/productos/{producto_id}", f"/productos/{pid}")
+    yield Peticion("GET", "/productos/", "/productos/", params={"limit": 24})
+    yield Peticion("GET", "/productos/destacados", "/productos/destacados")
+
+
+def compra(refs: Referencias, rng: random.Random):
+    """Checkout: ver productos, crear pedido (con Idempotency-Key), ver historial."""
+    ids = rng.sample(refs.productos, k=min(len(refs.productos), rng.randint(1, 3)))
+    for pid in ids:
+        yield Peticion("GET", "/productos/{producto_id}", f"/productos/{pid}")
+    id_comprador, nombre, email = rng.choice(refs.compradores)
+    yield Peticion("POST", "/pedidos/", "/pedidos/", json={
+        "comprador_id": id_comprador, "nombre_cliente": nombre, "email_cliente": email,
+        "direccion": "Calle bench", "metodo_pago": rng.choice(["tarjeta", "contra_entrega"]),
+        "items": [{"producto_id": pid, "cantidad": rng.randint(1, 2)} for pid in ids],
+    }, headers={"Idempotency-Key": uuid.UUID(int=rng.getrandbits(128)).hex})
+    yield Peticion("GET", "/pedidos/", "/pedidos/", params={"comprador_id": id_comprador})
+
+
+def vendedor(refs: Referencias, rng: random.Random):
+    """Vendedor: login, ver su catálogo, crear un producto y editarlo."""
+    id_vendedor, email = rng.choice(refs.vendedores)
+    respuesta = yield Peticion("POST", "/vendedores/login", "/vendedores/login",
+                               json={"email": email, "password": PASSWORD})
+    token = respuesta.json().get("token") if respuesta.status_code == 200 else None
+    auth = {"Authorization": f"Bearer {token}"} if token else None
+    yield Peticion("GET", "/vendedores/{id_vendedor}/productos", f"/vendedores/{id_vendedor}/productos",
+                   headers=auth)
+    creado = yield Peticion("POST", "/productos/", "/productos/", json={
+        "nombre": f"{rng.choice(refs.palabras)} bench", "descripcion": "creado por el benchmark",
+        "precio": round(rng.uniform(5, 200), 2), "stock": 100, "id_vendedor": id_vendedor,
+    }, headers=auth)
+    if creado.status_code == 201:
+        pid = creado.json()["id"]
+        yield Peticion("PUT", "/productos/{producto_id}", f"/productos/{pid}",
+                       json={"precio": round(rng.uniform(5, 200), 2)}, headers=auth)
+
+
+ESCENARIOS: Dict[str, Escenario] = {
+    "vitrina": vitrina,
+    "compra": compra,
+    "vendedor": vendedor,
+}
+
+# Proporción de usuarios en cada escenario (la mayoría navega, pocos venden)
+MEZCLA_DEFECTO: Dict[str, float] = {"vitrina": 0.7, "compra": 0.2, "vendedor": 0.1}
+
+
+def parsear_mezcla(texto: str) -> Dict[str, float]:
+    """ "vitrina=7,compra=2" -> {"vitrina": 7.0, "compra": 2.0}"""
+    mezcla = {}
+    for parte in filter(None, (p.strip() for p in texto.split(","))):
+        nombre, _, peso = parte.partition("=")
+        if nombre not in ESCENARIOS:
+            raise ValueError(f"Escenario desconocido: {nombre} (hay {', '.join(ESCENARIOS)})")
+        mezcla[nombre] = float(peso or 1)
+    return mezcla
@@ -0,0 +1,525 @@
+# backend/bench/sintetico.py
+"""
+Generador de datos sintéticos a escala (millones de productos).
+
+Genera vendedores, tiendas, categorías, productos, compradores y pedidos con
+el sesgo de producción (pocas tiendas grandes, cola larga; pocos productos
+concentran las ventas) y los carga por bloques, sin ORM:
+
+- Postgres: ``COPY ... FROM STDIN`` (psycopg2 ``copy_expert``) por bloque.
+- SQLite: ``executemany`` de un INSERT preparado por bloque.
+
+Los números al azar salen por columnas, un bloque a la vez: con NumPy
+(``default_rng``) si está instalado, si no con ``random`` de la stdlib. Con
+NumPy, productos y pedidos (las tablas grandes) también se arman por columnas:
+arrays, textos con ``np.char`` y un CSV por bloque para COPY, sin bucle por
+fila en Python. Cada bloque tiene su propia semilla derivada de (semilla,
+tabla, bloque), así la salida es la misma para la misma semilla, motor y
+tamaño de bloque. NumPy y stdlib dan datos distintos entre sí: el motor usado
+se informa en el resultado.
+
+Todo va en una transacción; la BD debe estar vacía (ids desde 1).
+"""
+import csv
+import functools
+import io
+import random
+import time
+import zlib
+from array import array
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from itertools import chain, islice, repeat
+from typing import Callable, Dict, Iterator, List, Optional
+
+from sqlalchemy.engine import Engine
+
+from backend.core.contrasenas import calcular_hash
+from backend.db.migraciones import aplicar_pendientes
+
+try:
+    import numpy as np
+except ImportError:  # opcional: sin NumPy se genera con random de la stdlib
+    np = None
+
+PASSWORD = "bench-secreto-123"  # la de todas las cuentas generadas
+TAMANO_BLOQUE = 50_000
+
+# Base de los id manuales, lejos de los que usan los tests
+ID_VENDEDOR_BASE = 5_000_000
+ID_COMPRADOR_BASE = 6_000_000
+
+_INICIO = datetime(2025, 1, 1)
+
+SUSTANTIVOS = [
+    "camiseta", "pantalon", "zapatos", "mochila", "cafe", "chocolate", "taza", "lampara",
+    "cuaderno", "audifonos", "cargador", "vela", "jabon", "bolso", "gorra", "reloj",
+    "libro", "plato", "cojin", "hamaca", "sombrero", "mermelada", "miel", "arepa",
+]
+ADJETIVOS = [
+    "artesanal", "organico", "clasico", "premium", "mini", "grande", "reciclado",
+    "negro", "azul", "rojo", "tejido", "importado", "local", "ecologico",
+]
+
+
+@dataclass(frozen=True)
+class Volumen:
+    vendedores: int
+    productos: int
+    categorias: int
+    compradores: int
+    pedidos: int
+    items_por_pedido: int = 3
+
+
+VOLUMENES: Dict[str, Volumen] = {
+    "chico": Volumen(vendedores=5, productos=200, categorias=5, compradores=20, pedidos=50),
+    "mediano": Volumen(vendedores=50, productos=10_000, categorias=20, compradores=500, pedidos=5_000),
+    "grande": Volumen(vendedores=500, productos=200_000, categorias=60, compradores=10_000, pedidos=100_000),
+    "produccion": Volumen(vendedores=5_000, productos=1_000_000, categorias=200, compradores=100_000,
+                          pedidos=500_000),
+}
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Números al azar por columnas
+# ──────────────────────────────────────────────────────────────────────────────
+def _semilla(semilla: int, flujo: str) -> int:
+    return (semilla << 32) | zlib.crc32(flujo.encode())
+
+
+class _AzarNumpy:
+    motor = "numpy"
+
+    def __init__(self, semilla: int, flujo: str):
+        self._g = np.random.default_rng(_semilla(semilla, flujo))
+
+    def enteros(self, n: int, bajo: int, alto: int) -> "np.ndarray":
+        return self._g.integers(bajo, alto + 1, n)
+
+    def uniformes(self, n: int) -> "np.ndarray":
+        return self._g.random(n)
+
+    def precios(self, n: int, media: float, sigma: float) -> "np.ndarray":
+        return np.round(self._g.lognormal(media, sigma, n), 2)
+
+    def pareto(self, n: int, alfa: float) -> "np.ndarray":
+        return self._g.pareto(alfa, n) + 1  # NumPy da Lomax: +1 -> Pareto clásica (>= 1)
+
+
+class _AzarPython:
+    motor = "python"
+
+    def __init__(self, semilla: int, flujo: str):
+        self._r = random.Random(_semilla(semilla, flujo))
+
+    def enteros(self, n: int, bajo: int, alto: int) -> List[int]:
+        azar, ancho = self._r.random, alto - bajo + 1
+        return [bajo + int(azar() * ancho) for _ in range(n)]
+
+    def uniformes(self, n: int) -> List[float]:
+        azar = self._r.random
+        return [azar() for _ in range(n)]
+
+    def precios(self, n: int, media: float, sigma: float) -> List[float]:
+        lognormal = self._r.lognormvariate
+        return [round(lognormal(media, sigma), 2) for _ in range(n)]
+
+    def pareto(self, n: int, alfa: float) -> List[float]:
+        pareto = self._r.paretovariate
+        return [pareto(alfa) for _ in range(n)]
+
+
+def elegir_motor(motor: str = "auto"):
+    if motor == "auto":
+        motor = "numpy" if np is not None else "python"
+    if motor == "numpy":
+        if np is None:
+            raise RuntimeError("El motor numpy requiere el paquete 'numpy' (pip install numpy)")
+        return _AzarNumpy
+    if motor == "python":
+        return _AzarPython
+    raise ValueError(f"Motor inválido: {motor}")
+
+
+@functools.lru_cache(maxsize=4096)
+def _dia(dias: int) -> str:
+    return (_INICIO + timedelta(days=dias)).date().isoformat() + " "
+
+
+@functools.lru_cache(maxsize=1)
+def _horas() -> List[str]:
+    return [f"{s // 3600:02d}:{s // 60 % 60:02d}:{s % 60:02d}.000000" for s in range(86400)]
+
+
+def _fecha(segundos: int) -> str:
+    """_INICIO + segundos, con el formato que guarda SQLAlchemy en SQLite (Postgres lo acepta en COPY)."""
+    # Por tablas y no con datetime + isoformat por fila: eso era un tercio del tiempo de generar productos
+    dias, resto = divmod(segundos, 86400)
+    return _dia(dias) + _horas()[resto]
+
+
+@functools.lru_cache(maxsize=1)
+def _horas_np() -> "np.ndarray":
+    return np.array(_horas())
+
+
+def _fechas_np(segundos: "np.ndarray") -> "np.ndarray":
+    """_fecha para una columna entera: las mismas tablas, indexadas con arrays."""
+    dias, resto = np.divmod(segundos, 86400)
+    tabla_dias = np.array([_dia(d) for d in range(int(dias.max()) + 1)])
+    return np.char.add(tabla_dias[dias], _horas_np()[resto])
+
+
+def _concatenar(*partes) -> "np.ndarray":
+    """Concatena textos elemento a elemento; las partes son arrays de str o str fijos."""
+    return functools.reduce(np.char.add, partes)
+
+
+def reparto(azar, total: int, partes: int) -> List[int]:
+    """``total`` repartido en ``partes`` con sesgo de Pareto (al menos 1 por parte si alcanza)."""
+    pesos = azar.pareto(partes, 1.2)
+    suma = sum(pesos)
+    minimo = 1 if total >= partes else 0
+    cuotas = [max(minimo, int(total * p / suma)) for p in pesos]
+    # El redondeo se ajusta en las partes más grandes
+    orden = sorted(range(partes), key=lambda i: -pesos[i])
+    diferencia, i = total - sum(cuotas), 0
+    while diferencia:
+        j = orden[i % partes]
+        paso = 1 if diferencia > 0 else -1
+        if cuotas[j] + paso >= minimo:
+            cuotas[j] += paso
+            diferencia -= paso
+        i += 1
+    return cuotas
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Tablas: columnas + generador de bloques (listas de tuplas)
+# ──────────────────────────────────────────────────────────────────────────────
+_COLUMNAS = {
+    "vendedores": ("id", "id_vendedor", "nombre", "email", "password", "estado_cuenta", "created_at", "updated_at"),
+    "tiendas": ("id", "vendedor_id", "nombre_negocio", "slug", "created_at", "updated_at"),
+    "categorias": ("id", "nombre"),
+    "productos": ("id", "tenant_id", "nombre", "descripcion", "precio", "stock", "destacado",
+                  "vendedor_id", "category_id", "created_at", "updated_at"),
+    "compradores": ("id", "id_comprador", "nombre", "email", "password", "estado_cuenta", "direccion",
+                    "created_at", "updated_at"),
+    "pedidos": ("id", "comprador_id", "nombre_cliente", "email_cliente", "direccion", "metodo_pago",
+                "total", "estado", "created_at", "updated_at"),
+    "pedido_items": ("id", "pedido_id", "producto_id", "nombre", "precio", "cantidad"),
+}
+
+
+def _bloques(total: int, tamano: int) -> Iterator[range]:
+    for inicio in range(1, total + 1, tamano):
+        yield range(inicio, min(total, inicio + tamano - 1) + 1)
+
+
+class _Generador:
+    def __init__(self, volumen: Volumen, semilla: int, azar_cls, tamano_bloque: int):
+        self.v = volumen
+        self.semilla = semilla
+        self.azar_cls = azar_cls
+        self.tamano = tamano_bloque
+        self.hash = calcular_hash(PASSWORD)  # uno solo: el costo de scrypt por cuenta no aporta nada
+        # Lo que los pedidos necesitan de cada producto (compacto: 10 bytes por producto)
+        self._sust = array("B")
+        self._adj = array("B")
+        self._precio = array("d")
+
+    def _azar(self, tabla: str, bloque: int = 0):
+        return self.azar_cls(self.semilla, f"{tabla}:{bloque}")
+
+    def vendedores(self):
+        fecha = _fecha(0)
+        for ids in _bloques(self.v.vendedores, self.tamano):
+            yield [(i, ID_VENDEDOR_BASE + i, f"Vendedor {i}", f"vendedor{i}@bench.example.com", self.hash,
+                    "activo", fecha, fecha) for i in ids]
+
+    def tiendas(self):
+        fecha = _fecha(0)
+        for ids in _bloques(self.v.vendedores, self.tamano):
+            yield [(i, i, f"Tienda {i}", f"tienda-bench-{i}", fecha, fecha) for i in ids]
+
+    def categorias(self):
+        yield [(i, f"Categoria bench {i}") for i in range(1, self.v.categorias + 1)]
+
+    def productos(self):
+        v = self.v
+        cuotas = reparto(self._azar("reparto"), v.productos, v.vendedores)
+        duenos = chain.from_iterable(repeat(vid, c) for vid, c in enumerate(cuotas, start=1))
+        n_sust, n_adj = len(SUSTANTIVOS), len(ADJETIVOS)
+        for b, ids in enumerate(_bloques(v.productos, self.tamano)):
+            azar, n = self._azar("productos", b), len(ids)
+            sust = azar.enteros(n, 0, n_sust - 1)
+            adj = azar.enteros(n, 0, n_adj - 1)
+            desc_sust = azar.enteros(n, 0, n_sust - 1)
+            desc_adj = azar.enteros(n, 0, n_adj - 1)
+            precios = azar.precios(n, 3.5, 0.8)
+            destacados = azar.uniformes(n)
+            categorias = azar.enteros(n, 1, v.categorias) if v.categorias else [None] * n
+            vendedor_de = list(islice(duenos, n))
+            self._sust.extend(sust)
+            self._adj.extend(adj)
+            self._precio.extend(precios)
+            filas = []
+            for k, pid in enumerate(ids):
+                fecha = _fecha(pid * 37)
+                filas.append((
+                    pid, 1, f"{SUSTANTIVOS[sust[k]]} {ADJETIVOS[adj[k]]} {pid}",
+                    f"{ADJETIVOS[desc_adj[k]]} {SUSTANTIVOS[desc_sust[k]]} de la tienda {vendedor_de[k]}",
+                    precios[k], 1_000_000,  # stock alto: las compras del benchmark no deben agotar nada
+                    destacados[k] < 0.02, vendedor_de[k], categorias[k], fecha, fecha,
+                ))
+            yield filas
+
+    def compradores(self):
+        fecha = _fecha(0)
+        for ids in _bloques(self.v.compradores, self.tamano):
+            yield [(i, ID_COMPRADOR_BASE + i, f"Comprador {i}", f"comprador{i}@bench.example.com", self.hash,
+                    "activo", f"Calle {i} # {i % 90 + 1}-{i % 50 + 1}", fecha, fecha) for i in ids]
+
+    def pedidos(self):
+        """Bloques de cabeceras y de líneas intercalados: ("pedidos", filas) / ("pedido_items", filas)."""
+        v, lid = self.v, 0
+        for b, ids in enumerate(_bloques(v.pedidos, self.tamano)):
+            azar, n = self._azar("pedidos", b), len(ids)
+            compradores = azar.enteros(n, 1, v.compradores)
+            metodos = azar.uniformes(n)
+            por_pedido = azar.enteros(n, 1, v.items_por_pedido)
+            total_lineas = sum(por_pedido)
+            # Pareto sobre el id: los primeros productos concentran las ventas
+            productos = [min(v.productos, int(x)) for x in azar.pareto(total_lineas, 0.8)]
+            cantidades = azar.enteros(total_lineas, 1, 3)
+            cabeceras, lineas, j = [], [], 0
+            for k, pid in enumerate(ids):
+                total = 0.0
+                for _ in range(por_pedido[k]):
+                    lid += 1
+                    prod, cant = productos[j], cantidades[j]
+                    precio = self._precio[prod - 1]
+                    total += precio * cant
+                    nombre = f"{SUSTANTIVOS[self._sust[prod - 1]]} {ADJETIVOS[self._adj[prod - 1]]} {prod}"
+                    lineas.append((lid, pid, prod, nombre, precio, cant))
+                    j += 1
+                c = compradores[k]
+                fecha = _fecha(pid * 180)
+                cabeceras.append((
+                    pid, ID_COMPRADOR_BASE + c, f"Comprador {c}", f"comprador{c}@bench.example.com",
+                    "Calle bench", "tarjeta" if metodos[k] < 0.5 else "contra_entrega",
+                    round(total, 2), "entregado", fecha, fecha,
+                ))
+            yield "pedidos", cabeceras
+            yield "pedido_items", lineas
+
+
+class _Columnas:
+    """
+    Bloque por columnas (motor numpy): arrays de NumPy o valores fijos para
+    todas las filas. ``csv()`` arma el texto para COPY de una vez.
+    """
+
+    def __init__(self, n: int, columnas: list):
+        self.n = n
+        self.columnas = columnas
+
+    def __len__(self) -> int:
+        return self.n
+
+    def filas(self) -> Iterator[tuple]:
+        """Tuplas para executemany: zip en C sobre listas, sin armar filas a mano."""
+        return zip(*(c.tolist() if isinstance(c, np.ndarray) else repeat(c, self.n) for c in self.columnas))
+
+    def csv(self) -> str:
+        """
+        Cada columna pasa a texto con un solo ``astype(str)`` (floats con el
+        repr más corto, como csv.writer) y se intercala con separadores en una
+        matriz (filas x 2·columnas) que se une con un único ``"".join``. Los
+        textos generados no llevan comas, comillas ni saltos: no hace falta
+        citarlos. None -> campo vacío -> NULL en FORMAT csv.
+        """
+        k = len(self.columnas)
+        celdas = np.empty((self.n, 2 * k), dtype=object)
+        for j, c in enumerate(self.columnas):
+            if isinstance(c, np.ndarray):
+                celdas[:, 2 * j] = c if c.dtype.kind == "U" else c.astype(str)
+            else:
+                celdas[:, 2 * j] = "" if c is None else str(c)
+        celdas[:, 1:-1:2] = ","
+        celdas[:, -1] = "\n"
+        return "".join(celdas.ravel().tolist())
+
+
+class _GeneradorNumpy(_Generador):
+    """Productos y pedidos como columnas de NumPy: mismas reglas que _Generador, sin bucles por fila."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._sustantivos = np.array(SUSTANTIVOS)
+        self._adjetivos = np.array(ADJETIVOS)
+
+    def productos(self):
+        v = self.v
+        cuotas = reparto(self._azar("reparto"), v.productos, v.vendedores)
+        duenos = np.repeat(np.arange(1, v.vendedores + 1), cuotas)
+        n_sust, n_adj = len(SUSTANTIVOS), len(ADJETIVOS)
+        for b, ids in enumerate(_bloques(v.productos, self.tamano)):
+            azar, n = self._azar("productos", b), len(ids)
+            sust = azar.enteros(n, 0, n_sust - 1)
+            adj = azar.enteros(n, 0, n_adj - 1)
+            desc_sust = azar.enteros(n, 0, n_sust - 1)
+            desc_adj = azar.enteros(n, 0, n_adj - 1)
+            precios = azar.precios(n, 3.5, 0.8)
+            destacados = azar.uniformes(n)
+            categorias = azar.enteros(n, 1, v.categorias) if v.categorias else None
+            pids = np.arange(ids.start, ids.stop)
+            vendedor_de = duenos[ids.start - 1:ids.stop - 1]
+            self._sust.frombytes(sust.astype(np.uint8).tobytes())
+            self._adj.frombytes(adj.astype(np.uint8).tobytes())
+            self._precio.frombytes(precios.astype(np.float64).tobytes())
+            fechas = _fechas_np(pids * 37)
+            yield _Columnas(n, [
+                pids, 1, _concatenar(self._sustantivos[sust], " ", self._adjetivos[adj], " ", pids.astype(str)),
+                _concatenar(self._adjetivos[desc_adj], " ", self._sustantivos[desc_sust], " de la tienda ",
+                            vendedor_de.astype(str)),
+                precios, 1_000_000, destacados < 0.02, vendedor_de, categorias, fechas, fechas,
+            ])
+
+    def pedidos(self):
+        v, lid = self.v, 0
+        sust_de = np.array(self._sust)
+        adj_de = np.array(self._adj)
+        precio_de = np.array(self._precio)
+        for b, ids in enumerate(_bloques(v.pedidos, self.tamano)):
+            azar, n = self._azar("pedidos", b), len(ids)
+            compradores = azar.enteros(n, 1, v.compradores)
+            metodos = azar.uniformes(n)
+            por_pedido = azar.enteros(n, 1, v.items_por_pedido)
+            total_lineas = int(por_pedido.sum())
+            # Pareto sobre el id: los primeros productos concentran las ventas
+            productos = np.minimum(azar.pareto(total_lineas, 0.8), v.productos).astype(np.int64)
+            cantidades = azar.enteros(total_lineas, 1, 3)
+
+            pids = np.arange(ids.start, ids.stop)
+            precios = precio_de[productos - 1]
+            # Suma de las líneas de cada pedido (por_pedido >= 1: los inicios son crecientes)
+            inicios = np.concatenate(([0], np.cumsum(por_pedido)[:-1]))
+            totales = np.round(np.add.reduceat(precios * cantidades, inicios), 2)
+            nombres = _concatenar(self._sustantivos[sust_de[productos - 1]], " ",
+                                  self._adjetivos[adj_de[productos - 1]], " ", productos.astype(str))
+            lineas = _Columnas(total_lineas, [
+                np.arange(lid + 1, lid + total_lineas + 1), np.repeat(pids, por_pedido), productos,
+                nombres, precios, cantidades,
+            ])
+            lid += total_lineas
+
+            c = compradores.astype(str)
+            fechas = _fechas_np(pids * 180)
+            cabeceras = _Columnas(n, [
+                pids, ID_COMPRADOR_BASE + compradores, _concatenar("Comprador ", c),
+                _concatenar("comprador", c, "@bench.example.com"), "Calle bench",
+                np.where(metodos < 0.5, "tarjeta", "contra_entrega"), totales, "entregado", fechas, fechas,
+            ])
+            yield "pedidos", cabeceras
+            yield "pedido_items", lineas
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Carga
+# ──────────────────────────────────────────────────────────────────────────────
+class _Cargador:
+    """Escribe bloques de tuplas con la vía rápida de cada motor, en una transacción."""
+
+    def __init__(self, engine: Engine):
+        self.dialecto = engine.dialect.name
+        if self.dialecto not in ("postgresql", "sqlite"):
+            raise RuntimeError(f"Generación masiva no soportada en {self.dialecto}")
+        self.conn = engine.raw_connection()
+        self.cursor = self.conn.cursor()
+        if self.dialecto == "sqlite":
+            self.cursor.execute("PRAGMA cache_size = -262144")  # 256 MB: índices en memoria durante la carga
+
+    def vacia(self) -> bool:
+        self.cursor.execute("SELECT COUNT(*) FROM vendedores")
+        return self.cursor.fetchone()[0] == 0
+
+    def escribir(self, tabla: str, filas) -> int:
+        """``filas``: lista de tuplas, o _Columnas con el motor numpy."""
+        columnas = _COLUMNAS[tabla]
+        por_columnas = isinstance(filas, _Columnas)
+        if self.dialecto == "sqlite":
+            marcas = ", ".join("?" * len(columnas))
+            self.cursor.executemany(f"INSERT INTO {tabla} ({', '.join(columnas)}) VALUES ({marcas})",
+                                    filas.filas() if por_columnas else filas)
+        else:
+            buffer = io.StringIO()
+            if por_columnas:
+                buffer.write(filas.csv())
+            else:
+                csv.writer(buffer).writerows(filas)  # None -> campo vacío -> NULL en FORMAT csv
+            buffer.seek(0)
+            self.cursor.copy_expert(f"COPY {tabla} ({', '.join(columnas)}) FROM STDIN WITH (FORMAT csv)", buffer)
+        return len(filas)
+
+    def ajustar_secuencias(self) -> None:
+        """Postgres: los ids se dieron a mano; cada secuencia sigue desde el máximo."""
+        if self.dialecto != "postgresql":
+            return
+        for tabla in _COLUMNAS:
+            self.cursor.execute(
+                f"SELECT setval(pg_get_serial_sequence('{tabla}', 'id'), COALESCE(MAX(id), 1)) FROM {tabla}"
+            )
+
+    def confirmar(self) -> None:
+        self.conn.commit()
+
+    def cerrar(self, ok: bool) -> None:
+        if not ok:
+            self.conn.rollback()
+        self.cursor.close()
+        self.conn.close()
+
+
+def generar(engine: Engine, volumen: Volumen, semilla: int = 42, motor: str = "auto",
+            tamano_bloque: int = TAMANO_BLOQUE,
+            al_avanzar: Optional[Callable[[str, int], None]] = None) -> Dict[str, dict]:
+    """
+    Crea el esquema (migraciones) y carga ``volumen``. Devuelve, por tabla,
+    filas y segundos. ValueError si la BD ya tiene datos.
+    """
+    aplicar_pendientes(engine)
+    azar_cls = elegir_motor(motor)
+    gen_cls = _GeneradorNumpy if azar_cls.motor == "numpy" else _Generador
+    gen = gen_cls(volumen, semilla, azar_cls, tamano_bloque)
+    resultado = {t: {"filas": 0, "segundos": 0.0} for t in _COLUMNAS}
+    cargador = _Cargador(engine)
+    ok = False
+    try:
+        if not cargador.vacia():
+            raise ValueError("La BD ya tiene vendedores: la generación necesita una BD vacía")
+        fuentes = chain(
+            (("vendedores", f) for f in gen.vendedores()),
+            (("tiendas", f) for f in gen.tiendas()),
+            (("categorias", f) for f in gen.categorias()),
+            (("productos", f) for f in gen.productos()),
+            (("compradores", f) for f in gen.compradores()),
+            gen.pedidos(),
+        )
+        inicio = time.perf_counter()
+        for tabla, filas in fuentes:
+            resultado[tabla]["filas"] += cargador.escribir(tabla, filas)
+            ahora = time.perf_counter()
+            resultado[tabla]["segundos"] += ahora - inicio  # generación + carga del bloque
+            inicio = ahora
+            if al_avanzar is not None:
+                al_avanzar(tabla, resultado[tabla]["filas"])
+        cargador.ajustar_secuencias()
+        cargador.confirmar()
+        ok = True
+    finally:
+        cargador.cerrar(ok)
+    for r in resultado.values():
+        r["segundos"] = round(r["segundos"], 3)
+    return resultado
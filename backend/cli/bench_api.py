@@ -0,0 +1,211 @@
+# backend/cli/bench_api.py
+"""
+Benchmark de carga reproducible de la API (ver backend/bench/).
+
+Siembra una BD con un volumen y una semilla fijos, corre los escenarios
+(vitrina, compra, vendedor) contra la app real e imprime throughput y
+p50/p95/p99 por ruta. El resultado se guarda en JSON para comparar commits:
+
+    python -m backend.cli.bench_api --volumen mediano --salida base.json
+    git checkout otra-rama
+    python -m backend.cli.bench_api --volumen mediano --comparar base.json
+
+Modos:
+    asgi     -> la app en este proceso, vía httpx.ASGITransport (sin red)
+    uvicorn  -> la app en un uvicorn aparte (--workers), vía HTTP local
+
+Por defecto la BD es un SQLite nuevo en un directorio temporal. Con --url
+se usa esa (p. ej. un Postgres vacío); --sin-sembrar reusa una ya sembrada.
+Los límites de login se suben (todas las peticiones salen de la misma IP)
+salvo que LOGIN_RATE_PER_IP / LOGIN_RATE_PER_ACCOUNT vengan en el entorno.
+
+Sale con código 1 si --comparar encuentra regresiones de p95.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+from backend.bench.escenarios import MEZCLA_DEFECTO, parsear_mezcla
+
+
+def _engine(url: str):
+    from sqlmodel import create_engine
+    from backend.db.pool import opciones_engine, preparar_url
+    return create_engine(preparar_url(url), **opciones_engine(url))
+
+
+def _commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def _puerto_libre() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def _correr_asgi(refs, mezcla, args):
+    import httpx
+    from backend.main import app  # después de fijar DATABASE_URL
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as cliente:
+        return await _calentar_y_medir(cliente, refs, mezcla, args)
+
+
+def _entorno_workers(workers: int) -> dict:
+    """Con varios workers las sesiones necesitan un caché compartido (core/tokens.py)."""
+    env = dict(os.environ, WEB_CONCURRENCY=str(workers))
+    if workers > 1 and env.get("CACHE_BACKEND", "memoria") == "memoria":
+        env.update(CACHE_BACKEND="archivo", CACHE_URL=os.path.join(tempfile.mkdtemp(), "cache.db"))
+    return env
+
+
+async def _correr_uvicorn(refs, mezcla, args):
+    import httpx
+    import importlib.util
+
+    if importlib.util.find_spec("uvicorn") is None:
+        raise SystemExit("--modo uvicorn requiere uvicorn (pip install uvicorn)")
+    puerto = _puerto_libre()
+    proceso = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.main:app", "--host", "127.0.0.1",
+         "--port", str(puerto), "--workers", str(args.workers), "--log-level", "warning"],
+        env=_entorno_workers(args.workers),
+    )
+    base = f"http://127.0.0.1:{puerto}"
+    try:
+        async with httpx.AsyncClient(base_url=base, timeout=30) as cliente:
+            limite = time.monotonic() + 30
+            while True:
+                try:
+                    if (await cliente.get("/healthz")).status_code == 200:
+                        break
+                except httpx.TransportError:
+                    pass
+                if proceso.poll() is not None or time.monotonic() > limite:
+                    raise SystemExit("uvicorn no arrancó")
+                await asyncio.sleep(0.1)
+            return await _calentar_y_medir(cliente, refs, mezcla, args)
+    finally:
+        proceso.terminate()
+        proceso.wait(timeout=10)
+
+
+async def _calentar_y_medir(cliente, refs, mezcla, args):
+    from backend.bench.carga import ejecutar
+
+    if args.calentamiento:
+        # Routers diferidos, cachés y pool de conexiones: fuera de la medición
+        await ejecutar(cliente, refs, mezcla, usuarios=args.usuarios,
+                       peticiones=args.calentamiento, semilla=args.semilla + 1)
+    return await ejecutar(cliente, refs, mezcla, usuarios=args.usuarios, peticiones=args.peticiones,
+                          segundos=args.segundos, semilla=args.semilla)
+
+
+def _imprimir(reporte: dict, cambios) -> None:
+    t = reporte["total"]
+    print(f"{t['peticiones']} peticiones en {reporte['segundos']} s -> {t['rps']} req/s, "
+          f"p50 {t['p50_ms']} ms, p95 {t['p95_ms']} ms, p99 {t['p99_ms']} ms, errores {t['errores']}")
+    print(f"\n{'ruta':42} {'n':>6} {'req/s':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'err':>5}")
+    for ruta, d in reporte["rutas"].items():
+        print(f"{ruta:42} {d['peticiones']:>6} {d['rps']:>8} {d['p50_ms']:>8} "
+              f"{d['p95_ms']:>8} {d['p99_ms']:>8} {d['errores']:>5}")
+    if cambios is not None:
+        print("\nComparación p95 (ms):")
+        for c in cambios:
+            marca = "  REGRESIÓN" if c["regresion"] else ""
+            print(f"{c['ruta']:42} {c['antes']:>8} -> {c['ahora']:>8} ({c['cambio']:+.1%}){marca}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--volumen", default="mediano", help="chico | mediano | grande")
+    parser.add_argument("--semilla", type=int, default=42)
+    parser.add_argument("--modo", choices=["asgi", "uvicorn"], default="asgi")
+    parser.add_argument("--workers", type=int, default=1, help="workers de uvicorn")
+    parser.add_argument("--usuarios", type=int, default=10, help="usuarios virtuales concurrentes")
+    parser.add_argument("--peticiones", type=int, default=2000)
+    parser.add_argument("--segundos", type=float, help="corta antes si se cumple este tiempo")
+    parser.add_argument("--calentamiento", type=int, default=200, help="peticiones previas no medidas")
+    parser.add_argument("--mezcla", default=",".join(f"{k}={v}" for k, v in MEZCLA_DEFECTO.items()),
+                        help="pesos por escenario, p. ej. vitrina=7,compra=2,vendedor=1")
+    parser.add_argument("--url", help="DATABASE_URL a usar (por defecto, SQLite temporal)")
+    parser.add_argument("--sin-sembrar", action="store_true", help="la BD de --url ya está sembrada")
+    parser.add_argument("--salida", help="archivo JSON con el resultado")
+    parser.add_argument("--comparar", help="JSON de una corrida anterior")
+    parser.add_argument("--tolerancia", type=float, default=0.15, help="empeoramiento de p95 aceptado")
+    args = parser.parse_args(argv)
+
+    from backend.bench.datos import VOLUMENES
+    if args.volumen not in VOLUMENES:
+        parser.error(f"--volumen debe ser uno de: {', '.join(VOLUMENES)}")
+    mezcla = parsear_mezcla(args.mezcla)
+
+    directorio = None
+    url = args.url
+    if url is None:
+        directorio = tempfile.TemporaryDirectory(prefix="bench_api_")
+        url = f"sqlite:///{directorio.name}/bench.db"
+    # Antes de importar la app: backend.db.engine y el límite de logins leen el entorno al importar
+    os.environ["DATABASE_URL"] = url
+    os.environ.setdefault("LOGIN_RATE_PER_IP", "1000000/1")
+    os.environ.setdefault("LOGIN_RATE_PER_ACCOUNT", "1000000/1")
+
+    from backend.bench.carga import comparar, resumir
+    from backend.bench.datos import referencias, sembrar
+
+    engine = _engine(url)
+    sembradas = None
+    if not args.sin_sembrar:
+        inicio = time.perf_counter()
+        sembradas = sembrar(engine, VOLUMENES[args.volumen], args.semilla)
+        print(f"Sembrado en {time.perf_counter() - inicio:.1f} s: {sembradas}", file=sys.stderr)
+    refs = referencias(engine)
+    engine.dispose()
+
+    correr = _correr_asgi if args.modo == "asgi" else _correr_uvicorn
+    registro = asyncio.run(correr(refs, mezcla, args))
+
+    reporte = {
+        "meta": {
+            "commit": _commit(),
+            "fecha": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+            "nucleos": os.cpu_count(),
+            "modo": args.modo, "workers": args.workers if args.modo == "uvicorn" else None,
+            "bd": url.split(":", 1)[0], "volumen": args.volumen, "semilla": args.semilla,
+            "filas": sembradas, "usuarios": args.usuarios, "mezcla": mezcla,
+        },
+        **resumir(registro),
+    }
+    cambios = None
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as f:
+            cambios = comparar(json.load(f), reporte, tolerancia=args.tolerancia)
+        reporte["comparacion"] = cambios
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as f:
+            json.dump(reporte, f, ensure_ascii=False, indent=2)
+
+    _imprimir(reporte, cambios)
+    if directorio is not None:
+        directorio.cleanup()
+    return 1 if cambios and any(c["regresion"] for c in cambios) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,51 @@
+# backend/cli/bench_contrasenas.py
+"""
+Benchmark del hash de contraseñas (core/contrasenas.py): logins por segundo
+con 1 hilo y con el pool completo, y el cociente por núcleo. Sirve para
+elegir PASSWORD_SCRYPT_LOG_N: como referencia, un login debería costar
+del orden de 50-100 ms de CPU.
+
+    PASSWORD_SCRYPT_LOG_N=14 python -m backend.cli.bench_contrasenas --logins 200
+
+Imprime el resultado en JSON.
+"""
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from backend.core import contrasenas
+
+
+def _medir(hash_: str, logins: int, hilos: int) -> float:
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=hilos) as pool:
+        resultados = list(pool.map(lambda _: contrasenas.comprobar("secreto123", hash_), range(logins)))
+    duracion = time.perf_counter() - inicio
+    assert all(ok for ok, _ in resultados)
+    return logins / duracion
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=100)
+    parser.add_argument("--hilos", type=int, default=contrasenas.WORKERS, help="default: PASSWORD_HASH_WORKERS")
+    args = parser.parse_args(argv)
+
+    hash_ = contrasenas.calcular_hash("secreto123")
+    un_hilo = _medir(hash_, args.logins, 1)
+    varios = _medir(hash_, args.logins, args.hilos)
+    print(json.dumps({
+        "log_n": contrasenas.LOG_N, "r": contrasenas.R, "p": contrasenas.P,
+        "nucleos": os.cpu_count(),
+        "hilos": args.hilos,
+        "ms_por_login": round(1000 / un_hilo, 2),
+        "logins_s_1_hilo": round(un_hilo, 1),
+        "logins_s_pool": round(varios, 1),
+        "logins_s_por_nucleo": round(varios / min(args.hilos, os.cpu_count() or 1), 1),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+# backend/cli/bench_serializacion.py
+"""
+Benchmark de páginas de 200 productos: camino clásico (select(Producto) +
+model_validate por fila + validación del response_model) contra el camino
+rápido de GET /productos/ (columnas + orjson, core/serializacion.py).
+
+    python -m backend.cli.bench_serializacion --iteraciones 200
+
+Usa SQLite en memoria con datos sintéticos; imprime filas/segundo en JSON.
+"""
+import argparse
+import json
+import os
+import time
+from typing import List
+
+os.environ.setdefault("TESTING", "1")
+
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import func
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from backend.db.engine import get_session
+from backend.Modelos import Producto, Vendedor
+from backend.Routers import Productos
+
+
+def _preparar(n_productos: int):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as s:
+        v = Vendedor(id_vendedor=1, nombre="Bench", email="bench@example.com", password="x")
+        s.add(v)
+        s.flush()
+        s.add_all([
+            Producto(
+                nombre=f"Producto {i}", descripcion="x" * 80, precio=1.5 + i, stock=i % 50,
+                vendedor_id=v.id, external_id=f"SKU-{i}", source="bench",
+                imagen_url=f"https://cdn.example.com/{i}.jpg",
+            )
+            for i in range(n_productos)
+        ])
+        s.commit()
+
+    def sesion():
+        with Session(engine) as s:
+            yield s
+
+    app = FastAPI()
+    app.include_router(Productos.router)
+
+    # Camino anterior, tal como estaba listar_productos (incluida la consulta del ETag)
+    @app.get("/antes", response_model=List[Productos.ProductoRead])
+    def antes(limit: int = 200, session: Session = Depends(sesion)):
+        session.exec(select(func.count(), func.max(Producto.updated_at)).select_from(Producto)).one()
+        rows = session.exec(select(Producto).offset(0).limit(limit)).all()
+        return [Productos.ProductoRead.model_validate(r, from_attributes=True) for r in rows]
+
+    app.dependency_overrides[get_session] = sesion
+    return TestClient(app)
+
+
+def _medir(client: TestClient, url: str, iteraciones: int, limit: int) -> dict:
+    client.get(url, params={"limit": limit})  # calentamiento
+    filas = 0
+    inicio = time.perf_counter()
+    for _ in range(iteraciones):
+        filas += len(client.get(url, params={"limit": limit}).json())
+    segundos = time.perf_counter() - inicio
+    return {
+        "segundos": round(segundos, 3),
+        "ms_por_pagina": round(segundos * 1000 / iteraciones, 3),
+        "filas_por_segundo": round(filas / segundos, 1),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark de serialización de listados")
+    parser.add_argument("--iteraciones", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=200)
+    parser.add_argument("--productos", type=int, default=2000)
+    args = parser.parse_args(argv)
+
+    client = _preparar(args.productos)
+    antes = _medir(client, "/antes", args.iteraciones, args.limit)
+    despues = _medir(client, "/productos/", args.iteraciones, args.limit)
+    print(json.dumps({
+        "limit": args.limit,
+        "iteraciones": args.iteraciones,
+        "antes": antes,
+        "despues": despues,
+        "aceleracion": round(despues["filas_por_segundo"] / antes["filas_por_segundo"], 2),
+    }, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
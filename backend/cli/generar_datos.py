@@ -0,0 +1,86 @@
+# backend/cli/generar_datos.py
+"""
+Genera datos sintéticos a escala de producción en una BD vacía (ver
+backend/bench/sintetico.py): vendedores/tiendas con sesgo (pocas grandes,
+cola larga), productos, compradores y pedidos con sus líneas.
+
+    python -m backend.cli.generar_datos --volumen produccion --url sqlite:///./sintetico.db
+    python -m backend.cli.generar_datos --productos 2000000 --vendedores 8000 --semilla 7 \\
+        --url postgresql+psycopg2://...
+
+Sin --url usa DATABASE_URL. Con NumPy instalado genera por columnas con
+NumPy; si no, con random de la stdlib (--motor fuerza uno). Postgres carga
+con COPY, SQLite con executemany. Imprime el resultado en JSON.
+"""
+import argparse
+import json
+import sys
+import time
+from dataclasses import replace
+
+from backend.bench.sintetico import TAMANO_BLOQUE, VOLUMENES, elegir_motor, generar
+
+
+def _engine(url):
+    if url is None:
+        from backend.db.engine import get_engine
+        return get_engine()
+    from sqlmodel import create_engine
+    from backend.db.pool import opciones_engine, preparar_url
+    return create_engine(preparar_url(url), **opciones_engine(url))
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--volumen", default="produccion", help=" | ".join(VOLUMENES))
+    for campo in ("vendedores", "productos", "categorias", "compradores", "pedidos"):
+        parser.add_argument(f"--{campo}", type=int, help="reemplaza el valor del --volumen")
+    parser.add_argument("--semilla", type=int, default=42)
+    parser.add_argument("--motor", choices=["auto", "numpy", "python"], default="auto")
+    parser.add_argument("--bloque", type=int, default=TAMANO_BLOQUE, help="filas por COPY/executemany")
+    parser.add_argument("--url", help="BD destino (por defecto, DATABASE_URL)")
+    parser.add_argument("--silencioso", action="store_true", help="sin progreso en stderr")
+    args = parser.parse_args(argv)
+
+    if args.volumen not in VOLUMENES:
+        parser.error(f"--volumen debe ser uno de: {', '.join(VOLUMENES)}")
+    cambios = {c: getattr(args, c) for c in ("vendedores", "productos", "categorias", "compradores", "pedidos")
+               if getattr(args, c) is not None}
+    volumen = replace(VOLUMENES[args.volumen], **cambios)
+    try:
+        motor = elegir_motor(args.motor).motor
+    except RuntimeError as e:
+        parser.error(str(e))
+
+    def progreso(tabla: str, filas: int) -> None:
+        print(f"\r{tabla}: {filas:,} filas".ljust(40), end="", file=sys.stderr, flush=True)
+
+    engine = _engine(args.url)
+    inicio = time.perf_counter()
+    try:
+        tablas = generar(engine, volumen, args.semilla, motor=motor, tamano_bloque=args.bloque,
+                         al_avanzar=None if args.silencioso else progreso)
+    except ValueError as e:
+        print(f"\n{e}", file=sys.stderr)
+        return 1
+    segundos = time.perf_counter() - inicio
+    if not args.silencioso:
+        print(file=sys.stderr)
+
+    filas = sum(t["filas"] for t in tablas.values())
+    print(json.dumps({
+        "bd": engine.dialect.name,
+        "motor": motor,
+        "semilla": args.semilla,
+        "volumen": volumen.__dict__,
+        "segundos": round(segundos, 2),
+        "filas": filas,
+        "filas_por_segundo": round(filas / segundos) if segundos else None,
+        "tablas": {t: dict(r, filas_por_segundo=round(r["filas"] / r["segundos"]) if r["segundos"] else None)
+                   for t, r in tablas.items()},
+    }, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
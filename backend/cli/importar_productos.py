@@ -0,0 +1,41 @@
+# backend/cli/importar_productos.py
+"""
+Importa un catálogo CSV/JSONL directo a la BD (misma lógica que POST /productos/bulk).
+
+    python -m backend.cli.importar_productos catalogo.csv --id-vendedor 80027655
+    python -m backend.cli.importar_productos catalogo.jsonl --lote 5000
+"""
+import argparse
+import json
+import time
+
+from sqlmodel import Session
+
+from backend.CRUD.Importacion_Producto import TAMANO_LOTE, importar_productos, lector
+from backend.db.engine import get_engine
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Importación masiva de productos")
+    parser.add_argument("archivo")
+    parser.add_argument("--formato", choices=["csv", "jsonl"], help="por defecto, según la extensión")
+    parser.add_argument("--id-vendedor", type=int, help="id_vendedor (manual) para filas que no lo traen")
+    parser.add_argument("--lote", type=int, default=TAMANO_LOTE, help="filas por INSERT")
+    args = parser.parse_args(argv)
+
+    formato = args.formato or ("jsonl" if args.archivo.endswith((".jsonl", ".ndjson")) else "csv")
+    inicio = time.perf_counter()
+    with open(args.archivo, encoding="utf-8-sig", newline="") as f, Session(get_engine()) as session:
+        res = importar_productos(
+            session, lector(formato, f), id_vendedor_default=args.id_vendedor, tamano_lote=args.lote
+        )
+    segundos = time.perf_counter() - inicio
+
+    resumen = dict(res.__dict__, segundos=round(segundos, 3),
+                   filas_por_segundo=round(res.filas / segundos, 1) if segundos else None)
+    print(json.dumps(resumen, ensure_ascii=False, indent=2))
+    return 1 if res.total_errores else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,59 @@
+# backend/cli/migrar.py
+"""
+Migraciones del esquema fuera de banda (ver backend/db/migraciones.py).
+
+    python -m backend.cli.migrar estado
+    python -m backend.cli.migrar aplicar
+    python -m backend.cli.migrar aplicar --hasta 2 --url postgresql+psycopg2://...
+
+Con --url se usa esa conexión en vez de DATABASE_URL (p. ej. la conexión
+directa de Supabase, puerto 5432, en lugar del pooler en modo transacción).
+Si se migra así antes de desplegar, se puede arrancar con
+MIGRATIONS_ON_STARTUP=0: el arranque solo comprueba la huella.
+"""
+import argparse
+import json
+import time
+
+from backend.db.migraciones import MigracionIncompleta, aplicar_pendientes, estado
+
+
+def _engine(url):
+    if url is None:
+        from backend.db.engine import get_engine
+        return get_engine()
+    from sqlmodel import create_engine
+    from backend.db.pool import preparar_url
+    return create_engine(preparar_url(url))
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Migraciones del esquema")
+    parser.add_argument("accion", choices=["estado", "aplicar"])
+    parser.add_argument("--hasta", type=int, help="aplicar solo hasta esta versión")
+    parser.add_argument("--url", help="URL de BD (por defecto DATABASE_URL)")
+    args = parser.parse_args(argv)
+
+    engine = _engine(args.url)
+    if args.accion == "estado":
+        info = estado(engine)
+        print(json.dumps(info, ensure_ascii=False, indent=2))
+        return 0 if info["al_dia"] else 1
+
+    inicio = time.perf_counter()
+    error = None
+    try:
+        aplicadas = aplicar_pendientes(engine, hasta=args.hasta)
+    except MigracionIncompleta as e:
+        aplicadas, error = e.aplicadas, str(e)
+    print(json.dumps({
+        "aplicadas": aplicadas,
+        "error": error,
+        "segundos": round(time.perf_counter() - inicio, 3),
+        **estado(engine),
+    }, ensure_ascii=False, indent=2))
+    return 1 if error else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,117 @@
+# backend/cli/tiempo_arranque.py
+"""
+Tiempo de arranque en frío de la API: qué módulos pesan al importar
+backend.main (``python -X importtime``) y cuánto tarda la app en responder
+su primer GET /healthz, cada medición en un proceso nuevo.
+
+    python -m backend.cli.tiempo_arranque
+    python -m backend.cli.tiempo_arranque --top 30 --json
+
+Corre con TESTING=1 salvo que el entorno diga otra cosa: mide el proceso,
+no la verificación de esquema contra la BD del lifespan.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from dataclasses import asdict, dataclass
+from typing import List
+
+MODULO = "backend.main"
+
+# Import + primera petición, medido dentro del proceso hijo
+_SCRIPT_LISTO = """
+import time
+inicio = time.perf_counter()
+import {modulo} as m
+importado = time.perf_counter()
+from fastapi.testclient import TestClient
+with TestClient(m.app) as c:
+    assert c.get("/healthz").status_code == 200
+listo = time.perf_counter()
+print(importado - inicio, listo - inicio)
+"""
+
+
+@dataclass(frozen=True)
+class Importacion:
+    modulo: str
+    propio_ms: float
+    acumulado_ms: float
+
+
+def _entorno() -> dict:
+    entorno = dict(os.environ)
+    entorno.setdefault("TESTING", "1")
+    return entorno
+
+
+def perfil_importacion(modulo: str = MODULO) -> List[Importacion]:
+    """Una fila por módulo importado, en el orden en que ``-X importtime`` los informa."""
+    proceso = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {modulo}"],
+        capture_output=True, text=True, env=_entorno(), check=True,
+    )
+    filas = []
+    for linea in proceso.stderr.splitlines():
+        # "import time:  self [us] | cumulative | imported package"
+        if not linea.startswith("import time:"):
+            continue
+        propio, acumulado, nombre = linea[len("import time:"):].split("|", 2)
+        try:
+            filas.append(Importacion(nombre.strip(), int(propio) / 1000, int(acumulado) / 1000))
+        except ValueError:
+            continue  # encabezado
+    return filas
+
+
+def tiempo_listo(modulo: str = MODULO) -> dict:
+    """Segundos hasta terminar el import y hasta responder el primer /healthz."""
+    proceso = subprocess.run(
+        [sys.executable, "-c", _SCRIPT_LISTO.format(modulo=modulo)],
+        capture_output=True, text=True, env=_entorno(), check=True,
+    )
+    importado, listo = map(float, proceso.stdout.split()[-2:])
+    return {"import_s": round(importado, 3), "listo_s": round(listo, 3)}
+
+
+def _propios(filas: List[Importacion], prefijo: str) -> float:
+    return sum(f.propio_ms for f in filas if f.modulo == prefijo or f.modulo.startswith(prefijo + "."))
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modulo", default=MODULO)
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--json", action="store_true", help="salida en JSON")
+    args = parser.parse_args(argv)
+
+    filas = perfil_importacion(args.modulo)
+    raiz = args.modulo.split(".")[0]
+    por_propio = sorted(filas, key=lambda f: f.propio_ms, reverse=True)[: args.top]
+    por_acumulado = sorted(filas, key=lambda f: f.acumulado_ms, reverse=True)[: args.top]
+    reporte = {
+        "modulo": args.modulo,
+        "modulos_importados": len(filas),
+        "total_ms": round(sum(f.propio_ms for f in filas), 1),
+        f"{raiz}_propio_ms": round(_propios(filas, raiz), 1),
+        **tiempo_listo(args.modulo),
+        "top_propio": [asdict(f) for f in por_propio],
+        "top_acumulado": [asdict(f) for f in por_acumulado],
+    }
+    if args.json:
+        print(json.dumps(reporte, indent=2))
+        return
+
+    print(f"{args.modulo}: {reporte['modulos_importados']} módulos, {reporte['total_ms']} ms "
+          f"({reporte[raiz + '_propio_ms']} ms en {raiz}.*)")
+    print(f"import {reporte['import_s']} s, primer /healthz {reporte['listo_s']} s")
+    for titulo, lista, campo in (("propio", por_propio, "propio_ms"), ("acumulado", por_acumulado, "acumulado_ms")):
+        print(f"\nTop {args.top} por tiempo {titulo} (ms):")
+        for f in lista:
+            print(f"{getattr(f, campo):10.1f}  {f.modulo}")
+
+
+if __name__ == "__main__":
+    main()
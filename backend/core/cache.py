@@ -0,0 +1,596 @@
+# backend/core/cache.py
+"""
+Caché para lecturas públicas de la vitrina que cambian poco: tienda por slug,
+productos de una tienda, destacados y categorías.
+
+Dos niveles:
+- L1 en proceso (CacheLRU: LRU + TTL).
+- L2 compartido opcional entre workers/instancias (CACHE_BACKEND):
+    memoria  -> solo L1 (por defecto)
+    archivo  -> CacheArchivo, un archivo SQLite en la misma máquina (CACHE_URL = ruta)
+    redis    -> CacheRedis, cualquier servidor con protocolo Redis (CACHE_URL = redis://...)
+
+Con L2, cada invalidación se publica como mensaje (tabla/stream de
+invalidaciones) y los demás workers lo aplican a su L1 al siguiente acceso, así
+que el L1 nunca sirve datos viejos más allá de CACHE_SYNC_SECONDS. Los
+mensajes se retienen un tiempo (``retencion_mensajes``): un suscriptor que
+necesita lo publicado antes de que arrancara el worker (las revocaciones de
+sesión) lo pide con ``suscribir(fn, reproducir=segundos)``. Las cargas
+en frío se coalescen (single-flight): en un proceso solo un hilo ejecuta la
+consulta por clave y, con L2, solo un worker a la vez (lock en el backend).
+
+Los valores deben ser JSON-serializables (se guardan como JSON en el L2).
+"""
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+_MISSING = object()
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# L1: memoria del proceso
+# ──────────────────────────────────────────────────────────────────────────────
+class CacheLRU:
+    def __init__(self, max_entries: int = 1024, ttl: float = 60.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def habilitada(self) -> bool:
+        return self.ttl > 0 and self.max_entries > 0
+
+    def obtener(self, clave: Hashable, default: Any = None) -> Any:
+        ahora = time.monotonic()
+        with self._lock:
+            item = self._data.get(clave, _MISSING)
+            if item is not _MISSING:
+                expira, valor = item
+                if expira > ahora:
+                    self._data.move_to_end(clave)
+                    self.hits += 1
+                    return valor
+                del self._data[clave]
+            self.misses += 1
+            return default
+
+    def guardar(self, clave: Hashable, valor: Any, ttl: Optional[float] = None) -> None:
+        if not self.habilitada:
+            return
+        expira = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[clave] = (expira, valor)
+            self._data.move_to_end(clave)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def obtener_o_cargar(self, clave: Hashable, cargar: Callable[[], Any], ttl: Optional[float] = None) -> Any:
+        valor = self.obtener(clave, _MISSING)
+        if valor is _MISSING:
+            valor = cargar()
+            self.guardar(clave, valor, ttl)
+        return valor
+
+    def invalidar(self, clave: Hashable) -> None:
+        with self._lock:
+            self._data.pop(clave, None)
+
+    def invalidar_prefijo(self, prefijo: str) -> None:
+        with self._lock:
+            for k in [k for k in self._data if isinstance(k, str) and k.startswith(prefijo)]:
+                del self._data[k]
+
+    def limpiar(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def estadisticas(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entradas": len(self._data),
+                "max_entradas": self.max_entries,
+                "ttl_segundos": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+            }
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# L2: backends compartidos
+#   obtener / guardar / invalidar / invalidar_prefijo / limpiar
+#   publicar(patron) + mensajes_desde(cursor) -> bus de invalidaciones
+#   mensajes_recientes(segundos) -> lo publicado en esa ventana (al arrancar)
+#   bloquear / liberar -> lock de carga entre workers
+# Un patrón que termina en "*" invalida por prefijo.
+# ──────────────────────────────────────────────────────────────────────────────
+class CacheArchivo:
+    """L2 en un archivo SQLite (WAL): varios workers en una misma máquina, sin red."""
+
+    nombre = "archivo"
+
+    def __init__(self, ruta: str, ttl: float = 60.0, retencion_mensajes: float = 300.0):
+        self.ruta = ruta
+        self.ttl = ttl
+        self.retencion_mensajes = retencion_mensajes
+        self._local = threading.local()
+        with self._conn() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entradas ("
+                " clave TEXT PRIMARY KEY, valor TEXT NOT NULL, expira REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_invalidaciones ("
+                " seq INTEGER PRIMARY KEY AUTOINCREMENT, patron TEXT NOT NULL, ts REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_locks ("
+                " clave TEXT PRIMARY KEY, expira REAL NOT NULL)"
+            )
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.ruta, timeout=5.0, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def obtener(self, clave: str, default: Any = None) -> Any:
+        row = self._conn().execute(
+            "SELECT valor FROM cache_entradas WHERE clave = ? AND expira > ?",
+            (clave, time.time()),
+        ).fetchone()
+        return default if row is None else json.loads(row[0])
+
+    def guardar(self, clave: str, valor: Any, ttl: Optional[float] = None) -> None:
+        expira = time.time() + (self.ttl if ttl is None else ttl)
+        self._conn().execute(
+            "INSERT OR REPLACE INTO cache_entradas (clave, valor, expira) VALUES (?, ?, ?)",
+            (clave, json.dumps(valor, default=str), expira),
+        )
+
+    def invalidar(self, clave: str) -> None:
+        self._conn().execute("DELETE FROM cache_entradas WHERE clave = ?", (clave,))
+
+    def invalidar_prefijo(self, prefijo: str) -> None:
+        self._conn().execute(
+            "DELETE FROM cache_entradas WHERE substr(clave, 1, ?) = ?",
+            (len(prefijo), prefijo),
+        )
+
+    def limpiar(self) -> None:
+        self._conn().execute("DELETE FROM cache_entradas")
+
+    def publicar(self, patron: str) -> None:
+        ahora = time.time()
+        conn = self._conn()
+        conn.execute("INSERT INTO cache_invalidaciones (patron, ts) VALUES (?, ?)", (patron, ahora))
+        conn.execute("DELETE FROM cache_invalidaciones WHERE ts < ?", (ahora - self.retencion_mensajes,))
+
+    def mensajes_desde(self, cursor: Optional[int]) -> Tuple[List[str], int]:
+        conn = self._conn()
+        if cursor is None:
+            # Primer acceso: empezar desde el último mensaje
+            (ultimo,) = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM cache_invalidaciones").fetchone()
+            return [], ultimo
+        rows = conn.execute(
+            "SELECT seq, patron FROM cache_invalidaciones WHERE seq > ? ORDER BY seq",
+            (cursor,),
+        ).fetchall()
+        return [p for _, p in rows], (rows[-1][0] if rows else cursor)
+
+    def mensajes_recientes(self, segundos: float) -> List[str]:
+        rows = self._conn().execute(
+            "SELECT patron FROM cache_invalidaciones WHERE ts >= ? ORDER BY seq",
+            (time.time() - segundos,),
+        ).fetchall()
+        return [p for (p,) in rows]
+
+    def bloquear(self, clave: str, ttl: float) -> bool:
+        ahora = time.time()
+        conn = self._conn()
+        conn.execute("DELETE FROM cache_locks WHERE clave = ? AND expira <= ?", (clave, ahora))
+        cur = conn.execute(
+            "INSERT OR IGNORE INTO cache_locks (clave, expira) VALUES (?, ?)",
+            (clave, ahora + ttl),
+        )
+        return cur.rowcount == 1
+
+    def liberar(self, clave: str) -> None:
+        self._conn().execute("DELETE FROM cache_locks WHERE clave = ?", (clave,))
+
+
+class CacheRedis:
+    """L2 en un servidor con protocolo Redis (Redis, Valkey, KeyDB...)."""
+
+    nombre = "redis"
+
+    def __init__(
+        self, url: str, ttl: float = 60.0, namespace: str = "ecommerce:cache:", retencion_mensajes: float = 300.0,
+    ):
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("CACHE_BACKEND=redis requiere el paquete 'redis' (pip install redis)") from e
+        self._r = redis.Redis.from_url(url)
+        self.ttl = ttl
+        self.ns = namespace
+        self.retencion_mensajes = retencion_mensajes
+        self._stream = namespace + "invalidaciones"
+
+    def obtener(self, clave: str, default: Any = None) -> Any:
+        raw = self._r.get(self.ns + clave)
+        return default if raw is None else json.loads(raw)
+
+    def guardar(self, clave: str, valor: Any, ttl: Optional[float] = None) -> None:
+        ms = int((self.ttl if ttl is None else ttl) * 1000)
+        self._r.set(self.ns + clave, json.dumps(valor, default=str), px=ms)
+
+    def invalidar(self, clave: str) -> None:
+        self._r.delete(self.ns + clave)
+
+    def invalidar_prefijo(self, prefijo: str) -> None:
+        claves = list(self._r.scan_iter(match=self.ns + prefijo + "*", count=500))
+        if claves:
+            self._r.unlink(*claves)
+
+    def limpiar(self) -> None:
+        self.invalidar_prefijo("")
+
+    def publicar(self, patron: str) -> None:
+        # Recorte por antigüedad (los ids del stream son ms): MINID, Redis >= 6.2
+        minimo = int((time.time() - self.retencion_mensajes) * 1000)
+        self._r.xadd(self._stream, {"p": patron}, minid=f"{minimo}-0", approximate=True)
+
+    def mensajes_desde(self, cursor: Optional[str]) -> Tuple[List[str], str]:
+        if cursor is None:
+            ultimo = self._r.xrevrange(self._stream, count=1)
+            return [], (ultimo[0][0] if ultimo else "0-0")
+        rows = self._r.xread({self._stream: cursor}, count=1000) or []
+        mensajes, nuevo = [], cursor
+        for _, entradas in rows:
+            for msg_id, campos in entradas:
+                mensajes.append(campos[b"p"].decode())
+                nuevo = msg_id
+        return mensajes, nuevo
+
+    def mensajes_recientes(self, segundos: float) -> List[str]:
+        desde = int((time.time() - segundos) * 1000)
+        return [campos[b"p"].decode() for _, campos in self._r.xrange(self._stream, min=f"{desde}-0")]
+
+    def bloquear(self, clave: str, ttl: float) -> bool:
+        return bool(self._r.set(self.ns + "lock:" + clave, b"1", nx=True, px=int(ttl * 1000)))
+
+    def liberar(self, clave: str) -> None:
+        self._r.delete(self.ns + "lock:" + clave)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Single-flight: una sola carga concurrente por clave dentro del proceso
+# ──────────────────────────────────────────────────────────────────────────────
+class _Llamada:
+    __slots__ = ("evento", "valor", "error")
+
+    def __init__(self):
+        self.evento = threading.Event()
+        self.valor = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._llamadas: Dict[Hashable, _Llamada] = {}
+        self.coalescidas = 0
+
+    def hacer(self, clave: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            llamada = self._llamadas.get(clave)
+            lider = llamada is None
+            if lider:
+                llamada = self._llamadas[clave] = _Llamada()
+            else:
+                self.coalescidas += 1
+
+        if not lider:
+            llamada.evento.wait()
+            if llamada.error is not None:
+                raise llamada.error
+            return llamada.valor
+
+        try:
+            llamada.valor = fn()
+            return llamada.valor
+        except BaseException as e:
+            llamada.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._llamadas[clave]
+            llamada.evento.set()
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Fachada usada por los routers
+# ──────────────────────────────────────────────────────────────────────────────
+class Cache:
+    def __init__(
+        self,
+        local: CacheLRU,
+        compartido=None,
+        intervalo_sync: float = 0.5,
+        espera_lock: float = 2.0,
+    ):
+        self.local = local
+        self.compartido = compartido
+        self.intervalo_sync = intervalo_sync
+        self.espera_lock = espera_lock
+        self._vuelos = SingleFlight()
+        self._vuelos_async: Dict[str, "asyncio.Future"] = {}
+        self._sync_lock = threading.Lock()
+        self._cursor = None
+        self._proximo_sync = 0.0
+        self.hits_compartido = 0
+        self.cargas = 0
+        self.invalidaciones_recibidas = 0
+        self._suscriptores: List[Callable[[str], None]] = []
+        if compartido is not None:
+            self._cursor = compartido.mensajes_desde(None)[1]
+
+    @property
+    def backend(self) -> str:
+        return getattr(self.compartido, "nombre", "memoria")
+
+    # ---- bus de invalidaciones ------------------------------------------------
+    def suscribir(self, fn: Callable[[str], None], reproducir: float = 0) -> None:
+        """
+        ``fn(patron)`` recibe cada invalidación, local o de otro worker. Con
+        ``reproducir`` (segundos) y L2, recibe además lo publicado en esa
+        ventana antes de suscribirse, y el L2 retiene los mensajes al menos
+        ese tiempo.
+        """
+        self._suscriptores.append(fn)
+        if reproducir and self.compartido is not None:
+            self.compartido.retencion_mensajes = max(self.compartido.retencion_mensajes, reproducir)
+            for patron in self.compartido.mensajes_recientes(reproducir):
+                fn(patron)
+
+    def _aplicar(self, patron: str) -> None:
+        if patron.endswith("*"):
+            self.local.invalidar_prefijo(patron[:-1])
+        else:
+            self.local.invalidar(patron)
+        for fn in self._suscriptores:
+            fn(patron)
+
+    def sincronizar(self, forzar: bool = False) -> None:
+        """Aplica al L1 las invalidaciones publicadas por otros workers."""
+        if self.compartido is None:
+            return
+        ahora = time.monotonic()
+        if not forzar and ahora < self._proximo_sync:
+            return
+        with self._sync_lock:
+            mensajes, self._cursor = self.compartido.mensajes_desde(self._cursor)
+            self._proximo_sync = ahora + self.intervalo_sync
+        for patron in mensajes:
+            self._aplicar(patron)
+        self.invalidaciones_recibidas += len(mensajes)
+
+    def _emitir(self, patron: str) -> None:
+        self._aplicar(patron)
+        if self.compartido is not None:
+            if patron.endswith("*"):
+                self.compartido.invalidar_prefijo(patron[:-1])
+            else:
+                self.compartido.invalidar(patron)
+            self.compartido.publicar(patron)
+
+    # ---- API ------------------------------------------------------------------
+    def obtener_o_cargar(self, clave: str, cargar: Callable[[], Any], ttl: Optional[float] = None) -> Any:
+        self.sincronizar()
+        valor = self.local.obtener(clave, _MISSING)
+        if valor is not _MISSING:
+            return valor
+        return self._vuelos.hacer(clave, lambda: self._cargar(clave, cargar, ttl))
+
+    def _cargar(self, clave: str, cargar: Callable[[], Any], ttl: Optional[float]) -> Any:
+        if self.compartido is None:
+            valor = cargar()
+            self.cargas += 1
+            self.local.guardar(clave, valor, ttl)
+            return valor
+
+        valor = self.compartido.obtener(clave, _MISSING)
+        if valor is _MISSING and not self.compartido.bloquear(clave, self.espera_lock):
+            # Otro worker está cargando esta clave: esperar su resultado
+            limite = time.monotonic() + self.espera_lock
+            while valor is _MISSING and time.monotonic() < limite:
+                time.sleep(0.01)
+                valor = self.compartido.obtener(clave, _MISSING)
+            if valor is _MISSING:
+                # No llegó a tiempo: cargar igual (sin lock) antes que fallar
+                valor = cargar()
+                self.cargas += 1
+                self.compartido.guardar(clave, valor, ttl)
+        elif valor is _MISSING:
+            try:
+                valor = cargar()
+                self.cargas += 1
+                self.compartido.guardar(clave, valor, ttl)
+            finally:
+                self.compartido.liberar(clave)
+        else:
+            self.hits_compartido += 1
+
+        self.local.guardar(clave, valor, ttl)
+        return valor
+
+    async def obtener_o_cargar_async(self, clave: str, cargar: Callable[[], Any], ttl: Optional[float] = None) -> Any:
+        """
+        Variante para handlers async: ``cargar`` es una corrutina. El
+        single-flight es por event loop (las cargas concurrentes de la misma
+        clave esperan al mismo futuro); el L2 se consulta igual que en sync.
+        """
+        self.sincronizar()
+        valor = self.local.obtener(clave, _MISSING)
+        if valor is not _MISSING:
+            return valor
+        if self.compartido is not None:
+            valor = self.compartido.obtener(clave, _MISSING)
+            if valor is not _MISSING:
+                self.hits_compartido += 1
+                self.local.guardar(clave, valor, ttl)
+                return valor
+
+        en_vuelo = self._vuelos_async.get(clave)
+        if en_vuelo is not None:
+            self._vuelos.coalescidas += 1
+            return await asyncio.shield(en_vuelo)
+
+        futuro = asyncio.get_running_loop().create_future()
+        self._vuelos_async[clave] = futuro
+        try:
+            valor = await cargar()
+            self.cargas += 1
+            if self.compartido is not None:
+                self.compartido.guardar(clave, valor, ttl)
+            self.local.guardar(clave, valor, ttl)
+            futuro.set_result(valor)
+            return valor
+        except BaseException as e:
+            futuro.set_exception(e)
+            futuro.exception()  # marcar como recuperada si nadie más esperaba
+            raise
+        finally:
+            del self._vuelos_async[clave]
+
+    def invalidar(self, clave: str) -> None:
+        self._emitir(clave)
+
+    def invalidar_prefijo(self, prefijo: str) -> None:
+        self._emitir(prefijo + "*")
+
+    def limpiar(self) -> None:
+        self.local.limpiar()
+        for fn in self._suscriptores:
+            fn("*")
+        if self.compartido is not None:
+            self.compartido.limpiar()
+            self.compartido.publicar("*")
+
+    def estadisticas(self) -> Dict[str, Any]:
+        stats = self.local.estadisticas()
+        stats["misses_local"] = stats.pop("misses")
+        stats.update({
+            "backend": self.backend,
+            "hits": stats["hits"] + self.hits_compartido,
+            "hits_local": stats["hits"],
+            "hits_compartido": self.hits_compartido,
+            "cargas": self.cargas,
+            "coalescidas": self._vuelos.coalescidas,
+            "invalidaciones_recibidas": self.invalidaciones_recibidas,
+        })
+        return stats
+
+
+def crear_cache_desde_entorno() -> Cache:
+    ttl = float(os.getenv("CACHE_TTL_SECONDS", "60"))
+    max_entries = int(os.getenv("CACHE_MAX_ENTRIES", "1024"))
+    backend = os.getenv("CACHE_BACKEND", "memoria").lower()
+    url = os.getenv("CACHE_URL")
+
+    if backend == "memoria":
+        return Cache(CacheLRU(max_entries=max_entries, ttl=ttl))
+
+    if backend == "archivo":
+        compartido = CacheArchivo(url or "./cache.db", ttl=ttl)
+    elif backend == "redis":
+        compartido = CacheRedis(url or "redis://localhost:6379/0", ttl=ttl)
+    else:
+        raise ValueError(f"CACHE_BACKEND inválido: {backend}")
+
+    # Con L2 el L1 vive poco: acota lo que un worker puede servir desactualizado
+    ttl_local = min(ttl, float(os.getenv("CACHE_LOCAL_TTL_SECONDS", "5")))
+    return Cache(
+        CacheLRU(max_entries=max_entries, ttl=ttl_local),
+        compartido=compartido,
+        intervalo_sync=float(os.getenv("CACHE_SYNC_SECONDS", "0.5")),
+    )
+
+
+cache = crear_cache_desde_entorno()
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Claves e invalidación
+# ──────────────────────────────────────────────────────────────────────────────
+def clave_tienda(slug: str) -> str:
+    return f"tienda:{slug}"
+
+
+def clave_tienda_productos(slug: str) -> str:
+    return f"tienda_productos:{slug}"
+
+
+CLAVE_DESTACADOS = "productos:destacados"
+
+
+def clave_tienda_pagina(slug: str, *params: Any) -> str:
+    return f"tienda_pagina:{slug}:" + ":".join(map(str, params))
+
+
+def clave_categorias(limit: int, offset: int, q: Optional[str]) -> str:
+    return f"categorias:{limit}:{offset}:{q or ''}"
+
+
+def clave_validadores_productos(id_vendedor: Optional[int]) -> str:
+    """count + max(updated_at) de GET /productos, global o por vendedor."""
+    return f"productos_validadores:{'' if id_vendedor is None else id_vendedor}"
+
+
+def invalidar_tienda(*slugs: Optional[str]) -> None:
+    """Cambió una tienda (o su vendedor): metadatos y listado de productos."""
+    for slug in slugs:
+        if slug:
+            cache.invalidar(clave_tienda(slug))
+            cache.invalidar(clave_tienda_productos(slug))
+            cache.invalidar_prefijo(f"tienda_pagina:{slug}:")
+
+
+def invalidar_tiendas() -> None:
+    cache.invalidar_prefijo("tienda:")
+    cache.invalidar_prefijo("tienda_productos:")
+    cache.invalidar_prefijo("tienda_pagina:")
+
+
+def invalidar_validadores_productos() -> None:
+    cache.invalidar_prefijo("productos_validadores:")
+
+
+def invalidar_productos() -> None:
+    """Cambió algún producto: destacados, validadores de GET /productos y listados por tienda."""
+    cache.invalidar(CLAVE_DESTACADOS)
+    invalidar_validadores_productos()
+    cache.invalidar_prefijo("tienda_productos:")
+    cache.invalidar_prefijo("tienda_pagina:")
+
+
+def invalidar_categorias() -> None:
+    cache.invalidar_prefijo("categorias:")
+    cache.invalidar_prefijo("tienda_pagina:")  # la página incluye nombres de categorías
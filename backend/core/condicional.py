@@ -0,0 +1,101 @@
+# backend/core/condicional.py
+"""
+Peticiones HTTP condicionales (ETag / Last-Modified / 304).
+
+Los validadores salen de ``updated_at`` (indexado en Producto y Tienda):
+- un recurso: su propio updated_at (+ id)
+- una colección: max(updated_at) + cantidad de filas + parámetros de la página
+Si el cliente manda If-None-Match / If-Modified-Since y coinciden, se
+responde 304 sin ejecutar la consulta de la página ni serializar el cuerpo.
+"""
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Optional, Union
+
+from fastapi import Request, Response
+
+
+@dataclass
+class Validadores:
+    etag: str
+    ultima_modificacion: Optional[datetime] = None
+
+    @property
+    def last_modified(self) -> Optional[str]:
+        if self.ultima_modificacion is None:
+            return None
+        return format_datetime(self.ultima_modificacion, usegmt=True)
+
+    def cabeceras(self) -> dict:
+        h = {"ETag": self.etag, "Cache-Control": "no-cache"}
+        if self.last_modified:
+            h["Last-Modified"] = self.last_modified
+        return h
+
+
+def _utc(ts: Union[datetime, str, None]) -> Optional[datetime]:
+    if ts is None:
+        return None
+    if isinstance(ts, str):
+        ts = datetime.fromisoformat(ts)
+    # Las columnas guardan UTC naive (datetime.utcnow)
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    # HTTP-date tiene resolución de segundos
+    return ts.astimezone(timezone.utc).replace(microsecond=0)
+
+
+def validadores(
+    updated_at: Union[datetime, str, None],
+    total: int = 1,
+    *partes: Any,
+) -> Validadores:
+    """ETag débil a partir de (max) updated_at, cantidad de filas y partes extra."""
+    crudo = updated_at.isoformat() if isinstance(updated_at, datetime) else str(updated_at)
+    base = "|".join([crudo, str(total), *map(str, partes)])
+    digest = hashlib.blake2b(base.encode(), digest_size=10).hexdigest()
+    return Validadores(etag=f'W/"{digest}"', ultima_modificacion=_utc(updated_at))
+
+
+def validadores_lista(filas: list, *partes: Any) -> Validadores:
+    """Validadores de una lista ya materializada de dicts con ``updated_at``."""
+    maximo = max((f.get("updated_at") for f in filas if f.get("updated_at")), default=None)
+    return validadores(maximo, len(filas), *partes)
+
+
+def _coincide_etag(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # Comparación débil: se ignora el prefijo W/
+    propio = etag.removeprefix("W/")
+    return any(t.strip().removeprefix("W/") == propio for t in if_none_match.split(","))
+
+
+def no_modificado(request: Request, v: Validadores) -> bool:
+    inm = request.headers.get("if-none-match")
+    if inm is not None:
+        # If-None-Match manda sobre If-Modified-Since (RFC 9110 §13.2.2)
+        return _coincide_etag(inm, v.etag)
+    ims = request.headers.get("if-modified-since")
+    if ims and v.ultima_modificacion is not None:
+        try:
+            desde = parsedate_to_datetime(ims)
+        except (TypeError, ValueError):
+            return False
+        if desde.tzinfo is None:
+            desde = desde.replace(tzinfo=timezone.utc)
+        return v.ultima_modificacion <= desde
+    return False
+
+
+def responder_condicional(request: Request, response: Response, v: Validadores) -> Optional[Response]:
+    """
+    Devuelve un 304 listo si el cliente ya tiene la versión actual; si no,
+    agrega los validadores a ``response`` y devuelve None para seguir.
+    """
+    if no_modificado(request, v):
+        return Response(status_code=304, headers=v.cabeceras())
+    response.headers.update(v.cabeceras())
+    return None
@@ -0,0 +1,179 @@
+# backend/core/contrasenas.py
+"""
+Hash de contraseñas (scrypt de la stdlib) fuera del threadpool de requests.
+
+Formato guardado en la columna ``password``:
+
+    scrypt$<log2 N>$<r>$<p>$<salt base64>$<hash base64>
+
+- El costo se configura con PASSWORD_SCRYPT_LOG_N / _R / _P. Un hash con
+  parámetros distintos a los actuales sigue validando y se rehace en el
+  siguiente login (igual que las filas viejas en texto plano).
+- El cálculo corre en un pool propio de PASSWORD_HASH_WORKERS hilos (scrypt
+  de OpenSSL suelta el GIL). Así una ráfaga de logins ocupa como mucho esos
+  núcleos y no los hilos que atienden el catálogo. Con más de
+  PASSWORD_HASH_MAX_PENDING logins en espera se responde 503 en vez de encolar
+  sin límite.
+- Las altas y cambios de contraseña pasan por el mismo pool y el mismo cupo
+  (``con_hash``): el CRUD recibe el password ya hasheado.
+"""
+import asyncio
+import base64
+import functools
+import hashlib
+import hmac
+import os
+import secrets
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import update
+from sqlmodel import Session, select
+from starlette.concurrency import run_in_threadpool
+
+ALGORITMO = "scrypt"
+LOG_N = int(os.getenv("PASSWORD_SCRYPT_LOG_N", "14"))
+R = int(os.getenv("PASSWORD_SCRYPT_R", "8"))
+P = int(os.getenv("PASSWORD_SCRYPT_P", "1"))
+LARGO_SALT = 16
+LARGO_HASH = 32
+
+WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 1)))
+MAX_PENDIENTES = int(os.getenv("PASSWORD_HASH_MAX_PENDING", str(WORKERS * 16)))
+
+_pool = ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix="hash-password")
+_cupos = threading.BoundedSemaphore(MAX_PENDIENTES)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Cálculo (CPU)
+# ──────────────────────────────────────────────────────────────────────────────
+def _b64(datos: bytes) -> str:
+    return base64.b64encode(datos).decode().rstrip("=")
+
+
+def _de_b64(texto: str) -> bytes:
+    return base64.b64decode(texto + "=" * (-len(texto) % 4), validate=True)
+
+
+def _derivar(password: str, salt: bytes, log_n: int, r: int, p: int, largo: int) -> bytes:
+    n = 1 << log_n
+    return hashlib.scrypt(
+        password.encode(), salt=salt, n=n, r=r, p=p, dklen=largo,
+        maxmem=128 * r * (n + p + 2) + 1024 * 1024,
+    )
+
+
+def _parsear(almacenado: str) -> Optional[Tuple[int, int, int, bytes, bytes]]:
+    """Partes de un hash scrypt$...; None si el valor no tiene ese formato (texto plano)."""
+    partes = almacenado.split("$")
+    if len(partes) != 6 or partes[0] != ALGORITMO:
+        return None
+    try:
+        log_n, r, p = int(partes[1]), int(partes[2]), int(partes[3])
+        salt, hash_ = _de_b64(partes[4]), _de_b64(partes[5])
+    except ValueError:
+        return None
+    if not (1 <= log_n <= 24 and r > 0 and p > 0 and salt and hash_):
+        return None
+    return log_n, r, p, salt, hash_
+
+
+def es_hash(valor: Optional[str]) -> bool:
+    return bool(valor) and _parsear(valor) is not None
+
+
+def calcular_hash(password: str) -> str:
+    salt = secrets.token_bytes(LARGO_SALT)
+    hash_ = _derivar(password, salt, LOG_N, R, P, LARGO_HASH)
+    return f"{ALGORITMO}${LOG_N}${R}${P}${_b64(salt)}${_b64(hash_)}"
+
+
+def comprobar(password: str, almacenado: Optional[str]) -> Tuple[bool, bool]:
+    """
+    (coincide, hay_que_rehacer). Una fila heredada en texto plano se compara
+    en tiempo constante y siempre pide rehacer.
+    """
+    if not almacenado:
+        return False, False
+    partes = _parsear(almacenado)
+    if partes is None:
+        return hmac.compare_digest(password.encode(), almacenado.encode()), True
+    log_n, r, p, salt, esperado = partes
+    ok = hmac.compare_digest(_derivar(password, salt, log_n, r, p, len(esperado)), esperado)
+    return ok, (log_n, r, p) != (LOG_N, R, P)
+
+
+# Para emails que no existen: se verifica igual contra este hash, así el
+# tiempo de respuesta no revela qué cuentas existen. Se calcula en el primer
+# login fallido y no al importar (un scrypt completo en el arranque).
+@functools.lru_cache(maxsize=1)
+def _hash_senuelo() -> str:
+    return calcular_hash(secrets.token_urlsafe(16))
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Ejecución en el pool
+# ──────────────────────────────────────────────────────────────────────────────
+async def _en_pool(fn: Callable, *args) -> Any:
+    if not _cupos.acquire(blocking=False):
+        raise HTTPException(
+            status_code=503,
+            detail="Demasiados inicios de sesión en curso; reintenta en unos segundos",
+            headers={"Retry-After": "1"},
+        )
+    try:
+        return await asyncio.wrap_future(_pool.submit(fn, *args))
+    finally:
+        _cupos.release()
+
+
+async def hashear_async(password: str) -> str:
+    return await _en_pool(calcular_hash, password)
+
+
+async def verificar_async(password: str, almacenado: Optional[str]) -> Tuple[bool, bool]:
+    return await _en_pool(comprobar, password, almacenado)
+
+
+async def con_hash(datos: Dict[str, Any]) -> Dict[str, Any]:
+    """Copia de ``datos`` con ``password`` (si viene) reemplazado por su hash."""
+    if datos.get("password") is None:
+        return datos
+    return {**datos, "password": await hashear_async(datos["password"])}
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Login
+# ──────────────────────────────────────────────────────────────────────────────
+def _buscar_por_email(session: Session, modelo, email: str):
+    return session.exec(select(modelo).where(modelo.email == email)).first()
+
+
+def _guardar_hash(session: Session, modelo, pk: int, anterior: str, nuevo: str) -> None:
+    # Condicional: si la contraseña cambió entre medio, no se pisa
+    session.exec(
+        update(modelo)
+        .where(modelo.id == pk, modelo.password == anterior)
+        .values(password=nuevo)
+    )
+    session.commit()
+
+
+async def autenticar(session: Session, modelo, email: str, password: str):
+    """
+    Cuenta de ``modelo`` (Vendedor, Comprador, Administrador) con ese email y
+    contraseña, o None. Las consultas van al threadpool y el hash al pool
+    propio; si el hash guardado es texto plano o de otro costo, se reemplaza.
+    """
+    cuenta = await run_in_threadpool(_buscar_por_email, session, modelo, email)
+    almacenado = cuenta.password if cuenta is not None else _hash_senuelo()
+    ok, rehacer = await verificar_async(password, almacenado)
+    if cuenta is None or not ok:
+        return None
+    if rehacer:
+        nuevo = await hashear_async(password)
+        await run_in_threadpool(_guardar_hash, session, modelo, cuenta.id, almacenado, nuevo)
+    return cuenta
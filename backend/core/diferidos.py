@@ -0,0 +1,75 @@
+# backend/core/diferidos.py
+"""
+Routers que se importan en la primera petición que los usa, no al arrancar.
+
+Los de administración (``/administradores``, ``/admin/export``) se usan poco
+y su import (modelos de respuesta, validadores, CRUD) alargaba el arranque en
+frío de cada worker. ``RoutersDiferidos`` es un middleware ASGI que, ante la
+primera petición cuyo path empieza con el prefijo, importa el módulo y hace
+``app.include_router(modulo.router)``; desde ahí la ruta es una más.
+
+    diferidos = RoutersDiferidos.registrar(app, {
+        "/administradores": "backend.Routers.Administradores",
+    })
+
+``app.openapi()`` (/docs) carga todos antes de armar el esquema.
+"""
+import importlib
+import threading
+from typing import Dict
+
+
+class RoutersDiferidos:
+    def __init__(self, destino, modulos: Dict[str, str]):
+        self.destino = destino  # la FastAPI donde se incluyen
+        self.pendientes = {p.rstrip("/"): m for p, m in modulos.items()}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def registrar(cls, app, modulos: Dict[str, str]) -> "RoutersDiferidos":
+        """Agrega el middleware a ``app`` y envuelve ``app.openapi``; devuelve el cargador."""
+        cargador = cls(app, modulos)
+        app.add_middleware(_Adaptador, cargador=cargador)
+
+        openapi_original = app.openapi
+
+        def openapi():
+            if cargador.cargar_todos():
+                app.openapi_schema = None  # el esquema cacheado no tenía estas rutas
+            return openapi_original()
+
+        app.openapi = openapi
+        return cargador
+
+    def cargar(self, prefijo: str) -> bool:
+        with self._lock:
+            modulo = self.pendientes.pop(prefijo, None)
+            if modulo is None:
+                return False
+            try:
+                self.destino.include_router(importlib.import_module(modulo).router)
+            except BaseException:
+                self.pendientes[prefijo] = modulo  # reintentar en la próxima petición
+                raise
+            return True
+
+    def cargar_todos(self) -> bool:
+        return any([self.cargar(p) for p in list(self.pendientes)])
+
+    def cargar_para(self, path: str) -> None:
+        for prefijo in list(self.pendientes):
+            if path == prefijo or path.startswith(prefijo + "/"):
+                self.cargar(prefijo)
+
+
+class _Adaptador:
+    """Middleware ASGI puro que delega en el cargador (add_middleware crea la instancia)."""
+
+    def __init__(self, app, cargador: RoutersDiferidos):
+        self.app = app
+        self.cargador = cargador
+
+    async def __call__(self, scope, receive, send):
+        if self.cargador.pendientes and scope["type"] in ("http", "websocket"):
+            self.cargador.cargar_para(scope["path"])
+        await self.app(scope, receive, send)
@@ -0,0 +1,132 @@
+# backend/core/idempotencia.py
+"""
+Cabecera Idempotency-Key para POST que crean recursos.
+
+La primera petición con una clave reserva una fila en ``idempotencia``
+(status_code NULL), ejecuta el handler y guarda su respuesta. Los reintentos
+con la misma clave y el mismo cuerpo reciben esa respuesta sin volver a
+ejecutar nada: una lectura por clave primaria.
+
+- Misma clave, otro cuerpo            -> 422
+- Misma clave, original aún en curso  -> 409 (el cliente reintenta luego)
+- Si el handler falla, la reserva se borra y el reintento se ejecuta de nuevo.
+- Las filas vencen a IDEMPOTENCY_TTL_SECONDS (default 24 h) y se purgan de
+  forma oportunista, como mucho una vez por IDEMPOTENCY_PURGE_SECONDS.
+- Una reserva en curso con más de IDEMPOTENCY_LOCK_SECONDS se considera
+  abandonada (worker caído) y otra petición puede tomarla.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Optional
+
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import delete, update
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session
+
+from backend.Modelos.Idempotencia import ClaveIdempotencia
+
+TTL = float(os.getenv("IDEMPOTENCY_TTL_SECONDS", str(24 * 3600)))
+BLOQUEO = float(os.getenv("IDEMPOTENCY_LOCK_SECONDS", "60"))
+INTERVALO_PURGA = float(os.getenv("IDEMPOTENCY_PURGE_SECONDS", "60"))
+MAX_LARGO_CLAVE = 255
+
+_purga_lock = threading.Lock()
+_ultima_purga = 0.0
+
+
+def _hash(texto: str) -> str:
+    return hashlib.blake2b(texto.encode(), digest_size=16).hexdigest()
+
+
+def _purgar_vencidas(session: Session, ahora: datetime) -> None:
+    global _ultima_purga
+    with _purga_lock:
+        if time.monotonic() - _ultima_purga < INTERVALO_PURGA:
+            return
+        _ultima_purga = time.monotonic()
+    session.exec(delete(ClaveIdempotencia).where(ClaveIdempotencia.expira_en < ahora))
+    session.commit()
+
+
+def _reservar(session: Session, clave: str, huella: str) -> Optional[ClaveIdempotencia]:
+    """None si la reserva es nuestra; si no, la fila vigente de otra petición."""
+    for _ in range(3):
+        ahora = datetime.utcnow()
+        try:
+            session.add(ClaveIdempotencia(
+                clave=clave, huella=huella, creada_en=ahora, expira_en=ahora + timedelta(seconds=TTL),
+            ))
+            session.commit()
+            return None
+        except IntegrityError:
+            session.rollback()
+
+        fila = session.get(ClaveIdempotencia, clave, populate_existing=True)
+        if fila is None:
+            continue  # la borró otra petición entre medio
+        abandonada = fila.status_code is None and fila.creada_en < ahora - timedelta(seconds=BLOQUEO)
+        if fila.expira_en > ahora and not abandonada:
+            return fila
+        # Vencida o abandonada: solo la borra quien la vio en este estado
+        session.exec(delete(ClaveIdempotencia).where(
+            ClaveIdempotencia.clave == clave, ClaveIdempotencia.creada_en == fila.creada_en,
+        ))
+        session.commit()
+    raise HTTPException(status_code=409, detail="Hay una petición en curso con esa Idempotency-Key")
+
+
+def ejecutar_idempotente(
+    session: Session,
+    idempotency_key: Optional[str],
+    alcance: str,
+    payload: Any,
+    handler: Callable[[], Any],
+    status_code: int = 200,
+) -> Any:
+    """
+    Ejecuta ``handler`` una sola vez por (alcance, Idempotency-Key).
+    Sin cabecera, simplemente devuelve ``handler()``.
+    """
+    if idempotency_key is None:
+        return handler()
+    if not idempotency_key or len(idempotency_key) > MAX_LARGO_CLAVE:
+        raise HTTPException(status_code=400, detail="Idempotency-Key inválida")
+
+    clave = _hash(f"{alcance}\n{idempotency_key}")
+    huella = _hash(json.dumps(jsonable_encoder(payload), sort_keys=True))
+    _purgar_vencidas(session, datetime.utcnow())
+
+    previa = _reservar(session, clave, huella)
+    if previa is not None:
+        if previa.huella != huella:
+            raise HTTPException(status_code=422, detail="Idempotency-Key ya usada con otro cuerpo")
+        if previa.status_code is None:
+            raise HTTPException(status_code=409, detail="Hay una petición en curso con esa Idempotency-Key")
+        return JSONResponse(
+            status_code=previa.status_code,
+            content=json.loads(previa.cuerpo),
+            headers={"Idempotent-Replayed": "true"},
+        )
+
+    try:
+        resultado = jsonable_encoder(handler())
+    except BaseException:
+        session.rollback()
+        session.exec(delete(ClaveIdempotencia).where(ClaveIdempotencia.clave == clave))
+        session.commit()
+        raise
+
+    session.exec(
+        update(ClaveIdempotencia)
+        .where(ClaveIdempotencia.clave == clave)
+        .values(status_code=status_code, cuerpo=json.dumps(resultado))
+    )
+    session.commit()
+    return JSONResponse(status_code=status_code, content=resultado)
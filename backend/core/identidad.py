@@ -0,0 +1,116 @@
+# backend/core/identidad.py
+"""
+Mapa en memoria id_vendedor (ID MANUAL) <-> id (PK) de vendedores.
+
+Casi todas las rutas del vendedor reciben el ID manual y lo traducen a la PK
+antes de la consulta real. La traducción casi nunca cambia, así que se guarda
+aquí en ambos sentidos (LRU acotado) y se invalida al actualizar o dar de baja
+un vendedor. La invalidación viaja por el bus de la caché (core/cache.py):
+con CACHE_BACKEND compartido llega también a los demás workers. Sin L2 (o si
+un mensaje se pierde) las entradas vencen con el mismo TTL que el L1 de la
+caché, así otro worker no sigue traduciendo un id manual reasignado.
+
+No se guardan resultados negativos: un vendedor recién creado se ve al instante.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from backend.core.cache import cache
+
+_PREFIJO = "vendedor_id:"
+
+
+class MapaBidireccional:
+    def __init__(self, max_entries: int = 10_000, ttl: float = 60.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._a_pk: "OrderedDict[int, Tuple[int, float]]" = OrderedDict()  # manual -> (pk, expira)
+        self._a_manual: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _vigente(self, manual: Optional[int]) -> Optional[int]:
+        """PK de ``manual`` si la entrada no venció (la vencida se borra). Con el lock tomado."""
+        item = self._a_pk.get(manual) if manual is not None else None
+        if item is None:
+            self.misses += 1
+            return None
+        pk, expira = item
+        if expira <= time.monotonic():
+            self._quitar(manual)
+            self.misses += 1
+            return None
+        self._a_pk.move_to_end(manual)
+        self.hits += 1
+        return pk
+
+    def pk(self, manual: int) -> Optional[int]:
+        with self._lock:
+            return self._vigente(manual)
+
+    def manual(self, pk: int) -> Optional[int]:
+        with self._lock:
+            manual = self._a_manual.get(pk)
+            return manual if self._vigente(manual) is not None else None
+
+    def guardar(self, manual: int, pk: int) -> None:
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._quitar(manual)
+            viejo = self._a_manual.pop(pk, None)
+            if viejo is not None:
+                self._a_pk.pop(viejo, None)
+            self._a_pk[manual] = (pk, time.monotonic() + self.ttl)
+            self._a_manual[pk] = manual
+            while len(self._a_pk) > self.max_entries:
+                _, (pk_viejo, _) = self._a_pk.popitem(last=False)
+                self._a_manual.pop(pk_viejo, None)
+
+    def _quitar(self, manual: int) -> None:
+        item = self._a_pk.pop(manual, None)
+        if item is not None:
+            self._a_manual.pop(item[0], None)
+
+    def olvidar(self, manual: int) -> None:
+        with self._lock:
+            self._quitar(manual)
+
+    def limpiar(self) -> None:
+        with self._lock:
+            self._a_pk.clear()
+            self._a_manual.clear()
+
+    def estadisticas(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"entradas": len(self._a_pk), "hits": self.hits, "misses": self.misses}
+
+
+mapa_vendedores = MapaBidireccional(
+    int(os.getenv("VENDOR_MAP_MAX_ENTRIES", "10000")),
+    ttl=cache.local.ttl,  # mismo TTL que el L1 de la caché
+)
+
+
+def _al_invalidar(patron: str) -> None:
+    if patron == "*" or patron == _PREFIJO + "*":
+        mapa_vendedores.limpiar()
+    elif patron.startswith(_PREFIJO):
+        try:
+            mapa_vendedores.olvidar(int(patron[len(_PREFIJO):]))
+        except ValueError:
+            pass
+
+
+cache.suscribir(_al_invalidar)
+
+
+def invalidar_vendedor(*ids_manuales: Optional[int]) -> None:
+    """Cambió (o se dio de baja) un vendedor: olvidar su traducción en todos los workers."""
+    for manual in ids_manuales:
+        if manual is not None:
+            cache.invalidar(f"{_PREFIJO}{manual}")
@@ -0,0 +1,295 @@
+# backend/core/limites.py
+"""
+Límite de tasa con token bucket, como middleware ASGI.
+
+Cada ``Regla`` cubre un método + ruta y tiene dos buckets:
+- por IP del cliente,
+- por cuenta: el valor de un campo del cuerpo JSON (el email en los logins),
+  así un ataque repartido entre muchas IPs contra una cuenta también se frena.
+
+Una petición que excede cualquiera de los dos recibe 429 con Retry-After,
+antes de llegar al handler: no se abre sesión de BD ni se calcula un hash.
+
+Los buckets viven en (RATE_LIMIT_BACKEND):
+    memoria  -> dict LRU en el proceso (por defecto; el límite es por worker)
+    archivo  -> un archivo SQLite compartido por los workers de la máquina (RATE_LIMIT_URL = ruta)
+    redis    -> servidor Redis compartido por todas las instancias (RATE_LIMIT_URL = redis://...)
+"""
+import json
+import math
+import os
+import random
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+
+@dataclass(frozen=True)
+class Tasa:
+    """``capacidad`` peticiones seguidas, recargando ``capacidad`` cada ``periodo`` segundos."""
+    capacidad: int
+    periodo: float
+
+    @property
+    def por_segundo(self) -> float:
+        return self.capacidad / self.periodo
+
+    @classmethod
+    def parsear(cls, texto: str) -> "Tasa":
+        """ "10/60" -> 10 por minuto."""
+        capacidad, _, periodo = texto.partition("/")
+        return cls(int(capacidad), float(periodo or 1))
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Backends: consumir(clave, tasa) -> (permitido, segundos hasta tener un token)
+# ──────────────────────────────────────────────────────────────────────────────
+def _recargar(tokens: float, ts: float, ahora: float, tasa: Tasa) -> float:
+    return min(float(tasa.capacidad), tokens + (ahora - ts) * tasa.por_segundo)
+
+
+def _resultado(tokens: float, tasa: Tasa) -> Tuple[bool, float, float]:
+    """(permitido, tokens restantes, espera)"""
+    if tokens >= 1:
+        return True, tokens - 1, 0.0
+    return False, tokens, (1 - tokens) / tasa.por_segundo
+
+
+class BucketsMemoria:
+    nombre = "memoria"
+
+    def __init__(self, max_claves: int = 100_000):
+        self.max_claves = max_claves
+        self._data: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def consumir(self, clave: str, tasa: Tasa) -> Tuple[bool, float]:
+        ahora = time.monotonic()
+        with self._lock:
+            tokens, ts = self._data.pop(clave, (float(tasa.capacidad), ahora))
+            permitido, tokens, espera = _resultado(_recargar(tokens, ts, ahora, tasa), tasa)
+            self._data[clave] = (tokens, ahora)
+            # Las claves más viejas ya están llenas de nuevo: olvidarlas no cambia nada
+            while len(self._data) > self.max_claves:
+                self._data.popitem(last=False)
+        return permitido, espera
+
+
+class BucketsArchivo:
+    nombre = "archivo"
+
+    def __init__(self, ruta: str):
+        self.ruta = ruta
+        self._local = threading.local()
+        self._conn().execute(
+            "CREATE TABLE IF NOT EXISTS limite_buckets ("
+            " clave TEXT PRIMARY KEY, tokens REAL NOT NULL, ts REAL NOT NULL)"
+        )
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.ruta, timeout=5.0, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def consumir(self, clave: str, tasa: Tasa) -> Tuple[bool, float]:
+        conn = self._conn()
+        ahora = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            fila = conn.execute("SELECT tokens, ts FROM limite_buckets WHERE clave = ?", (clave,)).fetchone()
+            tokens, ts = fila if fila else (float(tasa.capacidad), ahora)
+            permitido, tokens, espera = _resultado(_recargar(tokens, ts, ahora, tasa), tasa)
+            conn.execute(
+                "INSERT OR REPLACE INTO limite_buckets (clave, tokens, ts) VALUES (?, ?, ?)",
+                (clave, tokens, ahora),
+            )
+            # Limpieza oportunista de buckets que ya se recargaron del todo
+            if random.random() < 0.01:
+                conn.execute("DELETE FROM limite_buckets WHERE ts < ?", (ahora - 3600,))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return permitido, espera
+
+
+# KEYS[1] = bucket; ARGV = capacidad, por_segundo, ahora (s), ttl (ms)
+_LUA = """
+local b = redis.call('HMGET', KEYS[1], 't', 'ts')
+local cap = tonumber(ARGV[1])
+local tokens = tonumber(b[1]) or cap
+local ts = tonumber(b[2]) or tonumber(ARGV[3])
+tokens = math.min(cap, tokens + (tonumber(ARGV[3]) - ts) * tonumber(ARGV[2]))
+local ok = 0
+if tokens >= 1 then tokens = tokens - 1; ok = 1 end
+redis.call('HSET', KEYS[1], 't', tostring(tokens), 'ts', ARGV[3])
+redis.call('PEXPIRE', KEYS[1], ARGV[4])
+return {ok, tostring(tokens)}
+"""
+
+
+class BucketsRedis:
+    nombre = "redis"
+
+    def __init__(self, url: str, namespace: str = "ecommerce:limite:"):
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("RATE_LIMIT_BACKEND=redis requiere el paquete 'redis' (pip install redis)") from e
+        self._r = redis.Redis.from_url(url)
+        self._script = self._r.register_script(_LUA)
+        self.ns = namespace
+
+    def consumir(self, clave: str, tasa: Tasa) -> Tuple[bool, float]:
+        ttl_ms = int(tasa.periodo * 1000) + 1000
+        ok, tokens = self._script(
+            keys=[self.ns + clave], args=[tasa.capacidad, tasa.por_segundo, time.time(), ttl_ms],
+        )
+        tokens = float(tokens)
+        return bool(ok), 0.0 if ok else (1 - tokens) / tasa.por_segundo
+
+
+def crear_buckets_desde_entorno():
+    backend = os.getenv("RATE_LIMIT_BACKEND", "memoria").lower()
+    url = os.getenv("RATE_LIMIT_URL")
+    if backend == "memoria":
+        return BucketsMemoria(int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000")))
+    if backend == "archivo":
+        return BucketsArchivo(url or "./limites.db")
+    if backend == "redis":
+        return BucketsRedis(url or "redis://localhost:6379/0")
+    raise ValueError(f"RATE_LIMIT_BACKEND inválido: {backend}")
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Middleware
+# ──────────────────────────────────────────────────────────────────────────────
+@dataclass(frozen=True)
+class Regla:
+    ruta: str
+    metodo: str = "POST"
+    por_ip: Optional[Tasa] = None
+    por_cuenta: Optional[Tasa] = None
+    campo_cuenta: str = "email"
+
+
+def reglas_login(rutas: Iterable[str]) -> List[Regla]:
+    """Reglas para endpoints de login (LOGIN_RATE_PER_IP / LOGIN_RATE_PER_ACCOUNT, formato "N/segundos")."""
+    por_ip = Tasa.parsear(os.getenv("LOGIN_RATE_PER_IP", "20/60"))
+    por_cuenta = Tasa.parsear(os.getenv("LOGIN_RATE_PER_ACCOUNT", "5/60"))
+    return [Regla(ruta, por_ip=por_ip, por_cuenta=por_cuenta) for ruta in rutas]
+
+
+MAX_CUERPO = 16 * 1024
+
+
+class LimiteTasa:
+    """
+    Middleware ASGI puro (no BaseHTTPMiddleware): para leer el campo de cuenta
+    junta el cuerpo y se lo vuelve a entregar intacto a la app.
+    """
+
+    def __init__(self, app, reglas: Iterable[Regla], buckets=None, confiar_proxy: Optional[bool] = None):
+        self.app = app
+        self.reglas = {(r.metodo.upper(), r.ruta.rstrip("/")): r for r in reglas}
+        self.buckets = buckets if buckets is not None else crear_buckets_desde_entorno()
+        if confiar_proxy is None:
+            confiar_proxy = os.getenv("RATE_LIMIT_TRUST_PROXY") == "1"
+        self.confiar_proxy = confiar_proxy
+        self.rechazadas = 0
+
+    async def _consumir(self, clave: str, tasa: Tasa) -> Tuple[bool, float]:
+        if isinstance(self.buckets, BucketsMemoria):
+            return self.buckets.consumir(clave, tasa)
+        # archivo / redis hacen E/S: fuera del event loop
+        return await run_in_threadpool(self.buckets.consumir, clave, tasa)
+
+    def _ip(self, scope) -> str:
+        if self.confiar_proxy:
+            for nombre, valor in scope.get("headers", ()):
+                if nombre == b"x-forwarded-for":
+                    return valor.decode("latin-1").split(",")[0].strip()
+        cliente = scope.get("client")
+        return cliente[0] if cliente else "desconocida"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        regla = self.reglas.get((scope["method"], scope["path"].rstrip("/")))
+        if regla is None:
+            return await self.app(scope, receive, send)
+
+        if regla.por_ip is not None:
+            ok, espera = await self._consumir(f"ip:{regla.ruta}:{self._ip(scope)}", regla.por_ip)
+            if not ok:
+                return await self._rechazar(send, espera)
+
+        if regla.por_cuenta is not None:
+            mensajes, cuerpo = await self._leer_cuerpo(receive)
+            cuenta = self._cuenta(cuerpo, regla.campo_cuenta)
+            if cuenta is not None:
+                ok, espera = await self._consumir(f"cuenta:{regla.ruta}:{cuenta}", regla.por_cuenta)
+                if not ok:
+                    return await self._rechazar(send, espera)
+            receive = self._repetir(mensajes, receive)
+
+        await self.app(scope, receive, send)
+
+    @staticmethod
+    async def _leer_cuerpo(receive) -> Tuple[list, Optional[bytes]]:
+        mensajes, partes, largo = [], [], 0
+        while True:
+            mensaje = await receive()
+            mensajes.append(mensaje)
+            if mensaje["type"] != "http.request":
+                return mensajes, None
+            partes.append(mensaje.get("body", b""))
+            largo += len(partes[-1])
+            if largo > MAX_CUERPO:
+                return mensajes, None  # la app leerá el resto
+            if not mensaje.get("more_body", False):
+                return mensajes, b"".join(partes)
+
+    @staticmethod
+    def _cuenta(cuerpo: Optional[bytes], campo: str) -> Optional[str]:
+        if not cuerpo:
+            return None
+        try:
+            valor = json.loads(cuerpo).get(campo)
+        except (ValueError, AttributeError):
+            return None
+        return valor.strip().lower() if isinstance(valor, str) and valor.strip() else None
+
+    @staticmethod
+    def _repetir(mensajes: list, receive):
+        pendientes = list(mensajes)
+
+        async def recibir():
+            if pendientes:
+                return pendientes.pop(0)
+            return await receive()
+
+        return recibir
+
+    async def _rechazar(self, send, espera: float) -> None:
+        self.rechazadas += 1
+        cuerpo = json.dumps({"detail": "Demasiados intentos; reintenta más tarde"}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(cuerpo)).encode()),
+                (b"retry-after", str(max(1, math.ceil(espera))).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": cuerpo})
@@ -0,0 +1,97 @@
+# backend/core/paginacion.py
+"""
+Paginación compartida por los endpoints de listado.
+
+Modo por defecto: OFFSET/LIMIT (compatible con el frontend actual).
+Modo cursor (opt-in): se activa enviando ``?cursor=`` (vacío para la primera
+página). Las filas se ordenan por una clave única, p. ej. ``(created_at, id)``,
+y la página siguiente se pide con el token opaco que devuelve la cabecera
+``X-Next-Cursor``. El costo de cada página es constante: un index seek sobre
+la clave en vez de recorrer y descartar ``offset`` filas.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional
+
+from fastapi import HTTPException, Query, Response
+from sqlalchemy import tuple_
+from sqlmodel import Session
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def _encode(valores: List[Any]) -> str:
+    plano = [v.isoformat() if isinstance(v, datetime) else v for v in valores]
+    raw = json.dumps(plano, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode(token: str, claves) -> List[Any]:
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        plano = json.loads(raw)
+        if not isinstance(plano, list) or len(plano) != len(claves):
+            raise ValueError("longitud")
+        valores = []
+        for col, v in zip(claves, plano):
+            if col.type.python_type is datetime:
+                v = datetime.fromisoformat(v)
+            valores.append(v)
+        return valores
+    except (ValueError, TypeError, NotImplementedError):
+        raise HTTPException(status_code=400, detail="Cursor inválido")
+
+
+class Paginacion:
+    def __init__(self, limit: int, offset: int, cursor: Optional[str]):
+        self.limit = limit
+        self.offset = offset
+        self.cursor = cursor
+
+    @property
+    def usa_cursor(self) -> bool:
+        return self.cursor is not None
+
+    def _preparar(self, stmt, claves):
+        if not self.usa_cursor:
+            return stmt.offset(self.offset).limit(self.limit)
+
+        stmt = stmt.order_by(*[c.asc() for c in claves])
+        if self.cursor:
+            valores = _decode(self.cursor, claves)
+            stmt = stmt.where(tuple_(*claves) > tuple_(*valores))
+        # Pedimos una fila extra para saber si hay página siguiente
+        return stmt.limit(self.limit + 1)
+
+    def _recortar(self, rows: list, response: Response, claves) -> list:
+        if self.usa_cursor and len(rows) > self.limit:
+            rows = rows[: self.limit]
+            ultimo = rows[-1]
+            response.headers[NEXT_CURSOR_HEADER] = _encode(
+                [getattr(ultimo, c.key) for c in claves]
+            )
+        return rows
+
+    def ejecutar(self, session: Session, stmt, response: Response, *claves) -> list:
+        """
+        Aplica la paginación a ``stmt`` y lo ejecuta.
+        ``claves``: columnas que forman un orden total (la última debe ser única).
+        """
+        rows = session.exec(self._preparar(stmt, claves)).all()
+        return self._recortar(list(rows), response, claves)
+
+    async def ejecutar_async(self, session, stmt, response: Response, *claves) -> list:
+        """Igual que ``ejecutar`` pero con una AsyncSession."""
+        rows = (await session.exec(self._preparar(stmt, claves))).all()
+        return self._recortar(list(rows), response, claves)
+
+def paginacion(
+    limit: int = Query(50, ge=1, le=200),
+    offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(
+        None,
+        description="Modo cursor: vacío para la primera página, luego el valor de X-Next-Cursor",
+    ),
+) -> Paginacion:
+    return Paginacion(limit=limit, offset=offset, cursor=cursor)
@@ -0,0 +1,68 @@
+# backend/core/serializacion.py
+"""
+Camino rápido de serialización para listados grandes.
+
+Con ``response_model`` + ``XRead.model_validate(fila)`` cada fila se valida dos
+veces (al construir el DTO y otra vez al serializar la respuesta). Aquí:
+- se seleccionan solo las columnas del DTO (``columnas_de``),
+- las filas se pasan a dicts sin Pydantic (``filas_a_dicts``),
+- y se serializan con orjson (``RespuestaJSONRapida``).
+
+El ``response_model`` se deja en el decorador solo para OpenAPI: al devolver
+una Response, FastAPI no vuelve a validar. orjson es opcional; sin él se usa
+json de la stdlib (más lento, misma salida).
+"""
+import json
+from typing import Any, Iterable, List, Optional, Sequence
+
+from fastapi import Response
+from fastapi.encoders import jsonable_encoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - dependencia opcional
+    orjson = None
+
+
+def a_json(contenido: Any) -> bytes:
+    """JSON compacto en bytes (orjson si está instalado)."""
+    if orjson is not None:
+        return orjson.dumps(contenido, default=str, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(jsonable_encoder(contenido), separators=(",", ":"), ensure_ascii=False).encode()
+
+
+class RespuestaJSONRapida(Response):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return a_json(content)
+
+
+def columnas_de(modelo, esquema, *extra) -> list:
+    """
+    Columnas de ``modelo`` que pide el DTO ``esquema`` (en su orden), más las
+    ``extra`` que falten (p. ej. claves del cursor que el DTO no expone).
+    """
+    cols = [getattr(modelo, campo) for campo in esquema.model_fields]
+    nombres = set(esquema.model_fields)
+    return cols + [c for c in extra if c.key not in nombres]
+
+
+def filas_a_dicts(filas: Iterable, campos: Sequence[str]) -> List[dict]:
+    """Filas de un select de columnas -> dicts con solo ``campos``."""
+    campos = list(campos)
+    return [dict(zip(campos, fila)) for fila in filas]
+
+
+def respuesta_rapida(contenido: Any, response: Optional[Response] = None, status_code: int = 200) -> Response:
+    """
+    Response final con ``contenido``. ``response`` es la que inyecta FastAPI
+    al handler: sus cabeceras (ETag, X-Next-Cursor, ...) se copian, porque al
+    devolver una Response propia FastAPI ya no las mezcla.
+    """
+    resp = RespuestaJSONRapida(contenido, status_code=status_code)
+    if response is not None:
+        resp.headers.raw.extend(
+            (k, v) for k, v in response.headers.raw if k.lower() != b"content-length"
+        )
+    return resp
@@ -0,0 +1,199 @@
+# backend/core/tokens.py
+"""
+Tokens de sesión firmados (HMAC-SHA256), sin estado en la BD.
+
+El login devuelve un token con rol, PK, id manual y estado_cuenta:
+
+    base64url(json) "." base64url(hmac)
+
+``sesion_actual`` lo valida sin consultar la BD (firma + vencimiento +
+conjunto de revocaciones en memoria). Las cuentas bloqueadas o borradas se
+revocan con ``revocar``: se anota (rol, pk) -> instante, y se rechazan los
+tokens emitidos antes. Cada entrada se descarta pasado
+SESSION_TOKEN_TTL_SECONDS, cuando ya no queda token vigente que rechazar.
+
+La revocación viaja por el bus de invalidaciones del caché (core/cache.py),
+que solo cruza procesos con un L2 (CACHE_BACKEND=archivo o redis). Un worker
+que arranca reproduce las revocaciones de la última ventana de TTL. Con
+CACHE_BACKEND=memoria y varios workers (WEB_CONCURRENCY > 1) un token
+revocado seguiría valiendo en los demás: la importación falla.
+
+SESSION_TOKEN_SECRET debe ser el mismo en todos los workers. Si falta, se
+genera uno al azar por proceso (sirve para desarrollo y tests, no con varios
+workers: los tokens de uno no validan en otro).
+"""
+import base64
+import hashlib
+import hmac
+import json
+import logging
+import os
+import secrets
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+
+from fastapi import Depends, Header, HTTPException
+
+from backend.core.cache import cache
+
+log = logging.getLogger(__name__)
+
+TTL = int(os.getenv("SESSION_TOKEN_TTL_SECONDS", "900"))
+_SECRETO = os.getenv("SESSION_TOKEN_SECRET", "").encode()
+if not _SECRETO:
+    log.warning("SESSION_TOKEN_SECRET no configurado: se usa uno aleatorio por proceso")
+    _SECRETO = secrets.token_bytes(32)
+
+ROL_VENDEDOR = "vendedor"
+ROL_COMPRADOR = "comprador"
+ROL_ADMIN = "admin"
+
+_PREFIJO = "sesion_revocada:"
+
+
+@dataclass(frozen=True)
+class Sesion:
+    rol: str
+    pk: int
+    id_manual: Optional[int]
+    estado_cuenta: str
+    emitido_ms: int
+    expira_ms: int
+
+
+def _b64(datos: bytes) -> str:
+    return base64.urlsafe_b64encode(datos).decode().rstrip("=")
+
+
+def _de_b64(texto: str) -> bytes:
+    return base64.urlsafe_b64decode(texto + "=" * (-len(texto) % 4))
+
+
+def _firma(cuerpo: str) -> str:
+    return _b64(hmac.new(_SECRETO, cuerpo.encode(), hashlib.sha256).digest())
+
+
+def _ahora_ms() -> int:
+    return int(time.time() * 1000)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Revocaciones
+# ──────────────────────────────────────────────────────────────────────────────
+class Revocaciones:
+    """(rol, pk) -> instante (ms) de la revocación más reciente."""
+
+    def __init__(self, ttl_ms: int):
+        self.ttl_ms = ttl_ms
+        self._data: Dict[Tuple[str, int], int] = {}
+        self._lock = threading.Lock()
+
+    def anotar(self, rol: str, pk: int, instante_ms: int) -> None:
+        with self._lock:
+            if instante_ms > self._data.get((rol, pk), 0):
+                self._data[(rol, pk)] = instante_ms
+            limite = _ahora_ms() - self.ttl_ms
+            for k in [k for k, t in self._data.items() if t < limite]:
+                del self._data[k]
+
+    def revocado(self, rol: str, pk: int, emitido_ms: int) -> bool:
+        instante = self._data.get((rol, pk))
+        return instante is not None and emitido_ms <= instante
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+revocaciones = Revocaciones(TTL * 1000)
+
+
+def _al_invalidar(patron: str) -> None:
+    if not patron.startswith(_PREFIJO):
+        return  # "*" (limpiar caché) no borra revocaciones
+    try:
+        rol, pk, instante = patron[len(_PREFIJO):].split(":")
+        revocaciones.anotar(rol, int(pk), int(instante))
+    except ValueError:
+        pass
+
+
+if cache.compartido is None and int(os.getenv("WEB_CONCURRENCY", "1")) > 1:
+    raise RuntimeError(
+        "Con varios workers (WEB_CONCURRENCY > 1) las revocaciones de sesión necesitan un caché "
+        "compartido: CACHE_BACKEND=archivo o redis"
+    )
+cache.suscribir(_al_invalidar, reproducir=TTL)
+
+
+def revocar(rol: str, pk: Optional[int]) -> None:
+    """Invalida los tokens ya emitidos para esa cuenta, en todos los workers."""
+    if pk is not None:
+        cache.invalidar(f"{_PREFIJO}{rol}:{pk}:{_ahora_ms()}")
+
+
+def invalida_sesiones(cambios: dict) -> bool:
+    """¿Un update con estos campos debe cerrar las sesiones abiertas? (bloqueo o cambio de contraseña)"""
+    estado = cambios.get("estado_cuenta")
+    return cambios.get("password") is not None or (estado is not None and estado != "activo")
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Emisión y verificación
+# ──────────────────────────────────────────────────────────────────────────────
+def emitir_token(rol: str, pk: int, id_manual: Optional[int], estado_cuenta: str) -> Tuple[str, Sesion]:
+    emitido = _ahora_ms()
+    sesion = Sesion(rol, pk, id_manual, str(getattr(estado_cuenta, "value", estado_cuenta)), emitido, emitido + TTL * 1000)
+    datos = {"r": sesion.rol, "p": sesion.pk, "m": sesion.id_manual, "e": sesion.estado_cuenta,
+             "i": sesion.emitido_ms, "x": sesion.expira_ms}
+    cuerpo = _b64(json.dumps(datos, separators=(",", ":")).encode())
+    return f"{cuerpo}.{_firma(cuerpo)}", sesion
+
+
+def verificar_token(token: str) -> Sesion:
+    """Sesion del token; ValueError si la firma no cuadra, venció o fue revocado."""
+    cuerpo, _, firma = token.partition(".")
+    if not firma or not hmac.compare_digest(firma, _firma(cuerpo)):
+        raise ValueError("Token inválido")
+    try:
+        d = json.loads(_de_b64(cuerpo))
+        sesion = Sesion(d["r"], d["p"], d["m"], d["e"], d["i"], d["x"])
+    except (ValueError, KeyError, TypeError):
+        raise ValueError("Token inválido")
+    if sesion.expira_ms <= _ahora_ms():
+        raise ValueError("Token vencido")
+    cache.sincronizar()  # revocaciones de otros workers (cada CACHE_SYNC_SECONDS como mucho)
+    if revocaciones.revocado(sesion.rol, sesion.pk, sesion.emitido_ms):
+        raise ValueError("Sesión revocada")
+    return sesion
+
+
+def sesion_actual(authorization: Optional[str] = Header(None)) -> Sesion:
+    """Dependencia: ``Authorization: Bearer <token>`` -> Sesion, sin tocar la BD."""
+    esquema, _, token = (authorization or "").partition(" ")
+    if esquema.lower() != "bearer" or not token:
+        raise HTTPException(status_code=401, detail="Falta el token", headers={"WWW-Authenticate": "Bearer"})
+    try:
+        sesion = verificar_token(token.strip())
+    except ValueError as e:
+        raise HTTPException(status_code=401, detail=str(e), headers={"WWW-Authenticate": "Bearer"})
+    if sesion.estado_cuenta != "activo":
+        raise HTTPException(status_code=403, detail="Cuenta no activa")
+    return sesion
+
+
+def requiere_rol(*roles: str) -> Callable[..., Sesion]:
+    """Dependencia que además exige uno de ``roles``: ``Depends(requiere_rol(ROL_ADMIN))``."""
+    def dependencia(sesion: Sesion = Depends(sesion_actual)) -> Sesion:
+        if sesion.rol not in roles:
+            raise HTTPException(status_code=403, detail="Sin permisos para este recurso")
+        return sesion
+
+    return dependencia
+
+
+def datos_sesion(token: str, sesion: Sesion) -> dict:
+    """Campos que los logins agregan a su respuesta."""
+    return {"token": token, "token_type": "bearer", "expira_en": sesion.expira_ms // 1000}
+
@@ -1,10 +1,12 @@
 # backend/db/engine.py
 import os
+import threading
 from sqlmodel import create_engine, Session
 from dotenv import load_dotenv
 from sqlalchemy.engine.url import make_url
+from backend.db.pool import opciones_engine, instalar_eventos, preparar_url
 
-# Cargar variables de entorno
+# Cargar variables de entorno (al importar: otros módulos leen os.environ al importarse)
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
@@ -27,21 +29,96 @@ if not (
 ):
     raise ValueError(f"Formato inválido de DATABASE_URL: {DATABASE_URL}")
 
-# Log seguro (oculta password)
-try:
-    safe_url = make_url(DATABASE_URL).set(password="***")
-except Exception:
-    safe_url = DATABASE_URL
-print(f">>> DB_URL_USADA: {safe_url}")
+# Engine sync: se crea en el primer uso (primera sesión o consulta), no al
+# importar. create_engine importa el driver (psycopg2) y arma el pool; en un
+# arranque en frío eso retrasaba el import de backend.main sin necesidad.
+# ``from backend.db.engine import engine`` sigue funcionando (crea el engine).
+_engine = None
+_engine_lock = threading.Lock()  # las rutas sync corren en el threadpool: un solo engine/pool
+
+
+def get_engine():
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                # Log seguro (oculta password)
+                try:
+                    safe_url = make_url(DATABASE_URL).set(password="***")
+                except Exception:
+                    safe_url = DATABASE_URL
+                print(f">>> DB_URL_USADA: {safe_url}")
+
+                # Pool y pre-ping configurables por entorno (ver backend/db/pool.py)
+                nuevo = create_engine(
+                    preparar_url(DATABASE_URL),
+                    echo=False,
+                    **opciones_engine(DATABASE_URL),
+                )
+                instalar_eventos(nuevo, DATABASE_URL)
+                _engine = nuevo
+    return _engine
+
+
+def engine_creado():
+    """El engine sync si ya se creó (para estadísticas), sin crearlo."""
+    return _engine
+
+
+def __getattr__(nombre):
+    if nombre == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {nombre!r}")
 
-# Crear engine (pre_ping para evitar conexiones muertas)
-engine = create_engine(
-    DATABASE_URL,
-    echo=False,
-    pool_pre_ping=True,
-)
 
 # Generador de sesión (expire_on_commit=False para no expirar objetos tras commit)
 def get_session():
-    with Session(engine, expire_on_commit=False) as session:
+    with Session(get_engine(), expire_on_commit=False) as session:
+        yield session
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Modo async (DB_ASYNC=1): asyncpg / aiosqlite vía sqlalchemy.ext.asyncio.
+# Los routers de backend/Routers/aio solo se montan en este modo, así ambos
+# modos se pueden levantar y medir lado a lado con la misma DATABASE_URL.
+# ──────────────────────────────────────────────────────────────────────────────
+DB_ASYNC = os.getenv("DB_ASYNC") == "1"
+
+
+def async_database_url(url: str) -> str:
+    if url.startswith("postgresql+psycopg2://"):
+        return "postgresql+asyncpg://" + url[len("postgresql+psycopg2://"):]
+    if url.startswith("sqlite:///"):
+        return "sqlite+aiosqlite:///" + url[len("sqlite:///"):]
+    raise ValueError(f"DATABASE_URL sin driver async conocido: {url}")
+
+
+_async_engine = None
+
+
+def get_async_engine():
+    """Se crea en el primer uso: el driver async es opcional en modo sync."""
+    global _async_engine
+    if _async_engine is None:
+        from sqlalchemy.ext.asyncio import create_async_engine
+
+        url = async_database_url(DATABASE_URL)
+        _async_engine = create_async_engine(
+            preparar_url(url),
+            echo=False,
+            **opciones_engine(url, async_=True),
+        )
+        instalar_eventos(_async_engine, url)
+    return _async_engine
+
+
+def async_engine_creado():
+    """El engine async si ya se creó (para estadísticas), sin crearlo."""
+    return _async_engine
+
+
+async def get_async_session():
+    from sqlmodel.ext.asyncio.session import AsyncSession
+
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
         yield session
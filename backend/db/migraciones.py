@@ -0,0 +1,359 @@
+# backend/db/migraciones.py
+"""
+Migraciones versionadas del esquema.
+
+Cada ``Migracion`` tiene un número de versión y se registra en la tabla
+``esquema_migraciones`` junto con la HUELLA del esquema (hash de tablas,
+columnas, índices y restricciones de SQLModel.metadata + lista de
+migraciones). Al arrancar, ``preparar_esquema`` hace UNA consulta: si la
+última versión y la huella coinciden con el código, no se ejecuta DDL
+(ni create_all, que refleja todas las tablas).
+
+- Las migraciones transaccionales corren en una transacción cada una.
+- Las no transaccionales corren en AUTOCOMMIT: en Postgres crean índices con
+  CREATE INDEX CONCURRENTLY (sin bloquear escrituras en ``productos``); si un
+  build anterior quedó a medias (índice INVALID) se borra y se rehace. Si
+  algún build falla, la migración no se registra (MigracionIncompleta) y el
+  próximo arranque la vuelve a correr; el arranque sigue con un aviso.
+- Si el modelo cambió sin una migración nueva (huella distinta), solo se
+  crean las tablas que falten y se avisa: la huella no se actualiza hasta
+  que exista la migración que agregue columnas/índices a tablas existentes.
+- ``pedidos_normalizados`` lleva una tabla ``pedidos`` anterior (con
+  ``items_json`` y sin comprador_id/updated_at) al modelo actual.
+- En Postgres, un advisory lock evita que dos workers migren a la vez.
+  Con el pooler en modo transacción (puerto 6543 de Supabase) el lock de
+  sesión no es fiable: conviene migrar fuera de banda con la conexión directa
+  (``python -m backend.cli.migrar aplicar --url ...``).
+
+Para cambiar el esquema: agregar una Migracion al final de MIGRACIONES con el
+siguiente número de versión (nunca editar una ya aplicada).
+"""
+import hashlib
+import json
+import logging
+import os
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, List, Optional
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection, Engine
+from sqlmodel import SQLModel
+
+# Importa todos los modelos para que SQLModel.metadata tenga las tablas
+from backend.Modelos import (  # noqa: F401
+    Administrador, Comprador, Usuario, Vendedor, Producto, Categoria, Tienda, Pedido, ClaveIdempotencia,
+)
+
+log = logging.getLogger(__name__)
+
+TABLA = "esquema_migraciones"
+_LOCK_ID = 727_001  # pg_advisory_lock
+
+
+@dataclass(frozen=True)
+class Migracion:
+    version: int
+    nombre: str
+    aplicar: Callable[[Connection], None]
+    # False: AUTOCOMMIT (CREATE INDEX CONCURRENTLY); ``aplicar`` devuelve los
+    # índices que no pudo crear y entonces la migración no se registra
+    transaccional: bool = True
+
+
+class MigracionIncompleta(RuntimeError):
+    """Una migración no transaccional dejó índices sin crear; no se registra."""
+
+    def __init__(self, migracion: "Migracion", fallidos: List[str]):
+        self.migracion = migracion
+        self.fallidos = fallidos
+        self.aplicadas: List[str] = []  # las anteriores que sí se registraron
+        super().__init__(f"Migración {migracion.version} {migracion.nombre}: sin crear {', '.join(fallidos)}")
+
+
+def _es_postgres(conn: Connection) -> bool:
+    return conn.dialect.name == "postgresql"
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Migraciones
+# ──────────────────────────────────────────────────────────────────────────────
+def _esquema_base(conn: Connection) -> None:
+    # Tablas que falten (create_all no altera las existentes)
+    SQLModel.metadata.create_all(conn)
+
+
+def _restricciones_unicas(conn: Connection) -> None:
+    """Restricciones que el modelo declara y que bases creadas antes no tienen."""
+    if not _es_postgres(conn):
+        return
+    for tabla, nombre, columnas in (
+        ("vendedores", "uq_vendedores_email", "email"),
+        ("compradores", "uq_compradores_email", "email"),
+        ("categorias", "uq_categorias_nombre", "nombre"),
+        # Clave natural de importación (ON CONFLICT de /productos/bulk)
+        ("productos", "uq_productos_vendedor_source_external", "vendedor_id, source, external_id"),
+    ):
+        conn.exec_driver_sql(f"""
+        DO $$
+        BEGIN
+          IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = '{nombre}') THEN
+            ALTER TABLE public.{tabla} ADD CONSTRAINT {nombre} UNIQUE ({columnas});
+          END IF;
+        EXCEPTION WHEN unique_violation THEN
+          -- hay duplicados previos que limpiar a mano
+          RAISE WARNING 'No se pudo crear {nombre}: hay filas duplicadas';
+        END $$;
+        """)
+
+
+def _pedidos_normalizados(conn: Connection) -> None:
+    """
+    Tabla ``pedidos`` de antes de pedido_items: agrega comprador_id y
+    updated_at, pasa cada ``items_json`` a filas de pedido_items y borra la
+    columna. En bases creadas con el modelo actual no hace nada.
+    """
+    if "pedidos" not in inspect(conn).get_table_names():
+        return
+    columnas = {c["name"] for c in inspect(conn).get_columns("pedidos")}
+    pg = _es_postgres(conn)
+
+    if "comprador_id" not in columnas:
+        conn.exec_driver_sql("ALTER TABLE pedidos ADD COLUMN comprador_id INTEGER NOT NULL DEFAULT 0")
+        # El pedido viejo solo guardaba el email: se enlaza con el comprador que lo tenga (0 si ninguno)
+        conn.exec_driver_sql(
+            "UPDATE pedidos SET comprador_id = COALESCE((SELECT c.id_comprador FROM compradores c"
+            " WHERE lower(c.email) = lower(pedidos.email_cliente) LIMIT 1), 0)"
+        )
+        if pg:
+            conn.exec_driver_sql("ALTER TABLE pedidos ALTER COLUMN comprador_id DROP DEFAULT")
+    if "updated_at" not in columnas:
+        conn.exec_driver_sql(f"ALTER TABLE pedidos ADD COLUMN updated_at {'TIMESTAMP' if pg else 'DATETIME'}")
+        conn.exec_driver_sql("UPDATE pedidos SET updated_at = created_at")
+        if pg:
+            conn.exec_driver_sql("ALTER TABLE pedidos ALTER COLUMN updated_at SET NOT NULL")
+
+    if "items_json" in columnas:
+        filas = conn.execute(text(
+            "SELECT id, items_json FROM pedidos WHERE items_json IS NOT NULL ORDER BY id"
+        )).all()
+        lineas = []
+        for pedido_id, items_json in filas:
+            try:
+                items = json.loads(items_json)
+                lineas += [
+                    {"pedido_id": pedido_id, "producto_id": int(it["producto_id"]), "nombre": str(it["nombre"]),
+                     "precio": float(it["precio"]), "cantidad": int(it["cantidad"])}
+                    for it in items
+                ]
+            except (ValueError, TypeError, KeyError) as e:
+                log.warning("Pedido %s: items_json ilegible (%s), queda sin líneas", pedido_id, e.__class__.__name__)
+        if lineas:
+            conn.execute(text(
+                "INSERT INTO pedido_items (pedido_id, producto_id, nombre, precio, cantidad)"
+                " VALUES (:pedido_id, :producto_id, :nombre, :precio, :cantidad)"
+            ), lineas)
+        conn.exec_driver_sql("ALTER TABLE pedidos DROP COLUMN items_json")  # SQLite >= 3.35
+
+    if not pg:
+        # En Postgres los crea la migración 4 sin bloquear la tabla
+        for nombre, columnas_indice in (
+            ("ix_pedidos_comprador_id", "comprador_id"),
+            ("ix_pedidos_created_at", "created_at"),
+            ("ix_pedidos_updated_at", "updated_at"),
+            ("ix_pedidos_comprador_created", "comprador_id, created_at"),
+        ):
+            conn.exec_driver_sql(f"CREATE INDEX IF NOT EXISTS {nombre} ON pedidos ({columnas_indice})")
+
+
+def crear_indice_concurrente(conn: Connection, nombre: str, definicion: str) -> bool:
+    """
+    ``CREATE INDEX CONCURRENTLY IF NOT EXISTS nombre <definicion>``; conn en AUTOCOMMIT.
+    False si el build falló (se avisa y se sigue con los demás índices; el
+    que quedó INVALID se rehace cuando se reintente la migración).
+    """
+    try:
+        invalido = conn.execute(text(
+            "SELECT NOT i.indisvalid FROM pg_class c JOIN pg_index i ON i.indexrelid = c.oid"
+            " WHERE c.relname = :nombre"
+        ), {"nombre": nombre}).scalar()
+        if invalido:
+            log.warning("Índice %s inválido (build interrumpido): se reconstruye", nombre)
+            conn.exec_driver_sql(f"DROP INDEX CONCURRENTLY IF EXISTS {nombre}")
+        conn.exec_driver_sql(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {nombre} {definicion}")
+        return True
+    except Exception as e:
+        log.warning("No se pudo crear el índice %s: %s", nombre, e)
+        return False
+
+
+def _indices_busqueda(conn: Connection) -> List[str]:
+    """Índices que create_all no agrega a tablas que ya existían (en SQLite ya los creó)."""
+    if not _es_postgres(conn):
+        return []
+    indices = [
+        ("ix_compradores_email_lower", "ON public.compradores (lower(email))"),
+        ("ix_vendedores_email_lower", "ON public.vendedores (lower(email))"),
+        # Exportación incremental (GET /admin/export/pedidos?updated_since=)
+        ("ix_pedidos_updated_at", "ON public.pedidos (updated_at)"),
+        # Tablas pedidos creadas antes de pedido_items (ver _pedidos_normalizados)
+        ("ix_pedidos_comprador_id", "ON public.pedidos (comprador_id)"),
+        ("ix_pedidos_created_at", "ON public.pedidos (created_at)"),
+        ("ix_pedidos_comprador_created", "ON public.pedidos (comprador_id, created_at)"),
+        # Full-text de productos (misma expresión que Busqueda_Producto._tsvector)
+        ("ix_productos_busqueda_fts", """ON public.productos USING gin (
+            to_tsvector('spanish'::regconfig, coalesce(nombre, '') || ' ' || coalesce(descripcion, ''))
+        )"""),
+    ]
+    # Trigram para direccion ILIKE '%...%' (requiere pg_trgm; si no hay permisos
+    # para la extensión, la búsqueda funciona sin índice)
+    try:
+        conn.exec_driver_sql("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        indices.append(
+            ("ix_compradores_direccion_trgm", "ON public.compradores USING gin (direccion gin_trgm_ops)")
+        )
+    except Exception as e:
+        log.warning("Sin pg_trgm (%s): se omite ix_compradores_direccion_trgm", e.__class__.__name__)
+    return [nombre for nombre, definicion in indices if not crear_indice_concurrente(conn, nombre, definicion)]
+
+
+MIGRACIONES: List[Migracion] = [
+    Migracion(1, "esquema_base", _esquema_base),
+    Migracion(2, "restricciones_unicas", _restricciones_unicas),
+    Migracion(3, "pedidos_normalizados", _pedidos_normalizados),
+    Migracion(4, "indices_busqueda", _indices_busqueda, transaccional=False),
+]
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Huella y registro
+# ──────────────────────────────────────────────────────────────────────────────
+def huella_esquema() -> str:
+    """Hash del esquema que espera el código (independiente de la BD)."""
+    partes = [f"m{m.version}:{m.nombre}" for m in MIGRACIONES]
+    for tabla in sorted(SQLModel.metadata.tables.values(), key=lambda t: t.name):
+        partes.append(f"t:{tabla.name}")
+        partes += [f"c:{c.name}:{c.type!r}:{c.nullable}" for c in tabla.columns]
+        partes += sorted(f"i:{i.name}:{i.unique}" for i in tabla.indexes)
+        partes += sorted(f"k:{k.name}" for k in tabla.constraints if k.name)
+    return hashlib.sha256("\n".join(partes).encode()).hexdigest()
+
+
+def _crear_tabla_registro(conn: Connection) -> None:
+    conn.exec_driver_sql(
+        f"CREATE TABLE IF NOT EXISTS {TABLA} ("
+        " version INTEGER PRIMARY KEY,"
+        " nombre VARCHAR(100) NOT NULL,"
+        " huella VARCHAR(64) NOT NULL,"
+        " aplicada_en TIMESTAMP NOT NULL)"
+    )
+
+
+def version_actual(engine: Engine) -> Optional[tuple]:
+    """(version, huella) registradas en la BD; None si nunca se migró."""
+    try:
+        with engine.connect() as conn:
+            return conn.execute(text(
+                f"SELECT version, huella FROM {TABLA} ORDER BY version DESC LIMIT 1"
+            )).first()
+    except Exception:
+        return None  # la tabla aún no existe
+
+
+def estado(engine: Engine) -> dict:
+    actual = version_actual(engine)
+    version = actual[0] if actual else 0
+    huella = huella_esquema()
+    return {
+        "version_bd": version,
+        "version_codigo": MIGRACIONES[-1].version,
+        "huella_bd": actual[1] if actual else None,
+        "huella_codigo": huella,
+        "al_dia": bool(actual) and version == MIGRACIONES[-1].version and actual[1] == huella,
+        "pendientes": [f"{m.version}:{m.nombre}" for m in MIGRACIONES if m.version > version],
+    }
+
+
+def _registrar(engine: Engine, m: Migracion, huella: str) -> None:
+    with engine.begin() as conn:
+        conn.execute(text(f"DELETE FROM {TABLA} WHERE version = :v"), {"v": m.version})
+        conn.execute(
+            text(f"INSERT INTO {TABLA} (version, nombre, huella, aplicada_en) VALUES (:v, :n, :h, :t)"),
+            {"v": m.version, "n": m.nombre, "h": huella, "t": datetime.utcnow()},
+        )
+
+
+def _ejecutar(engine: Engine, m: Migracion) -> None:
+    if m.transaccional:
+        with engine.begin() as conn:
+            m.aplicar(conn)
+    else:
+        with engine.connect() as conn:
+            fallidos = m.aplicar(conn.execution_options(isolation_level="AUTOCOMMIT"))
+        if fallidos:
+            raise MigracionIncompleta(m, fallidos)
+
+
+def aplicar_pendientes(engine: Engine, hasta: Optional[int] = None) -> List[str]:
+    """
+    Aplica en orden las migraciones pendientes (hasta la versión ``hasta``).
+    Si una no transaccional queda incompleta, lanza MigracionIncompleta sin
+    registrarla (ni seguir con las siguientes). Si no hay pendientes pero la
+    huella cambió (modelo modificado sin migración nueva), re-ejecuta
+    ``esquema_base`` para crear las tablas que falten y avisa, sin registrar
+    la huella nueva.
+    """
+    huella = huella_esquema()
+    with engine.connect() as lock:
+        if lock.dialect.name == "postgresql":
+            lock = lock.execution_options(isolation_level="AUTOCOMMIT")
+            lock.execute(text("SELECT pg_advisory_lock(:id)"), {"id": _LOCK_ID})
+        try:
+            with engine.begin() as conn:
+                _crear_tabla_registro(conn)
+            # Releer bajo el lock: otro worker pudo migrar mientras esperábamos
+            actual = version_actual(engine)
+            version = actual[0] if actual else 0
+            aplicadas = []
+            for m in MIGRACIONES:
+                if m.version <= version or (hasta is not None and m.version > hasta):
+                    continue
+                log.info("Aplicando migración %s %s", m.version, m.nombre)
+                try:
+                    _ejecutar(engine, m)
+                except MigracionIncompleta as e:
+                    e.aplicadas = aplicadas
+                    raise
+                _registrar(engine, m, huella)
+                aplicadas.append(f"{m.version}:{m.nombre}")
+            if not aplicadas and actual and actual[1] != huella and hasta is None:
+                _ejecutar(engine, MIGRACIONES[0])
+                log.warning(
+                    "El modelo cambió sin una migración nueva (huella distinta): solo se crearon las "
+                    "tablas faltantes. Agrega una Migracion para columnas e índices de tablas existentes."
+                )
+            return aplicadas
+        finally:
+            if lock.dialect.name == "postgresql":
+                lock.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": _LOCK_ID})
+
+
+def preparar_esquema(engine: Engine) -> str:
+    """
+    Para el arranque: una sola consulta si el esquema está al día.
+    MIGRATIONS_ON_STARTUP=0 solo avisa (las migraciones se corren con la CLI).
+    Una migración incompleta o una huella distinta no impiden arrancar: se
+    avisa y se reintenta en el próximo arranque.
+    """
+    actual = version_actual(engine)
+    if actual and actual[0] == MIGRACIONES[-1].version and actual[1] == huella_esquema():
+        return "al_dia"
+    if os.getenv("MIGRATIONS_ON_STARTUP", "1") == "0":
+        log.warning("Esquema desactualizado: corre python -m backend.cli.migrar aplicar")
+        return "pendiente"
+    try:
+        aplicar_pendientes(engine)
+    except MigracionIncompleta as e:
+        log.warning("%s; se reintenta en el próximo arranque", e)
+        return "incompleto"
+    return "migrado" if estado(engine)["al_dia"] else "desactualizado"
@@ -0,0 +1,218 @@
+# backend/db/pool.py
+"""
+Configuración del pool de conexiones por variables de entorno.
+
+  DB_POOL_MODE             queue (default) | null  (NullPool: una conexión por
+                           sesión, recomendado detrás del transaction pooler de
+                           pgbouncer/Supabase, puerto 6543)
+  DB_POOL_SIZE             conexiones persistentes (default 5)
+  DB_MAX_OVERFLOW          conexiones extra bajo picos (default 10)
+  DB_POOL_TIMEOUT          segundos esperando una conexión libre (default 30)
+  DB_POOL_RECYCLE          segundos antes de reciclar una conexión (default 1800)
+  DB_PRE_PING              always | idle (default) | never
+                           idle: SELECT 1 solo si la conexión estuvo ociosa más
+                           de DB_PRE_PING_IDLE_SECONDS (default 30), en vez de
+                           un round-trip extra en cada checkout
+  DB_PGBOUNCER             1 | 0 | auto (default: puerto 6543). Desactiva los
+                           prepared statements del lado servidor (asyncpg)
+  DB_SQLITE_WAL            1 (default) | 0   journal_mode=WAL en SQLite archivo
+  DB_SQLITE_SHARED_CACHE   1 | 0 (default)   cache=shared entre conexiones
+"""
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine.url import make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
+
+
+def _env_int(nombre: str, default: int) -> int:
+    return int(os.getenv(nombre, str(default)))
+
+
+class _MedidorEspera:
+    """Acumula cuánto esperan los checkouts por una conexión libre."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.esperas = 0
+        self.espera_total = 0.0
+        self.espera_max = 0.0
+        self.timeouts = 0
+
+    def registrar(self, segundos: float, timeout: bool = False) -> None:
+        with self._lock:
+            self.esperas += 1
+            self.espera_total += segundos
+            self.espera_max = max(self.espera_max, segundos)
+            if timeout:
+                self.timeouts += 1
+
+    def estadisticas(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "checkouts": self.esperas,
+                "espera_total_ms": round(self.espera_total * 1000, 3),
+                "espera_promedio_ms": round(self.espera_total * 1000 / self.esperas, 3) if self.esperas else 0.0,
+                "espera_max_ms": round(self.espera_max * 1000, 3),
+                "timeouts": self.timeouts,
+            }
+
+
+class _MedicionMixin:
+    def _do_get(self):
+        inicio = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except exc.TimeoutError:
+            self.medidor.registrar(time.perf_counter() - inicio, timeout=True)
+            raise
+        self.medidor.registrar(time.perf_counter() - inicio)
+        return conn
+
+
+class PoolMedido(_MedicionMixin, QueuePool):
+    def __init__(self, *args, **kwargs):
+        self.medidor = _MedidorEspera()
+        super().__init__(*args, **kwargs)
+
+    def recreate(self):
+        nuevo = super().recreate()
+        nuevo.medidor = self.medidor
+        return nuevo
+
+
+class PoolMedidoAsync(_MedicionMixin, AsyncAdaptedQueuePool):
+    def __init__(self, *args, **kwargs):
+        self.medidor = _MedidorEspera()
+        super().__init__(*args, **kwargs)
+
+    def recreate(self):
+        nuevo = super().recreate()
+        nuevo.medidor = self.medidor
+        return nuevo
+
+
+def es_pgbouncer(url: str) -> bool:
+    valor = os.getenv("DB_PGBOUNCER", "auto").lower()
+    if valor in ("1", "0"):
+        return valor == "1"
+    try:
+        return make_url(url).port == 6543
+    except Exception:
+        return False
+
+
+def _es_sqlite(url: str) -> bool:
+    return url.startswith("sqlite")
+
+
+def _sqlite_en_memoria(url: str) -> bool:
+    return ":memory:" in url or url.rstrip("/").endswith("sqlite:")
+
+
+def preparar_url(url: str) -> str:
+    """SQLite + DB_SQLITE_SHARED_CACHE=1 -> URI file:...?cache=shared."""
+    if _es_sqlite(url) and os.getenv("DB_SQLITE_SHARED_CACHE") == "1" and not _sqlite_en_memoria(url):
+        driver, ruta = url.split(":///", 1)
+        return f"{driver}:///file:{ruta}?cache=shared&uri=true"
+    return url
+
+
+def opciones_engine(url: str, async_: bool = False) -> Dict[str, Any]:
+    """kwargs para create_engine / create_async_engine según el entorno."""
+    opts: Dict[str, Any] = {}
+    connect_args: Dict[str, Any] = {}
+    modo = os.getenv("DB_POOL_MODE", "queue").lower()
+
+    if _es_sqlite(url):
+        if not async_:
+            # FastAPI usa un threadpool: la conexión puede cambiar de hilo
+            connect_args["check_same_thread"] = False
+    elif modo == "null":
+        opts["poolclass"] = NullPool
+    else:
+        opts.update(
+            poolclass=PoolMedidoAsync if async_ else PoolMedido,
+            pool_size=_env_int("DB_POOL_SIZE", 5),
+            max_overflow=_env_int("DB_MAX_OVERFLOW", 10),
+            pool_timeout=_env_int("DB_POOL_TIMEOUT", 30),
+            pool_recycle=_env_int("DB_POOL_RECYCLE", 1800),
+        )
+
+    if os.getenv("DB_PRE_PING", "idle").lower() == "always":
+        opts["pool_pre_ping"] = True
+
+    if async_ and not _es_sqlite(url) and es_pgbouncer(url):
+        # pgbouncer en modo transacción no soporta prepared statements con nombre
+        connect_args.update(statement_cache_size=0, prepared_statement_cache_size=0)
+
+    if connect_args:
+        opts["connect_args"] = connect_args
+    return opts
+
+
+def instalar_eventos(engine, url: str) -> None:
+    """Listeners de conexión: PRAGMAs de SQLite y pre-ping por inactividad."""
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    if _es_sqlite(url):
+        wal = os.getenv("DB_SQLITE_WAL", "1") == "1" and not _sqlite_en_memoria(url)
+
+        @event.listens_for(sync_engine, "connect")
+        def _pragmas_sqlite(dbapi_conn, _record):
+            cur = dbapi_conn.cursor()
+            try:
+                if wal:
+                    cur.execute("PRAGMA journal_mode=WAL")
+                    cur.execute("PRAGMA synchronous=NORMAL")
+                cur.execute("PRAGMA busy_timeout=5000")
+            finally:
+                cur.close()
+        return
+
+    if os.getenv("DB_PRE_PING", "idle").lower() != "idle" or isinstance(sync_engine.pool, NullPool):
+        return
+    umbral = float(os.getenv("DB_PRE_PING_IDLE_SECONDS", "30"))
+
+    @event.listens_for(sync_engine, "checkin")
+    def _marcar_uso(_dbapi_conn, record):
+        if record is not None:
+            record.info["ultimo_uso"] = time.monotonic()
+
+    @event.listens_for(sync_engine, "checkout")
+    def _ping_si_ociosa(dbapi_conn, record, _proxy):
+        ultimo = record.info.get("ultimo_uso")
+        if ultimo is None or time.monotonic() - ultimo < umbral:
+            return
+        cur = dbapi_conn.cursor()
+        try:
+            cur.execute("SELECT 1")
+        except Exception as e:
+            # El pool descarta esta conexión y reintenta con otra
+            raise exc.DisconnectionError() from e
+        finally:
+            try:
+                cur.close()
+            except Exception:
+                pass
+
+
+def estadisticas_pool(engine) -> Optional[Dict[str, Any]]:
+    if engine is None:
+        return None
+    pool = getattr(engine, "sync_engine", engine).pool
+    stats: Dict[str, Any] = {"clase": type(pool).__name__, "estado": pool.status()}
+    if isinstance(pool, QueuePool):
+        stats.update(
+            tamano=pool.size(),
+            en_uso=pool.checkedout(),
+            libres=pool.checkedin(),
+            overflow=max(pool.overflow(), 0),
+        )
+    medidor = getattr(pool, "medidor", None)
+    if medidor is not None:
+        stats["espera"] = medidor.estadisticas()
+    return stats
@@ -0,0 +1,78 @@
+# backend/db/restricciones.py
+"""
+Traducir una IntegrityError de unicidad al nombre de la restricción del modelo.
+
+En vez de un SELECT previo por cada campo único (una ida y vuelta extra y una
+carrera entre el SELECT y el INSERT), se escribe directo y, si la BD rechaza,
+se mira QUÉ restricción falló para dar el mensaje de siempre:
+
+    try:
+        session.commit()
+    except IntegrityError as e:
+        session.rollback()
+        raise ValueError(mensaje_unicidad(e, Vendedor.__table__, {
+            "uq_vendedores_email": "Ya existe un vendedor con ese email", ...
+        }, "Email o id_vendedor duplicado"))
+
+Postgres informa el nombre de la restricción (psycopg ``diag.constraint_name``,
+asyncpg ``constraint_name``); SQLite solo las columnas ("UNIQUE constraint
+failed: tiendas.slug"). Las columnas se cruzan con las restricciones UNIQUE e
+índices únicos de la tabla, así los dos casos dan el mismo nombre, también
+cuando la BD creó la restricción con otro nombre.
+"""
+import re
+from typing import Dict, FrozenSet, Optional
+
+from sqlalchemy import Table, UniqueConstraint
+from sqlalchemy.exc import IntegrityError
+
+_SQLITE = re.compile(r"UNIQUE constraint failed: (.+)")
+_POSTGRES = re.compile(r"Key \(([^)]+)\)=")
+
+
+def _unicas(tabla: Table) -> Dict[str, FrozenSet[str]]:
+    """nombre -> columnas, para restricciones UNIQUE e índices únicos de ``tabla``."""
+    unicas = {}
+    for c in tabla.constraints:
+        if isinstance(c, UniqueConstraint) and c.name:
+            unicas[c.name] = frozenset(col.name for col in c.columns)
+    for i in tabla.indexes:
+        if i.unique and i.name:
+            unicas[i.name] = frozenset(col.name for col in i.columns)
+    return unicas
+
+
+def _nombre_informado(orig) -> Optional[str]:
+    diag = getattr(orig, "diag", None)  # psycopg2 / psycopg 3
+    nombre = getattr(diag, "constraint_name", None) or getattr(orig, "constraint_name", None)
+    if nombre is None and orig.__cause__ is not None:  # asyncpg envuelto por SQLAlchemy
+        nombre = getattr(orig.__cause__, "constraint_name", None)
+    return nombre
+
+
+def _columnas_informadas(texto: str) -> Optional[FrozenSet[str]]:
+    m = _SQLITE.search(texto)
+    if m:
+        return frozenset(parte.strip().rsplit(".", 1)[-1] for parte in m.group(1).split(","))
+    m = _POSTGRES.search(texto)
+    if m:
+        return frozenset(parte.strip().strip('"') for parte in m.group(1).split(","))
+    return None
+
+
+def restriccion_violada(error: IntegrityError, tabla: Table) -> Optional[str]:
+    """Nombre (según el modelo) de la restricción única que falló; None si no se reconoce."""
+    unicas = _unicas(tabla)
+    nombre = _nombre_informado(error.orig)
+    if nombre in unicas:
+        return nombre
+    columnas = _columnas_informadas(str(error.orig))
+    if columnas:
+        for candidato, cols in unicas.items():
+            if cols == columnas:
+                return candidato
+    return nombre
+
+
+def mensaje_unicidad(error: IntegrityError, tabla: Table, mensajes: Dict[str, str], defecto: str) -> str:
+    return mensajes.get(restriccion_violada(error, tabla), defecto)
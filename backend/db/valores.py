@@ -0,0 +1,29 @@
+# backend/db/valores.py
+"""
+Tablas de VALUES para sentencias por conjuntos (UPDATE ... FROM (VALUES ...)).
+"""
+from typing import List, Sequence, Tuple
+
+from sqlalchemy import column, select, values
+from sqlalchemy.types import TypeEngine
+from sqlmodel import Session
+
+
+def tabla_valores(
+    session: Session,
+    columnas: Sequence[Tuple[str, TypeEngine]],
+    filas: List[tuple],
+    nombre: str = "v",
+):
+    """
+    Subconsulta ``nombre`` con las ``columnas`` dadas a partir de VALUES.
+    Postgres acepta el alias con lista de columnas; SQLite no, pero nombra
+    las columnas de VALUES column1, column2, ... y se renombran con un SELECT.
+    """
+    if session.get_bind().dialect.name == "postgresql":
+        return values(*(column(n, t) for n, t in columnas), name=nombre).data(filas)
+
+    crudo = values(*(column(f"column{i}", t) for i, (_, t) in enumerate(columnas, start=1))).data(filas)
+    return select(
+        *(crudo.c[f"column{i}"].label(n) for i, (n, _) in enumerate(columnas, start=1))
+    ).subquery(nombre)
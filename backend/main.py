@@ -5,15 +5,22 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 # Routers
-from backend.Routers import vendedores, Administradores, Compradores
+from backend.Routers import vendedores, Compradores
 from backend.Routers import Productos as productos_router
 from backend.Routers import Categoria as categorias_router
 from backend.Routers import Tienda
 from backend.Routers import Pedidos
+from backend.Routers import Sesion
 
 
+from backend.core.cache import cache
+from backend.core.diferidos import RoutersDiferidos
+from backend.core.limites import LimiteTasa, reglas_login
+from backend.db.engine import DB_ASYNC, engine_creado, async_engine_creado
+from backend.db.pool import estadisticas_pool
+
 # Init DB (una sola fuente de verdad)
-from backend.db.init_db import create_db_and_tables, test_connection
+from backend.db.init_db import prepare_schema
 
 
 TESTING = os.getenv("TESTING") == "1"
@@ -23,13 +30,12 @@ TESTING = os.getenv("TESTING") == "1"
 async def lifespan(app: FastAPI):
     # Solo corre tareas de startup si no estamos en modo test
     if not TESTING:
-        print(" Verificando conexión a la BD...")
-        test_connection()  # seguro: hace fallback a SELECT 1 en no-Postgres
-        print(" Creando tablas si no existen...")
-        create_db_and_tables()
-        print("Startup listo.")
+        # Con el esquema al día es una sola consulta (versión + huella), sin DDL;
+        # si falla la conexión, falla aquí igual que antes
+        print(" Verificando esquema de la BD...")
+        print(f"Esquema: {prepare_schema()}. Startup listo.")
     else:
-        print("🧪 TESTING=1 → Omitiendo test_connection() y create_db_and_tables().")
+        print("🧪 TESTING=1 → Omitiendo verificación de esquema y migraciones.")
     yield
 
 
@@ -38,6 +44,17 @@ app = FastAPI(
     lifespan=None if TESTING else lifespan  # en test, ni siquiera adjuntamos lifespan
 )
 
+# Límite de intentos de login (por IP y por email), antes de abrir sesión de BD.
+# Se agrega antes que CORS para que los 429 también lleven cabeceras CORS.
+app.add_middleware(
+    LimiteTasa,
+    reglas=reglas_login([
+        vendedores.router.prefix + "/login",
+        Compradores.router.prefix + "/login",
+        "/administradores/login",
+    ]),
+)
+
 # CORS
 app.add_middleware(
     CORSMiddleware,
@@ -49,16 +66,29 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],  # paginación por cursor
 )
 
 # Routers
+if DB_ASYNC:
+    # Lecturas async primero: atienden las mismas URLs que sus pares sync
+    from backend.Routers import aio
+    for r in aio.routers:
+        app.include_router(r)
+
 app.include_router(vendedores.router)
-app.include_router(Administradores.router)
 app.include_router(Compradores.router)
 app.include_router(productos_router.router)
 app.include_router(categorias_router.router)
 app.include_router(Tienda.router)
 app.include_router(Pedidos.router)
+app.include_router(Sesion.router)
+
+# Administración: se importa con la primera petición a su prefijo (arranque más corto)
+RoutersDiferidos.registrar(app, {
+    "/administradores": "backend.Routers.Administradores",
+    "/admin/export": "backend.Routers.Exportacion",
+})
 
 # Rutas simples
 @app.get("/")
@@ -69,6 +99,18 @@ def root():
 def healthz():
     return {"status": "ok"}
 
+@app.get("/healthz/cache")
+def healthz_cache():
+    return cache.estadisticas()
+
+@app.get("/healthz/db")
+def healthz_db():
+    return {
+        # Sin crear el engine: hasta la primera consulta no hay pool
+        "sync": estadisticas_pool(engine_creado()),
+        "async": estadisticas_pool(async_engine_creado()),
+    }
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
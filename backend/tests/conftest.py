@@ -1,18 +1,31 @@
 # backend/tests/conftest.py
 import os
 import pytest
+
+# Sin lifespan (ni migraciones contra la BD real)
+os.environ.setdefault("TESTING", "1")
+# Costo de scrypt bajo: los tests crean muchas cuentas
+os.environ.setdefault("PASSWORD_SCRYPT_LOG_N", "10")
+
 from fastapi.testclient import TestClient
 from sqlmodel import SQLModel
 from sqlmodel import create_engine, Session
+from sqlalchemy.pool import StaticPool
 from backend.main import app
 from backend.db.engine import get_session as real_get_session
 
 # Engine de pruebas (SQLite en memoria)
 TEST_DB_URL = "sqlite:///:memory:"
-engine = create_engine(TEST_DB_URL, connect_args={"check_same_thread": False})
+# StaticPool: una sola conexión compartida, si no cada hilo del TestClient
+# vería su propia base :memory: vacía
+engine = create_engine(
+    TEST_DB_URL,
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
+)
 
 def get_test_session():
-    with Session(engine) as session:
+    with Session(engine, expire_on_commit=False) as session:
         yield session
 
 @pytest.fixture(scope="session", autouse=True)
@@ -0,0 +1,68 @@
+# backend/tests/test_arranque.py
+import os
+import subprocess
+import sys
+
+from backend.cli.tiempo_arranque import perfil_importacion, tiempo_listo
+
+# Holgado a propósito (CI compartido); en local el primer /healthz ronda 1 s
+PRESUPUESTO_S = float(os.getenv("STARTUP_BUDGET_SECONDS", "5"))
+
+
+def test_import_no_crea_engine_ni_carga_admin():
+    codigo = (
+        "import sys, backend.main, backend.db.engine as e;"
+        "print(e.engine_creado() is None,"
+        " 'backend.Routers.Administradores' in sys.modules,"
+        " 'backend.Routers.Exportacion' in sys.modules)"
+    )
+    salida = subprocess.run(
+        [sys.executable, "-c", codigo], capture_output=True, text=True, check=True,
+        env={**os.environ, "TESTING": "1"},
+    ).stdout.split()
+    assert salida[-3:] == ["True", "False", "False"]
+
+
+def test_primer_uso_concurrente_crea_un_solo_engine():
+    codigo = (
+        "import time, backend.db.engine as e;"
+        "from concurrent.futures import ThreadPoolExecutor;"
+        "original = e.create_engine;"
+        "e.create_engine = lambda *a, **k: (time.sleep(0.05), original(*a, **k))[1];"
+        "print(len({id(x) for x in ThreadPoolExecutor(8).map(lambda _: e.get_engine(), range(8))}))"
+    )
+    salida = subprocess.run(
+        [sys.executable, "-c", codigo], capture_output=True, text=True, check=True,
+        env={**os.environ, "TESTING": "1"},
+    ).stdout.split()
+    assert salida[-1] == "1"
+
+
+def test_app_lista_dentro_del_presupuesto():
+    tiempos = tiempo_listo()
+    assert tiempos["listo_s"] < PRESUPUESTO_S, tiempos
+
+
+def test_perfil_importacion_lista_modulos():
+    modulos = {f.modulo for f in perfil_importacion()}
+    assert "backend.main" in modulos
+    assert "backend.Routers.Administradores" not in modulos
+
+
+def test_router_diferido_responde_en_la_primera_peticion(client):
+    r = client.post("/administradores/", json={
+        "id_admin": 950401, "nombre": "Diferido", "email": "diferido950401@x.com",
+        "password": "secreto123", "nivel_acceso": "admin",
+    })
+    assert r.status_code == 200, r.text
+    login = client.post("/administradores/login", json={"email": "diferido950401@x.com", "password": "secreto123"})
+    assert login.status_code == 200
+    assert client.get("/admin/export/productos").status_code == 401
+    cabecera = {"Authorization": f"Bearer {login.json()['token']}"}
+    assert client.get("/admin/export/productos", headers=cabecera).status_code == 200
+
+
+def test_openapi_incluye_routers_diferidos(client):
+    rutas = client.get("/openapi.json").json()["paths"]
+    assert "/administradores/login" in rutas
+    assert "/admin/export/{entidad}" in rutas
@@ -0,0 +1,66 @@
+import pytest
+
+pytest.importorskip("aiosqlite")
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel, Session, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from backend.db.engine import async_database_url, get_async_session
+from backend.Modelos import Producto, Tienda, Vendedor
+from backend.Routers import aio
+
+
+@pytest.fixture()
+def async_client(tmp_path):
+    url = f"sqlite:///{tmp_path / 'async.db'}"
+    sync_engine = create_engine(url)
+    SQLModel.metadata.create_all(sync_engine)
+    with Session(sync_engine) as s:
+        v = Vendedor(id_vendedor=860001, nombre="Async", email="async@example.com", password="x" * 8)
+        s.add(v)
+        s.commit()
+        s.add(Tienda(vendedor_id=v.id, nombre_negocio="Async", slug="tienda-async"))
+        s.add_all([
+            Producto(nombre=f"A{i}", precio=1.0, stock=1, vendedor_id=v.id, destacado=i == 0)
+            for i in range(3)
+        ])
+        s.commit()
+
+    async_engine = create_async_engine(async_database_url(url))
+
+    async def session_override():
+        async with AsyncSession(async_engine, expire_on_commit=False) as session:
+            yield session
+
+    app = FastAPI()
+    for r in aio.routers:
+        app.include_router(r)
+    app.dependency_overrides[get_async_session] = session_override
+    with TestClient(app) as c:
+        yield c
+
+
+def test_async_url():
+    assert async_database_url("sqlite:///./x.db") == "sqlite+aiosqlite:///./x.db"
+    assert async_database_url("postgresql+psycopg2://u:p@h/db") == "postgresql+asyncpg://u:p@h/db"
+
+
+def test_lecturas_async(async_client):
+    r = async_client.get("/productos/", params={"id_vendedor": 860001, "cursor": "", "limit": 2})
+    assert r.status_code == 200
+    assert [p["nombre"] for p in r.json()] == ["A0", "A1"]
+    assert "X-Next-Cursor" in r.headers
+
+    pid = r.json()[0]["id"]
+    etag = async_client.get(f"/productos/{pid}").headers["ETag"]
+    assert async_client.get(f"/productos/{pid}", headers={"If-None-Match": etag}).status_code == 304
+
+    assert async_client.get("/tiendas/tienda-async").json()["vendedor_id_manual"] == 860001
+    assert len(async_client.get("/tiendas/tienda-async/productos").json()) == 3
+    assert async_client.get("/tiendas/no-existe").status_code == 404
+    assert [v["id_vendedor"] for v in async_client.get("/vendedores/").json()] == [860001]
+    assert async_client.get("/compradores/").json() == []
+    assert async_client.get("/pedidos/").json() == []
@@ -0,0 +1,90 @@
+# backend/tests/test_bench.py
+import asyncio
+
+import httpx
+import pytest
+from sqlmodel import Session, create_engine, select
+
+from backend.bench.carga import comparar, ejecutar, percentil, resumir
+from backend.bench.datos import VOLUMENES, referencias, sembrar
+from backend.core.cache import cache
+from backend.db.engine import get_session
+from backend.main import app
+from backend.Modelos import Producto
+
+
+def _engine_archivo(ruta):
+    # Archivo y no :memory: con StaticPool: la carga usa varias conexiones a la vez
+    return create_engine(f"sqlite:///{ruta}", connect_args={"check_same_thread": False})
+
+
+@pytest.fixture()
+def bench_engine(tmp_path):
+    engine = _engine_archivo(tmp_path / "bench.db")
+    sembrar(engine, VOLUMENES["chico"], semilla=7)
+    yield engine
+    engine.dispose()
+
+
+def test_percentil_rango_mas_cercano():
+    valores = [float(i) for i in range(1, 101)]
+    assert percentil(valores, 50) == 50.0
+    assert percentil(valores, 95) == 95.0
+    assert percentil(valores, 99) == 99.0
+    assert percentil([3.0], 99) == 3.0
+    assert percentil([], 50) == 0.0
+
+
+def test_sembrado_determinista_y_sesgado(bench_engine, tmp_path):
+    otro = _engine_archivo(tmp_path / "otro.db")
+    filas = sembrar(otro, VOLUMENES["chico"], semilla=7)
+    assert filas["productos"] == 200 and filas["tiendas"] == 5
+
+    def catalogo(engine):
+        with Session(engine) as s:
+            return s.exec(select(Producto.nombre, Producto.precio, Producto.vendedor_id).order_by(Producto.id)).all()
+
+    assert catalogo(bench_engine) == catalogo(otro)
+    por_tienda = {}
+    for _, _, vendedor_id in catalogo(otro):
+        por_tienda[vendedor_id] = por_tienda.get(vendedor_id, 0) + 1
+    assert len(por_tienda) == 5 and max(por_tienda.values()) > 200 / 5
+
+    with pytest.raises(ValueError):
+        sembrar(otro, VOLUMENES["chico"], semilla=7)
+
+
+def test_carga_asgi_resume_por_ruta(bench_engine):
+    def sesion_bench():
+        with Session(bench_engine, expire_on_commit=False) as session:
+            yield session
+
+    async def correr():
+        transporte = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transporte, base_url="http://bench") as cliente:
+            return await ejecutar(cliente, referencias(bench_engine), {"vitrina": 3, "compra": 1},
+                                  usuarios=4, peticiones=60, semilla=1)
+
+    anterior = app.dependency_overrides.get(get_session)
+    app.dependency_overrides[get_session] = sesion_bench
+    try:
+        registro = asyncio.run(correr())
+    finally:
+        if anterior is None:
+            app.dependency_overrides.pop(get_session, None)
+        else:
+            app.dependency_overrides[get_session] = anterior
+        cache.limpiar()  # destacados y páginas de tienda del catálogo del benchmark
+
+    reporte = resumir(registro)
+    assert reporte["total"]["peticiones"] == 60
+    assert reporte["total"]["errores"] == 0, reporte["rutas"]
+    assert "GET /tiendas/{slug}/pagina" in reporte["rutas"]
+    assert "POST /pedidos/" in reporte["rutas"]
+    for datos in reporte["rutas"].values():
+        assert datos["p50_ms"] <= datos["p95_ms"] <= datos["p99_ms"] <= datos["max_ms"]
+
+    # Contra sí mismo no hay regresiones; con el doble de latencia, sí
+    assert not any(c["regresion"] for c in comparar(reporte, reporte, min_peticiones=1))
+    peor = {"rutas": {r: dict(d, p95_ms=d["p95_ms"] * 2 + 5) for r, d in reporte["rutas"].items()}}
+    assert all(c["regresion"] for c in comparar(reporte, peor, min_peticiones=1))
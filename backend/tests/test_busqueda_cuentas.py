@@ -0,0 +1,34 @@
+def test_get_compradores_filtra_y_pagina_en_sql(client):
+    for i, direccion in enumerate(["Calle 50 #10", "Carrera 7", "calle 80_sur", "Avenida 68"]):
+        r = client.post("/compradores/", json={
+            "id_comprador": 820000 + i,
+            "nombre": f"Comprador {i}",
+            "email": f"Busca{i}@Example.com",
+            "password": "secreto123",
+            "direccion": direccion,
+        })
+        assert r.status_code == 201
+
+    r = client.get("/compradores/", params={"email": "busca1@example.COM"})
+    assert [c["id_comprador"] for c in r.json()] == [820001]
+
+    r = client.get("/compradores/", params={"direccion": "CALLE"})
+    assert {c["id_comprador"] for c in r.json()} == {820000, 820002}
+
+    # "_" es literal, no comodín de LIKE
+    r = client.get("/compradores/", params={"direccion": "0_s"})
+    assert [c["id_comprador"] for c in r.json()] == [820002]
+
+    r = client.get("/compradores/", params={"direccion": "calle", "limit": 1, "offset": 1})
+    assert [c["id_comprador"] for c in r.json()] == [820002]
+
+
+def test_get_vendedores_email_case_insensitive(client):
+    client.post("/vendedores/", json={
+        "id_vendedor": 820100,
+        "nombre": "Vendedor Busca",
+        "email": "vbusca@example.com",
+        "password": "secreto123",
+    })
+    r = client.get("/vendedores/", params={"email": "VBusca@Example.com"})
+    assert [v["id_vendedor"] for v in r.json()] == [820100]
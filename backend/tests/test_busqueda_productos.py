@@ -0,0 +1,64 @@
+import pytest
+
+
+@pytest.fixture(scope="module")
+def catalogo(client):
+    client.post("/vendedores/", json={
+        "id_vendedor": 830001,
+        "nombre": "Vendedor Busqueda",
+        "email": "busqueda@example.com",
+        "password": "secreto123",
+    })
+    client.post("/tiendas/", json={
+        "id_vendedor": 830001, "nombre_negocio": "Café Lab", "slug": "cafe-lab",
+    })
+    cat_cafe = client.post("/categorias/", json={"nombre": "Cafés busqueda"}).json()["id"]
+    cat_taza = client.post("/categorias/", json={"nombre": "Tazas busqueda"}).json()["id"]
+
+    def prod(nombre, descripcion, precio, stock, cat, destacado=False):
+        return client.post("/productos/", json={
+            "id_vendedor": 830001, "nombre": nombre, "descripcion": descripcion,
+            "precio": precio, "stock": stock, "category_id": cat, "destacado": destacado,
+        }).json()["id"]
+
+    ids = {
+        "grano": prod("Café en grano Huila", "Tostión media", 30.0, 10, cat_cafe, True),
+        "molido": prod("Café molido", "Ideal para prensa", 20.0, 0, cat_cafe),
+        "taza": prod("Taza cerámica", "Perfecta para café", 15.0, 4, cat_taza),
+    }
+    return {"cat_cafe": cat_cafe, "cat_taza": cat_taza, **ids}
+
+
+def test_search_texto_ranking_y_facetas(client, catalogo):
+    r = client.get("/productos/search", params={"q": "cafe", "tienda": "cafe-lab"})
+    assert r.status_code == 200
+    body = r.json()
+    assert body["total"] == 3
+    # nombre pesa más que descripción: la taza (solo descripción) va última
+    assert body["items"][-1]["id"] == catalogo["taza"]
+    facetas = {f["category_id"]: f["total"] for f in body["facetas"]}
+    assert facetas == {catalogo["cat_cafe"]: 2, catalogo["cat_taza"]: 1}
+
+
+def test_search_filtros(client, catalogo):
+    r = client.get("/productos/search", params={
+        "q": "café", "tienda": "cafe-lab", "en_stock": True, "precio_max": 25,
+    })
+    assert [p["id"] for p in r.json()["items"]] == [catalogo["taza"]]
+
+    r = client.get("/productos/search", params={"tienda": "cafe-lab", "destacado": True})
+    assert [p["id"] for p in r.json()["items"]] == [catalogo["grano"]]
+
+    r = client.get("/productos/search", params={
+        "tienda": "cafe-lab", "category_id": catalogo["cat_cafe"],
+    })
+    body = r.json()
+    assert {p["id"] for p in body["items"]} == {catalogo["grano"], catalogo["molido"]}
+    # las facetas ignoran el filtro de categoría
+    assert {f["category_id"] for f in body["facetas"]} == {catalogo["cat_cafe"], catalogo["cat_taza"]}
+
+
+def test_search_ve_productos_actualizados(client, catalogo):
+    client.put(f"/productos/{catalogo['molido']}", json={"nombre": "Espresso molido"})
+    r = client.get("/productos/search", params={"q": "espresso"})
+    assert [p["id"] for p in r.json()["items"]] == [catalogo["molido"]]
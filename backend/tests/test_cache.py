@@ -0,0 +1,155 @@
+import threading
+import time
+
+from backend.core.cache import Cache, CacheArchivo, CacheLRU, cache
+
+
+def test_lru_expulsa_el_menos_usado():
+    c = CacheLRU(max_entries=2, ttl=60)
+    c.guardar("a", 1)
+    c.guardar("b", 2)
+    assert c.obtener("a") == 1  # "a" pasa a ser el más reciente
+    c.guardar("c", 3)
+    assert c.obtener("b") is None
+    assert c.obtener("a") == 1 and c.obtener("c") == 3
+    assert c.estadisticas()["evictions"] == 1
+
+
+def test_ttl_expira():
+    c = CacheLRU(max_entries=10, ttl=0.01)
+    c.guardar("k", "v")
+    time.sleep(0.02)
+    assert c.obtener("k") is None
+
+
+def test_invalidar_prefijo():
+    c = CacheLRU()
+    c.guardar("categorias:50:0:", [1])
+    c.guardar("tienda:x", {})
+    c.invalidar_prefijo("categorias:")
+    assert c.obtener("categorias:50:0:") is None
+    assert c.obtener("tienda:x") == {}
+
+
+def test_tienda_cacheada_e_invalidada_al_actualizar(client):
+    client.post("/vendedores/", json={
+        "id_vendedor": 840001,
+        "nombre": "Vendedor Cache",
+        "email": "cache@example.com",
+        "password": "secreto123",
+    })
+    client.post("/tiendas/", json={
+        "id_vendedor": 840001, "nombre_negocio": "Antes", "slug": "tienda-cache",
+    })
+
+    assert client.get("/tiendas/tienda-cache").json()["nombre_negocio"] == "Antes"
+    hits = cache.estadisticas()["hits"]
+    assert client.get("/tiendas/tienda-cache").json()["nombre_negocio"] == "Antes"
+    assert cache.estadisticas()["hits"] == hits + 1
+
+    client.put("/tiendas/vendedor/840001", json={"nombre_negocio": "Después"})
+    assert client.get("/tiendas/tienda-cache").json()["nombre_negocio"] == "Después"
+
+
+def test_productos_de_tienda_invalidados_al_crear_producto(client):
+    client.post("/vendedores/", json={
+        "id_vendedor": 840002,
+        "nombre": "Vendedor Cache Dos",
+        "email": "cache2@example.com",
+        "password": "secreto123",
+    })
+    client.post("/tiendas/", json={
+        "id_vendedor": 840002, "nombre_negocio": "Cache Dos", "slug": "tienda-cache-2",
+    })
+    assert client.get("/tiendas/tienda-cache-2/productos").json() == []
+
+    client.post("/productos/", json={
+        "id_vendedor": 840002, "nombre": "Nuevo", "precio": 5, "stock": 1, "destacado": True,
+    })
+    assert [p["nombre"] for p in client.get("/tiendas/tienda-cache-2/productos").json()] == ["Nuevo"]
+    assert "Nuevo" in [p["nombre"] for p in client.get("/productos/destacados").json()]
+    assert client.get("/healthz/cache").status_code == 200
+
+
+def _worker(ruta):
+    """Simula un worker: L1 propio + L2 compartido en el mismo archivo."""
+    return Cache(CacheLRU(ttl=60), compartido=CacheArchivo(str(ruta), ttl=60), intervalo_sync=0)
+
+
+def test_backend_archivo_comparte_valores_entre_workers(tmp_path):
+    ruta = tmp_path / "cache.db"
+    w1, w2 = _worker(ruta), _worker(ruta)
+
+    assert w1.obtener_o_cargar("tienda:x", lambda: {"v": 1}) == {"v": 1}
+    # w2 lo lee del L2 sin ejecutar la carga
+    assert w2.obtener_o_cargar("tienda:x", lambda: {"v": "no"}) == {"v": 1}
+    assert w2.estadisticas()["hits_compartido"] == 1
+
+
+def test_invalidacion_llega_al_l1_de_otro_worker(tmp_path):
+    ruta = tmp_path / "cache.db"
+    w1, w2 = _worker(ruta), _worker(ruta)
+    w1.obtener_o_cargar("tienda_productos:a", lambda: [1])
+    w2.obtener_o_cargar("tienda_productos:a", lambda: [1])  # queda en el L1 de w2
+
+    w1.invalidar_prefijo("tienda_productos:")
+
+    assert w2.obtener_o_cargar("tienda_productos:a", lambda: [2]) == [2]
+    assert w2.estadisticas()["invalidaciones_recibidas"] == 1
+
+
+def test_worker_nuevo_reproduce_mensajes_recientes(tmp_path):
+    ruta = tmp_path / "cache.db"
+    w1 = _worker(ruta)
+    w1.invalidar("sesion_revocada:vendedor:1:123")
+
+    # w2 arranca después: su cursor empieza al final, pero pide la ventana reciente
+    w2, recibidos = _worker(ruta), []
+    w2.suscribir(recibidos.append, reproducir=900)
+    assert recibidos == ["sesion_revocada:vendedor:1:123"]
+    assert w2.compartido.retencion_mensajes == 900
+
+
+def test_single_flight_una_sola_carga_por_clave():
+    c = Cache(CacheLRU(ttl=60))
+    llamadas = []
+    barrera = threading.Barrier(10)
+
+    def cargar():
+        llamadas.append(1)
+        time.sleep(0.05)
+        return "valor"
+
+    def pedir():
+        barrera.wait()
+        assert c.obtener_o_cargar("fria", cargar) == "valor"
+
+    hilos = [threading.Thread(target=pedir) for _ in range(10)]
+    for h in hilos:
+        h.start()
+    for h in hilos:
+        h.join()
+    assert len(llamadas) == 1
+
+
+def test_single_flight_entre_workers(tmp_path):
+    ruta = tmp_path / "cache.db"
+    workers = [_worker(ruta) for _ in range(4)]
+    llamadas = []
+    barrera = threading.Barrier(len(workers))
+
+    def cargar():
+        llamadas.append(1)
+        time.sleep(0.1)
+        return "valor"
+
+    def pedir(w):
+        barrera.wait()
+        assert w.obtener_o_cargar("fria", cargar) == "valor"
+
+    hilos = [threading.Thread(target=pedir, args=(w,)) for w in workers]
+    for h in hilos:
+        h.start()
+    for h in hilos:
+        h.join()
+    assert len(llamadas) == 1
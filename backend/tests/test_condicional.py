@@ -0,0 +1,85 @@
+import pytest
+from sqlalchemy import event
+
+from backend.tests.conftest import engine
+
+
+@pytest.fixture(scope="module")
+def producto(client):
+    client.post("/vendedores/", json={
+        "id_vendedor": 850001,
+        "nombre": "Vendedor Etag",
+        "email": "etag@example.com",
+        "password": "secreto123",
+    })
+    client.post("/tiendas/", json={
+        "id_vendedor": 850001, "nombre_negocio": "Etag", "slug": "tienda-etag",
+    })
+    return client.post("/productos/", json={
+        "id_vendedor": 850001, "nombre": "Lámpara", "precio": 10, "stock": 3,
+    }).json()
+
+
+@pytest.mark.parametrize("url", [
+    "/productos/?id_vendedor=850001",
+    "/productos/{id}",
+    "/tiendas/tienda-etag",
+    "/tiendas/tienda-etag/productos",
+])
+def test_304_con_if_none_match(client, producto, url):
+    url = url.format(id=producto["id"])
+    r = client.get(url)
+    assert r.status_code == 200
+    etag = r.headers["ETag"]
+    assert r.headers["Last-Modified"]
+
+    r = client.get(url, headers={"If-None-Match": etag})
+    assert r.status_code == 304
+    assert r.content == b""
+    assert r.headers["ETag"] == etag
+
+
+def test_etag_cambia_al_actualizar_producto(client, producto):
+    url = f"/productos/{producto['id']}"
+    etag = client.get(url).headers["ETag"]
+    etag_lista = client.get("/tiendas/tienda-etag/productos").headers["ETag"]
+
+    client.put(url, json={"precio": 12})
+
+    r = client.get(url, headers={"If-None-Match": etag})
+    assert r.status_code == 200
+    assert r.json()["precio"] == 12
+    r = client.get("/tiendas/tienda-etag/productos", headers={"If-None-Match": etag_lista})
+    assert r.status_code == 200
+
+
+def test_if_modified_since(client, producto):
+    url = "/productos/?id_vendedor=850001"
+    last_modified = client.get(url).headers["Last-Modified"]
+    assert client.get(url, headers={"If-Modified-Since": last_modified}).status_code == 304
+    assert client.get(url, headers={"If-Modified-Since": "Mon, 01 Jan 2001 00:00:00 GMT"}).status_code == 200
+
+
+def test_etag_distinto_por_pagina(client, producto):
+    a = client.get("/productos/", params={"limit": 1, "offset": 0}).headers["ETag"]
+    b = client.get("/productos/", params={"limit": 1, "offset": 1}).headers["ETag"]
+    assert a != b
+
+
+def test_validadores_de_coleccion_cacheados_hasta_un_cambio(client, producto):
+    url = "/productos/?id_vendedor=850001"
+    etag = client.get(url).headers["ETag"]
+
+    consultas = []
+    contar = lambda conn, cursor, sql, *a: consultas.append(sql)
+    event.listen(engine, "before_cursor_execute", contar)
+    try:
+        assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+    finally:
+        event.remove(engine, "before_cursor_execute", contar)
+    assert not [sql for sql in consultas if "count(" in sql.lower()]
+
+    client.put(f"/productos/{producto['id']}", json={"stock": 7})
+    r = client.get(url, headers={"If-None-Match": etag})
+    assert r.status_code == 200
+    assert r.json()[0]["stock"] == 7
@@ -0,0 +1,101 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from sqlmodel import Session, select
+
+from backend.core import contrasenas
+from backend.Modelos.Administrador import Administrador
+from backend.Modelos.Comprador import Comprador
+from backend.Modelos.Vendedor import Vendedor
+from backend.tests.conftest import engine
+
+
+def test_hash_y_comprobacion():
+    h = contrasenas.calcular_hash("secreto123")
+    assert h.startswith("scrypt$") and "secreto123" not in h
+    assert h != contrasenas.calcular_hash("secreto123")  # salt aleatorio
+    assert contrasenas.comprobar("secreto123", h) == (True, False)
+    assert contrasenas.comprobar("otra", h) == (False, False)
+    # Texto plano heredado: valida y pide rehacer
+    assert contrasenas.comprobar("secreto123", "secreto123") == (True, True)
+    assert contrasenas.comprobar("x", None) == (False, False)
+
+
+def test_costo_distinto_pide_rehacer(monkeypatch):
+    h = contrasenas.calcular_hash("secreto123")
+    monkeypatch.setattr(contrasenas, "LOG_N", contrasenas.LOG_N + 1)
+    assert contrasenas.comprobar("secreto123", h) == (True, True)
+
+
+def test_vendedor_se_guarda_hasheado_y_hace_login(client):
+    r = client.post("/vendedores/", json={
+        "id_vendedor": 950101,
+        "nombre": "Vendedor Hash",
+        "email": "hash@example.com",
+        "password": "secreto123",
+    })
+    assert r.status_code == 201
+    with Session(engine) as s:
+        guardado = s.exec(select(Vendedor.password).where(Vendedor.id_vendedor == 950101)).one()
+    assert contrasenas.es_hash(guardado)
+
+    r = client.post("/vendedores/login", json={"email": "hash@example.com", "password": "secreto123"})
+    assert r.status_code == 200
+    assert "password" not in r.json()
+    r = client.post("/vendedores/login", json={"email": "hash@example.com", "password": "incorrecta"})
+    assert r.status_code == 401
+    r = client.post("/vendedores/login", json={"email": "nadie@example.com", "password": "secreto123"})
+    assert r.status_code == 401
+
+
+def test_admin_se_guarda_hasheado_y_hace_login(client):
+    r = client.post("/administradores/", json={
+        "id_admin": 950103, "nombre": "Admin Hash", "email": "admin.hash@example.com",
+        "password": "secreto123", "nivel_acceso": "total",
+    })
+    assert r.status_code == 200
+    with Session(engine) as s:
+        guardado = s.exec(select(Administrador.password).where(Administrador.id_admin == 950103)).one()
+    assert contrasenas.es_hash(guardado)
+
+    credenciales = {"email": "admin.hash@example.com", "password": "secreto123"}
+    assert client.post("/administradores/login", json=credenciales).status_code == 200
+    r = client.post("/administradores/login", json={**credenciales, "password": "incorrecta"})
+    assert r.status_code == 401
+
+    client.patch("/administradores/950103/estado", json={"estado_cuenta": "bloqueado"}).raise_for_status()
+    assert client.post("/administradores/login", json=credenciales).status_code == 403
+
+
+def test_login_rehace_texto_plano_heredado(client):
+    with Session(engine) as s:
+        s.add(Comprador(id_comprador=950102, nombre="Legado", email="legado@example.com", password="viejo123"))
+        s.commit()
+
+    r = client.post("/compradores/login", json={"email": "legado@example.com", "password": "viejo123"})
+    assert r.status_code == 200
+    with Session(engine) as s:
+        guardado = s.exec(select(Comprador.password).where(Comprador.id_comprador == 950102)).one()
+    assert contrasenas.es_hash(guardado)
+    assert contrasenas.comprobar("viejo123", guardado) == (True, False)
+
+    # Sigue entrando con la misma contraseña, ahora contra el hash
+    r = client.post("/compradores/login", json={"email": "legado@example.com", "password": "viejo123"})
+    assert r.status_code == 200
+
+
+def test_pool_saturado_responde_503(client, monkeypatch):
+    monkeypatch.setattr(contrasenas, "_cupos", contrasenas.threading.BoundedSemaphore(1))
+    contrasenas._cupos.acquire()
+    try:
+        with pytest.raises(HTTPException) as e:
+            asyncio.run(contrasenas.verificar_async("x", "x"))
+        assert e.value.status_code == 503
+        # Las altas usan el mismo cupo: no se encolan sin límite
+        r = client.post("/compradores/", json={
+            "id_comprador": 950104, "nombre": "Ráfaga", "email": "rafaga@example.com", "password": "secreto123",
+        })
+        assert r.status_code == 503
+    finally:
+        contrasenas._cupos.release()
@@ -0,0 +1,120 @@
+import csv
+import gzip
+import io
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+
+@pytest.fixture(scope="module")
+def admin(client):
+    client.post("/administradores/", json={
+        "id_admin": 950005, "nombre": "Admin Export", "email": "admin.export@example.com",
+        "password": "secreto123", "nivel_acceso": "total",
+    })
+    r = client.post("/administradores/login", json={"email": "admin.export@example.com", "password": "secreto123"})
+    return {"Authorization": f"Bearer {r.json()['token']}"}
+
+
+def _lineas(r):
+    return [json.loads(l) for l in r.content.decode().splitlines() if l]
+
+
+def test_exportar_productos_ndjson_csv_y_gzip(client, admin):
+    client.post("/vendedores/", json={
+        "id_vendedor": 950001,
+        "nombre": "Vendedor Export",
+        "email": "export@example.com",
+        "password": "secreto123",
+    })
+    for i in range(3):
+        client.post("/productos/", json={
+            "nombre": f"Export {i}", "precio": 1.5 + i, "stock": 5, "id_vendedor": 950001,
+        })
+
+    r = client.get("/admin/export/productos", headers=admin)
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("application/x-ndjson")
+    filas = [f for f in _lineas(r) if f["nombre"].startswith("Export ")]
+    assert [f["nombre"] for f in filas] == ["Export 0", "Export 1", "Export 2"]
+    assert "password" not in filas[0]
+
+    r = client.get("/admin/export/productos", params={"formato": "csv"}, headers=admin)
+    assert r.status_code == 200
+    lector = csv.DictReader(io.StringIO(r.text))
+    assert lector.fieldnames[:3] == ["id", "vendedor_id", "nombre"]
+    assert sum(1 for f in lector if f["nombre"].startswith("Export ")) == 3
+
+    r = client.get("/admin/export/productos", params={"gzip": True}, headers=admin)
+    assert r.status_code == 200
+    assert r.headers["content-type"] == "application/gzip"
+    assert 'productos.ndjson.gz' in r.headers["content-disposition"]
+    # El cliente de pruebas no descomprime: el cuerpo es gzip como tal
+    texto = gzip.decompress(r.content).decode()
+    assert texto.count('"Export ') == 3
+
+
+def test_exportar_compradores_sin_password(client, admin):
+    client.post("/compradores/", json={
+        "id_comprador": 950002,
+        "nombre": "Comprador Export",
+        "email": "comprador.export@example.com",
+        "password": "secreto123",
+    })
+    filas = _lineas(client.get("/admin/export/compradores", headers=admin))
+    fila = next(f for f in filas if f["id_comprador"] == 950002)
+    assert "password" not in fila
+
+
+def test_exportar_incremental_y_pedidos_con_items(client, admin):
+    client.post("/vendedores/", json={
+        "id_vendedor": 950003,
+        "nombre": "Vendedor Export Pedidos",
+        "email": "export.pedidos@example.com",
+        "password": "secreto123",
+    })
+    producto_id = client.post("/productos/", json={
+        "nombre": "Taza Export", "precio": 4.0, "stock": 10, "id_vendedor": 950003,
+    }).json()["id"]
+
+    desde = (datetime.utcnow() - timedelta(seconds=1)).isoformat()
+    r = client.post("/pedidos/", json={
+        "comprador_id": 950004,
+        "nombre_cliente": "Eva",
+        "email_cliente": "eva@example.com",
+        "direccion": "Calle 9",
+        "metodo_pago": "contra_entrega",
+        "items": [{"producto_id": producto_id, "cantidad": 2}],
+    })
+    assert r.status_code == 200
+    pedido_id = r.json()["id"]
+
+    filas = _lineas(client.get("/admin/export/pedidos", params={"updated_since": desde}, headers=admin))
+    assert [f["id"] for f in filas] == [pedido_id]
+    assert filas[0]["items"] == [
+        {"producto_id": producto_id, "nombre": "Taza Export", "precio": 4.0, "cantidad": 2},
+    ]
+
+    futuro = (datetime.utcnow() + timedelta(hours=1)).isoformat()
+    assert _lineas(client.get("/admin/export/pedidos", params={"updated_since": futuro}, headers=admin)) == []
+
+    r = client.get("/admin/export/pedidos", params={"formato": "csv", "updated_since": desde}, headers=admin)
+    fila = next(csv.DictReader(io.StringIO(r.text)))
+    assert json.loads(fila["items"])[0]["cantidad"] == 2
+
+
+def test_exportar_entidad_desconocida(client, admin):
+    assert client.get("/admin/export/vendedores", headers=admin).status_code == 422
+
+
+def test_exportar_exige_token_de_admin(client, admin):
+    assert client.get("/admin/export/compradores").status_code == 401
+    client.post("/vendedores/", json={
+        "id_vendedor": 950006, "nombre": "Vendedor No Admin", "email": "no.admin@example.com",
+        "password": "secreto123",
+    })
+    r = client.post("/vendedores/login", json={"email": "no.admin@example.com", "password": "secreto123"})
+    vendedor = {"Authorization": f"Bearer {r.json()['token']}"}
+    assert client.get("/admin/export/compradores", headers=vendedor).status_code == 403
+    assert client.get("/admin/export/compradores", headers=admin).status_code == 200
@@ -0,0 +1,50 @@
+import pytest
+
+
+@pytest.fixture(scope="module", autouse=True)
+def vendedor(client):
+    client.post("/vendedores/", json={
+        "id_vendedor": 900001,
+        "nombre": "Vendedor Idem",
+        "email": "idem@example.com",
+        "password": "secreto123",
+    })
+
+
+def _producto(nombre="Taza idem"):
+    return {"nombre": nombre, "precio": 4.5, "stock": 3, "id_vendedor": 900001}
+
+
+def _cuantos(client, nombre):
+    productos = client.get("/productos/", params={"id_vendedor": 900001, "limit": 200}).json()
+    return sum(p["nombre"] == nombre for p in productos)
+
+
+def test_reintento_repite_respuesta_sin_duplicar(client):
+    h = {"Idempotency-Key": "prod-1"}
+    r1 = client.post("/productos/", json=_producto(), headers=h)
+    r2 = client.post("/productos/", json=_producto(), headers=h)
+    assert (r1.status_code, r2.status_code) == (201, 201)
+    assert r1.json() == r2.json()
+    assert r2.headers["Idempotent-Replayed"] == "true"
+    assert _cuantos(client, "Taza idem") == 1
+
+
+def test_misma_clave_otro_cuerpo(client):
+    h = {"Idempotency-Key": "prod-2"}
+    assert client.post("/productos/", json=_producto("Plato idem"), headers=h).status_code == 201
+    assert client.post("/productos/", json=_producto("Vaso idem"), headers=h).status_code == 422
+
+
+def test_error_no_queda_guardado(client):
+    h = {"Idempotency-Key": "pedido-1"}
+    pedido = {
+        "comprador_id": 9001, "nombre_cliente": "Ana", "email_cliente": "ana@example.com",
+        "direccion": "Calle 1", "metodo_pago": "tarjeta",
+        "items": [{"producto_id": 987654, "cantidad": 1}],
+    }
+    assert client.post("/pedidos/", json=pedido, headers=h).status_code == 400
+    # El fallo liberó la clave: el reintento se ejecuta (y vuelve a fallar), no se repite
+    r = client.post("/pedidos/", json=pedido, headers=h)
+    assert r.status_code == 400
+    assert "Idempotent-Replayed" not in r.headers
@@ -0,0 +1,79 @@
+import time
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from backend.core.identidad import MapaBidireccional, mapa_vendedores
+from backend.tests.conftest import engine
+
+
+@contextmanager
+def contar_consultas():
+    sentencias = []
+
+    def registrar(conn, cursor, statement, *args):
+        sentencias.append(statement)
+
+    event.listen(engine, "before_cursor_execute", registrar)
+    try:
+        yield sentencias
+    finally:
+        event.remove(engine, "before_cursor_execute", registrar)
+
+
+def _vendedor(client, id_vendedor, email):
+    return client.post("/vendedores/", json={
+        "id_vendedor": id_vendedor, "nombre": "Vendedor Mapa", "email": email, "password": "secreto123",
+    }).json()
+
+
+def test_resolver_usa_el_mapa(client):
+    v = _vendedor(client, 920001, "mapa1@example.com")
+    mapa_vendedores.limpiar()
+
+    producto = {"nombre": "Mapa", "precio": 1, "stock": 1, "id_vendedor": 920001}
+    client.post("/productos/", json=producto)
+    assert mapa_vendedores.pk(920001) == v["id"]
+    assert mapa_vendedores.manual(v["id"]) == 920001
+
+    with contar_consultas() as sentencias:
+        client.post("/productos/", json=producto)
+    assert not any("FROM vendedores" in s for s in sentencias)
+
+
+def test_baja_y_estado_invalidan(client):
+    v = _vendedor(client, 920002, "mapa2@example.com")
+    client.get("/productos/", params={"id_vendedor": 920002})
+    assert mapa_vendedores.pk(920002) == v["id"]
+
+    assert client.delete("/vendedores/920002").status_code == 204
+    assert mapa_vendedores.pk(920002) is None
+
+    client.get("/productos/", params={"id_vendedor": 920002})
+    assert mapa_vendedores.pk(920002) == v["id"]
+    client.put("/vendedores/920002/estado", json={"estado_cuenta": "activo"})
+    assert mapa_vendedores.pk(920002) is None
+
+
+def test_entradas_del_mapa_vencen():
+    mapa = MapaBidireccional(ttl=0.05)
+    mapa.guardar(1, 10)
+    assert mapa.pk(1) == 10 and mapa.manual(10) == 1
+    time.sleep(0.06)
+    # Otro worker reasignó el id manual y el mensaje nunca llegó: igual se vuelve a la BD
+    assert mapa.pk(1) is None and mapa.manual(10) is None
+    assert mapa.estadisticas()["entradas"] == 0
+
+
+def test_tienda_y_productos_por_vendedor_con_join(client):
+    _vendedor(client, 920004, "mapa4@example.com")
+    assert client.get("/tiendas/vendedor/920004").json()["detail"] == "El vendedor no tiene tienda."
+    assert client.get("/tiendas/vendedor/929999").json()["detail"] == "Vendedor no encontrado"
+    assert client.get("/vendedores/920004/productos").json() == []
+    assert client.get("/vendedores/929999/productos").status_code == 404
+
+    client.post("/tiendas/", json={"id_vendedor": 920004, "nombre_negocio": "Mapa", "slug": "mapa-920004"})
+    with contar_consultas() as sentencias:
+        r = client.get("/tiendas/vendedor/920004")
+    assert r.json()["slug"] == "mapa-920004"
+    assert len(sentencias) == 1
@@ -0,0 +1,105 @@
+import json
+
+import pytest
+
+
+@pytest.fixture(scope="module", autouse=True)
+def vendedor(client):
+    client.post("/vendedores/", json={
+        "id_vendedor": 870001,
+        "nombre": "Vendedor Bulk",
+        "email": "bulk@example.com",
+        "password": "secreto123",
+    })
+
+
+def _productos(client):
+    return client.get("/productos/", params={"id_vendedor": 870001, "limit": 200}).json()
+
+
+def test_bulk_csv_con_errores_por_fila(client):
+    csv = (
+        "nombre,precio,stock,external_id,source,destacado\n"
+        "Silla,10.5,3,SKU-1,erp,si\n"
+        ",5,1,SKU-2,erp,\n"
+        "Mesa,abc,1,SKU-3,erp,\n"
+        "Lámpara,7,2,SKU-4,erp,no\n"
+    )
+    r = client.post(
+        "/productos/bulk", params={"id_vendedor": 870001},
+        content=csv.encode(), headers={"Content-Type": "text/csv"},
+    )
+    assert r.status_code == 200
+    body = r.json()
+    assert (body["filas"], body["escritas"], body["total_errores"]) == (4, 2, 2)
+    assert [e["fila"] for e in body["errores"]] == [3, 4]
+    nombres = {p["nombre"]: p for p in _productos(client)}
+    assert nombres["Silla"]["destacado"] is True
+
+
+def test_bulk_reimportar_actualiza_sin_duplicar(client):
+    jsonl = "\n".join(json.dumps(d) for d in [
+        {"id_vendedor": 870001, "nombre": "Silla", "precio": 12, "stock": 9, "external_id": "SKU-1", "source": "erp"},
+        {"id_vendedor": 870001, "nombre": "Silla v2", "precio": 13, "stock": 8, "external_id": "SKU-1", "source": "erp"},
+        {"id_vendedor": 999999, "nombre": "Huérfano", "precio": 1, "stock": 1},
+    ]) + "\n{no es json\n"
+    r = client.post("/productos/bulk", content=jsonl.encode(), headers={"Content-Type": "application/x-ndjson"})
+    body = r.json()
+    assert body["escritas"] == 1
+    assert {e["error"].split(":")[0] for e in body["errores"]} == {"Vendedor (id_vendedor) no existe", "JSON inválido"}
+
+    silla = [p for p in _productos(client) if p["external_id"] == "SKU-1"]
+    assert len(silla) == 1
+    assert (silla[0]["nombre"], silla[0]["precio"], silla[0]["stock"]) == ("Silla v2", 13, 8)
+
+
+def test_bulk_sin_formato(client):
+    r = client.post("/productos/bulk", content=b"x", headers={"Content-Type": "text/plain"})
+    assert r.status_code == 415
+
+
+def test_bulk_sin_source_reimporta_sin_duplicar(client):
+    csv = "nombre,precio,stock,external_id\nBanco,10,3,SKU-9\n"
+    for stock in (3, 5):
+        r = client.post(
+            "/productos/bulk", params={"id_vendedor": 870001},
+            content=csv.replace(",3,", f",{stock},").encode(), headers={"Content-Type": "text/csv"},
+        )
+        assert r.json()["escritas"] == 1
+    banco = [p for p in _productos(client) if p["external_id"] == "SKU-9"]
+    assert len(banco) == 1 and banco[0]["stock"] == 5
+
+
+def test_bulk_errores_de_archivo_y_rango_no_son_500(client):
+    csv = "nombre,precio,stock,external_id\nEstante,1,99999999999,SKU-10\nCaja,1,1,SKU-11\n"
+    r = client.post(
+        "/productos/bulk", params={"id_vendedor": 870001},
+        content=csv.encode(), headers={"Content-Type": "text/csv"},
+    )
+    assert r.status_code == 200
+    assert (r.json()["escritas"], [e["fila"] for e in r.json()["errores"]]) == (1, [2])
+
+    latin1 = "nombre,precio,stock\nCañón,1,1\n".encode("latin-1")
+    r = client.post(
+        "/productos/bulk", params={"id_vendedor": 870001},
+        content=latin1, headers={"Content-Type": "text/csv"},
+    )
+    assert r.status_code == 200
+    body = r.json()
+    assert body["escritas"] == 0 and "UTF-8" in body["errores"][0]["error"]
+
+
+def test_bulk_tipos_invalidos_son_errores_por_fila(client):
+    filas = [
+        {"nombre": "x", "precio": 1, "stock": 1, "id_vendedor": [1]},
+        {"nombre": "y", "precio": 1, "stock": 1, "id_vendedor": 870001, "category_id": {"a": 1}},
+        {"nombre": "z", "precio": "inf", "stock": 1, "id_vendedor": 870001},
+        {"nombre": "w", "precio": "nan", "stock": 1, "id_vendedor": 870001},
+        {"nombre": "Válido", "precio": 2, "stock": 1, "id_vendedor": 870001, "external_id": "SKU-12"},
+    ]
+    jsonl = "\n".join(json.dumps(f) for f in filas)
+    r = client.post("/productos/bulk", content=jsonl.encode(), headers={"Content-Type": "application/x-ndjson"})
+    assert r.status_code == 200
+    body = r.json()
+    assert body["escritas"] == 1
+    assert [e["fila"] for e in body["errores"]] == [1, 2, 3, 4]
@@ -0,0 +1,56 @@
+import pytest
+
+
+@pytest.fixture(scope="module")
+def ids(client):
+    client.post("/vendedores/", json={
+        "id_vendedor": 880001,
+        "nombre": "Vendedor Lote",
+        "email": "lote@example.com",
+        "password": "secreto123",
+    })
+    creados = []
+    for i in range(5):
+        r = client.post("/productos/", json={
+            "nombre": f"Lote {i}", "precio": 10 + i, "stock": 5, "id_vendedor": 880001,
+        })
+        creados.append(r.json()["id"])
+    return creados
+
+
+def test_patch_batch_codigos_por_item(client, ids):
+    a, b, c = ids[:3]
+    r = client.patch("/productos/batch", json={"items": [
+        {"id": a, "precio": 99.5},
+        {"id": b, "precio": 88, "stock": 0},
+        {"id": c, "stock": -1},
+        {"id": a, "precio": 1},
+        {"id": 987654, "precio": 1},
+        {"id": c, "category_id": 987654},
+    ]})
+    assert r.status_code == 200
+    body = r.json()
+    assert [x["status"] for x in body["resultados"]] == [200, 200, 422, 409, 404, 409]
+    assert (body["aplicados"], body["errores"]) == (2, 4)
+
+    pa = client.get(f"/productos/{a}").json()
+    pb = client.get(f"/productos/{b}").json()
+    pc = client.get(f"/productos/{c}").json()
+    assert (pa["precio"], pa["stock"]) == (99.5, 5)
+    assert (pb["precio"], pb["stock"]) == (88, 0)
+    assert pc["stock"] == 5
+
+
+def test_patch_batch_categoria_y_vendedor_inexistentes(client, ids):
+    r = client.patch("/productos/batch", json={"items": [
+        {"id": ids[3], "category_id": 987654},
+        {"id": ids[4], "id_vendedor": 987654},
+    ]})
+    assert [x["status"] for x in r.json()["resultados"]] == [400, 400]
+
+
+def test_delete_batch(client, ids):
+    r = client.request("DELETE", "/productos/batch", json={"ids": [ids[3], ids[4], ids[4], 987654]})
+    assert r.status_code == 200
+    assert [x["status"] for x in r.json()["resultados"]] == [204, 204, 409, 404]
+    assert client.get(f"/productos/{ids[3]}").status_code == 404
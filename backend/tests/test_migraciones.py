@@ -0,0 +1,121 @@
+import json
+
+from sqlalchemy import event, inspect
+from sqlmodel import Session, create_engine
+
+from backend.cli import migrar
+from backend.db import migraciones
+from backend.Modelos import Pedido
+
+
+def _engine(tmp_path):
+    return create_engine(f"sqlite:///{tmp_path / 'migraciones.db'}")
+
+
+def _contar(engine):
+    sentencias = []
+    event.listen(engine, "before_cursor_execute", lambda c, cur, sql, *a: sentencias.append(sql))
+    return sentencias
+
+
+def test_migra_desde_cero_y_luego_no_hace_ddl(tmp_path):
+    engine = _engine(tmp_path)
+    assert migraciones.preparar_esquema(engine) == "migrado"
+    tablas = inspect(engine).get_table_names()
+    assert {"productos", "pedidos", migraciones.TABLA} <= set(tablas)
+    info = migraciones.estado(engine)
+    assert info["al_dia"] and info["pendientes"] == []
+
+    sentencias = _contar(engine)
+    assert migraciones.preparar_esquema(engine) == "al_dia"
+    assert len(sentencias) == 1 and sentencias[0].lstrip().upper().startswith("SELECT")
+
+
+def test_huella_distinta_avisa_sin_marcar_al_dia(tmp_path, monkeypatch, caplog):
+    engine = _engine(tmp_path)
+    migraciones.aplicar_pendientes(engine)
+
+    monkeypatch.setattr(migraciones, "huella_esquema", lambda: "0" * 64)
+    assert not migraciones.estado(engine)["al_dia"]
+    assert migraciones.aplicar_pendientes(engine) == []
+    assert "sin una migración nueva" in caplog.text
+    # La huella no se registra: sigue desactualizado hasta que haya migración
+    assert migraciones.preparar_esquema(engine) == "desactualizado"
+    assert not migraciones.estado(engine)["al_dia"]
+
+
+def test_indice_fallido_no_registra_la_migracion(tmp_path, monkeypatch):
+    engine = _engine(tmp_path)
+    fallidos = [["ix_falla"]]
+    ultima = migraciones.MIGRACIONES[-1]
+    monkeypatch.setattr(migraciones, "MIGRACIONES", migraciones.MIGRACIONES[:-1] + [
+        migraciones.Migracion(ultima.version, ultima.nombre, lambda conn: fallidos.pop(), transaccional=False),
+    ])
+
+    # El arranque no se cae: avisa y deja la versión anterior registrada
+    assert migraciones.preparar_esquema(engine) == "incompleto"
+    assert migraciones.estado(engine)["pendientes"] == [f"{ultima.version}:{ultima.nombre}"]
+
+    # Próximo arranque: se reintenta y, si todo se crea, queda al día
+    fallidos.append([])
+    assert migraciones.preparar_esquema(engine) == "migrado"
+    assert migraciones.estado(engine)["al_dia"]
+
+
+def test_sin_migrar_al_arrancar_solo_avisa(tmp_path, monkeypatch):
+    engine = _engine(tmp_path)
+    monkeypatch.setenv("MIGRATIONS_ON_STARTUP", "0")
+    assert migraciones.preparar_esquema(engine) == "pendiente"
+    assert inspect(engine).get_table_names() == []
+
+
+def test_cli_estado_y_aplicar_hasta(tmp_path, capsys):
+    url = f"sqlite:///{tmp_path / 'cli.db'}"
+    assert migrar.main(["estado", "--url", url]) == 1
+    assert json.loads(capsys.readouterr().out)["version_bd"] == 0
+
+    assert migrar.main(["aplicar", "--hasta", "1", "--url", url]) == 0
+    salida = json.loads(capsys.readouterr().out)
+    assert salida["aplicadas"] == ["1:esquema_base"] and salida["version_bd"] == 1
+
+    assert migrar.main(["aplicar", "--url", url]) == 0
+    assert migrar.main(["estado", "--url", url]) == 0
+
+
+def test_pedidos_con_items_json_se_normalizan(tmp_path):
+    engine = _engine(tmp_path)
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            "CREATE TABLE pedidos (id INTEGER PRIMARY KEY, nombre_cliente VARCHAR NOT NULL,"
+            " email_cliente VARCHAR NOT NULL, direccion VARCHAR NOT NULL, telefono VARCHAR NOT NULL,"
+            " metodo_pago VARCHAR NOT NULL, total FLOAT NOT NULL, estado VARCHAR NOT NULL,"
+            " items_json VARCHAR NOT NULL, created_at DATETIME NOT NULL)"
+        )
+        items = json.dumps([{"producto_id": 7, "nombre": "Silla", "precio": 10.0, "cantidad": 2}])
+        conn.exec_driver_sql(
+            "INSERT INTO pedidos VALUES (1, 'Ana', 'ana@ejemplo.com', 'Calle 1', '555', 'efectivo',"
+            " 20.0, 'pendiente', ?, '2025-01-01 10:00:00')", (items,)
+        )
+        conn.exec_driver_sql(
+            "INSERT INTO pedidos VALUES (2, 'Luis', 'luis@ejemplo.com', 'Calle 2', '556', 'efectivo',"
+            " 5.0, 'pendiente', 'no es json', '2025-01-02 10:00:00')"
+        )
+
+    migraciones.aplicar_pendientes(engine)
+
+    columnas = {c["name"] for c in inspect(engine).get_columns("pedidos")}
+    assert "items_json" not in columnas and {"comprador_id", "updated_at"} <= columnas
+    indices = {i["name"] for i in inspect(engine).get_indexes("pedidos")}
+    assert "ix_pedidos_comprador_created" in indices
+    with engine.connect() as conn:
+        lineas = conn.exec_driver_sql(
+            "SELECT pedido_id, producto_id, nombre, precio, cantidad FROM pedido_items"
+        ).all()
+        assert [tuple(l) for l in lineas] == [(1, 7, "Silla", 10.0, 2)]
+        assert conn.exec_driver_sql("SELECT updated_at FROM pedidos WHERE id = 1").scalar().startswith("2025-01-01")
+
+    # El modelo actual puede insertar en la tabla migrada
+    with Session(engine) as s:
+        s.add(Pedido(nombre_cliente="Eva", email_cliente="eva@ejemplo.com", direccion="Calle 3",
+                     telefono="557", metodo_pago="efectivo", total=1.0, comprador_id=1))
+        s.commit()
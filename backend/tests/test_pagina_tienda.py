@@ -0,0 +1,58 @@
+import pytest
+from sqlalchemy import event
+
+from backend.core.cache import cache
+from backend.tests.conftest import engine
+
+
+@pytest.fixture(scope="module")
+def tienda(client):
+    client.post("/vendedores/", json={
+        "id_vendedor": 930001, "nombre": "Vendedor Pagina", "email": "pagina@example.com", "password": "secreto123",
+    })
+    cat = client.post("/categorias/", json={"nombre": "Pagina Cat"}).json()["id"]
+    for i in range(5):
+        client.post("/productos/", json={
+            "nombre": f"Pag {i}", "precio": 10 - i, "stock": 1, "id_vendedor": 930001,
+            "category_id": cat if i < 3 else None, "destacado": i == 4,
+        })
+    client.post("/tiendas/", json={"id_vendedor": 930001, "nombre_negocio": "Pagina", "slug": "pagina-930001"})
+    return {"slug": "pagina-930001", "cat": cat}
+
+
+def test_pagina_completa(client, tienda):
+    r = client.get(f"/tiendas/{tienda['slug']}/pagina", params={"limit": 2, "orden": "precio_asc"})
+    assert r.status_code == 200
+    body = r.json()
+    assert body["tienda"]["vendedor_id_manual"] == 930001
+    assert body["total"] == 5
+    assert [p["precio"] for p in body["productos"]] == [6, 7]
+    assert [p["nombre"] for p in body["destacados"]] == ["Pag 4"]
+    assert {(c["id"], c["total"]) for c in body["categorias"]} == {(tienda["cat"], 3), (None, 2)}
+
+    r = client.get(f"/tiendas/{tienda['slug']}/pagina", params={"category_id": tienda["cat"], "offset": 10})
+    assert (r.json()["total"], r.json()["productos"]) == (3, [])
+
+    assert client.get("/tiendas/no-existe/pagina").status_code == 404
+
+
+def test_pagina_consultas_fijas_y_etag(client, tienda):
+    cache.limpiar()
+    sentencias = []
+
+    def registrar(conn, cursor, statement, *args):
+        sentencias.append(statement)
+
+    event.listen(engine, "before_cursor_execute", registrar)
+    try:
+        r = client.get(f"/tiendas/{tienda['slug']}/pagina")
+    finally:
+        event.remove(engine, "before_cursor_execute", registrar)
+    assert len(sentencias) == 4
+
+    r2 = client.get(f"/tiendas/{tienda['slug']}/pagina", headers={"If-None-Match": r.headers["ETag"]})
+    assert r2.status_code == 304
+
+    client.post("/productos/", json={"nombre": "Nuevo", "precio": 1, "stock": 1, "id_vendedor": 930001})
+    r3 = client.get(f"/tiendas/{tienda['slug']}/pagina")
+    assert r3.json()["total"] == 6
@@ -0,0 +1,47 @@
+def _recorrer(client, url, **params):
+    vistos, cursor = [], ""
+    while cursor is not None:
+        r = client.get(url, params={**params, "cursor": cursor})
+        assert r.status_code == 200
+        vistos.extend(x["id"] for x in r.json())
+        cursor = r.headers.get("X-Next-Cursor")
+    return vistos
+
+
+def test_cursor_productos_recorre_todo_sin_repetir(client):
+    r = client.post("/vendedores/", json={
+        "id_vendedor": 910001,
+        "nombre": "Vendedor Cursor",
+        "email": "cursor@example.com",
+        "password": "secreto123",
+    })
+    assert r.status_code == 201
+    creados = [
+        client.post("/productos/", json={
+            "id_vendedor": 910001, "nombre": f"P{i}", "precio": 1.0 + i, "stock": 5,
+        }).json()["id"]
+        for i in range(7)
+    ]
+
+    vistos = _recorrer(client, "/productos/", id_vendedor=910001, limit=3)
+    assert vistos == creados
+
+
+def test_cursor_categorias_con_filtro(client):
+    for nombre in ["Hogar", "Hogar y jardín", "Deportes", "Juegos de hogar"]:
+        client.post("/categorias/", json={"nombre": nombre})
+
+    vistos = _recorrer(client, "/categorias/", q="HOGAR", limit=2)
+    assert len(vistos) == 3
+    assert vistos == sorted(vistos)
+
+
+def test_cursor_invalido(client):
+    r = client.get("/tiendas/", params={"cursor": "no-es-un-cursor"})
+    assert r.status_code == 400
+
+
+def test_modo_offset_sigue_igual(client):
+    r = client.get("/administradores/", params={"limit": 5, "offset": 0})
+    assert r.status_code == 200
+    assert "X-Next-Cursor" not in r.headers
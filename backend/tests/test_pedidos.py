@@ -0,0 +1,211 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlmodel import SQLModel, Session, create_engine
+
+from backend.core.cache import cache, clave_tienda_productos
+from backend.CRUD.Crud_Pedido import StockInsuficiente, crear_pedido
+from backend.db.pool import instalar_eventos
+from backend.Modelos.Producto import Producto
+from backend.Modelos.Vendedor import Vendedor
+
+
+@pytest.fixture(scope="module")
+def productos(client):
+    client.post("/vendedores/", json={
+        "id_vendedor": 890001,
+        "nombre": "Vendedor Pedidos",
+        "email": "pedidos@example.com",
+        "password": "secreto123",
+    })
+
+    def crear(nombre, precio, stock):
+        return client.post("/productos/", json={
+            "nombre": nombre, "precio": precio, "stock": stock, "id_vendedor": 890001,
+        }).json()["id"]
+
+    return {"camiseta": crear("Camiseta", 10.0, 10), "gorra": crear("Gorra", 20.0, 10)}
+
+
+def _pedido(comprador_id, productos, **extra):
+    data = {
+        "comprador_id": comprador_id,
+        "nombre_cliente": "Ana",
+        "email_cliente": "ana@example.com",
+        "direccion": "Calle 1",
+        "metodo_pago": "contra_entrega",
+        "estado": "pendiente_entrega",
+        "items": [
+            # El precio del cliente se ignora: manda el catálogo
+            {"producto_id": productos["camiseta"], "nombre": "Camiseta", "precio": 0.01, "cantidad": 1},
+            {"producto_id": productos["gorra"], "nombre": "Gorra", "precio": 20.0, "cantidad": 1},
+        ],
+    }
+    data.update(extra)
+    return data
+
+
+def _stock(client, producto_id):
+    return client.get(f"/productos/{producto_id}").json()["stock"]
+
+
+def test_crear_y_listar_pedidos_por_comprador(client, productos):
+    r = client.post("/pedidos/", json=_pedido(7001, productos))
+    assert r.status_code == 200
+    creado = r.json()
+    assert creado["id"] > 0
+    assert len(creado["items"]) == 2
+    assert creado["total"] == 30.0
+    assert creado["items"][0]["precio"] == 10.0
+
+    client.post("/pedidos/", json=_pedido(7002, productos))
+
+    r = client.get("/pedidos/", params={"comprador_id": 7001})
+    assert r.status_code == 200
+    pedidos = r.json()
+    assert [p["comprador_id"] for p in pedidos] == [7001]
+    assert pedidos[0]["items"][1]["nombre"] == "Gorra"
+
+
+def test_listar_pedidos_paginado(client, productos):
+    for _ in range(3):
+        client.post("/pedidos/", json=_pedido(7008, productos))
+    r = client.get("/pedidos/", params={"comprador_id": 7008, "limit": 2})
+    assert r.status_code == 200 and len(r.json()) == 2
+    ids = [p["id"] for p in r.json()]
+    assert ids == sorted(ids, reverse=True)  # más recientes primero
+
+    primera = client.get("/pedidos/", params={"comprador_id": 7008, "limit": 2, "cursor": ""})
+    cursor = primera.headers["X-Next-Cursor"]
+    resto = client.get("/pedidos/", params={"comprador_id": 7008, "limit": 2, "cursor": cursor})
+    assert len(resto.json()) == 1 and "X-Next-Cursor" not in resto.headers
+    assert client.get("/pedidos/", params={"limit": 1000}).status_code == 422
+
+
+def test_actualizar_pedido(client, productos):
+    pedido_id = client.post("/pedidos/", json=_pedido(7003, productos)).json()["id"]
+
+    r = client.put(f"/pedidos/{pedido_id}", json={"estado": "entregado"})
+    assert r.status_code == 200
+    assert r.json()["estado"] == "entregado"
+    assert len(r.json()["items"]) == 2
+
+    r = client.put("/pedidos/999999", json={"estado": "entregado"})
+    assert r.status_code == 404
+
+
+def test_stock_insuficiente_no_reserva_nada(client, productos):
+    antes = _stock(client, productos["camiseta"]), _stock(client, productos["gorra"])
+    items = [
+        {"producto_id": productos["camiseta"], "cantidad": 1},
+        {"producto_id": productos["gorra"], "cantidad": 1000},
+    ]
+    r = client.post("/pedidos/", json=_pedido(7004, productos, items=items))
+    assert r.status_code == 409
+    assert (_stock(client, productos["camiseta"]), _stock(client, productos["gorra"])) == antes
+
+    items = [{"producto_id": 987654, "cantidad": 1}]
+    assert client.post("/pedidos/", json=_pedido(7004, productos, items=items)).status_code == 400
+
+
+def test_no_se_crea_pedido_en_estado_final(client, productos):
+    antes = _stock(client, productos["camiseta"])
+    for estado in ("cancelado", "entregado"):
+        r = client.post("/pedidos/", json=_pedido(7006, productos, estado=estado))
+        assert r.status_code == 422
+    assert _stock(client, productos["camiseta"]) == antes
+
+
+def test_cancelar_libera_stock_una_sola_vez(client, productos):
+    antes = _stock(client, productos["camiseta"])
+    pedido_id = client.post("/pedidos/", json=_pedido(7005, productos)).json()["id"]
+    assert _stock(client, productos["camiseta"]) == antes - 1
+
+    assert client.put(f"/pedidos/{pedido_id}", json={"estado": "cancelado"}).status_code == 200
+    assert client.put(f"/pedidos/{pedido_id}", json={"estado": "cancelado"}).status_code == 200
+    assert _stock(client, productos["camiseta"]) == antes
+
+    r = client.put(f"/pedidos/{pedido_id}", json={"estado": "pendiente_entrega"})
+    assert r.status_code == 409
+
+
+def test_stock_de_tienda_invalidado_al_crear_y_cancelar_pedido(client):
+    client.post("/vendedores/", json={
+        "id_vendedor": 890003,
+        "nombre": "Vendedor Pedidos Cache",
+        "email": "cache.pedidos@example.com",
+        "password": "secreto123",
+    })
+    client.post("/tiendas/", json={
+        "id_vendedor": 890003, "nombre_negocio": "Pedidos Cache", "slug": "tienda-pedidos-cache",
+    })
+    producto_id = client.post("/productos/", json={
+        "id_vendedor": 890003, "nombre": "Taza", "precio": 5, "stock": 4,
+    }).json()["id"]
+
+    client.post("/vendedores/", json={
+        "id_vendedor": 890004, "nombre": "Vendedor Ajeno", "email": "ajeno.pedidos@example.com",
+        "password": "secreto123",
+    })
+    client.post("/tiendas/", json={"id_vendedor": 890004, "nombre_negocio": "Ajena", "slug": "tienda-ajena"})
+    client.get("/tiendas/tienda-ajena/productos")
+
+    def stock():
+        return client.get("/tiendas/tienda-pedidos-cache/productos").json()[0]["stock"]
+
+    assert stock() == 4
+    pedido_id = client.post("/pedidos/", json={
+        "comprador_id": 1, "nombre_cliente": "Ana", "email_cliente": "ana@example.com",
+        "direccion": "Calle 1", "metodo_pago": "contra_entrega",
+        "items": [{"producto_id": producto_id, "cantidad": 3}],
+    }).json()["id"]
+    assert stock() == 1
+    client.put(f"/pedidos/{pedido_id}", json={"estado": "cancelado"})
+    assert stock() == 4
+    # Solo se invalidan las tiendas del pedido
+    assert cache.local.obtener(clave_tienda_productos("tienda-ajena")) is not None
+
+
+def test_cancelar_entregado_no_repone_stock(client, productos):
+    pedido_id = client.post("/pedidos/", json=_pedido(7007, productos)).json()["id"]
+    antes = _stock(client, productos["camiseta"])
+    assert client.put(f"/pedidos/{pedido_id}", json={"estado": "entregado"}).status_code == 200
+    assert client.put(f"/pedidos/{pedido_id}", json={"estado": "cancelado"}).status_code == 200
+    assert _stock(client, productos["camiseta"]) == antes
+
+
+def test_sin_sobreventa_con_100_compradores_en_paralelo(tmp_path):
+    # BD en archivo (WAL + busy_timeout): conexiones reales y concurrentes
+    url = f"sqlite:///{tmp_path / 'stock.db'}"
+    engine = create_engine(url, connect_args={"check_same_thread": False}, pool_size=20, max_overflow=100)
+    instalar_eventos(engine, url)
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as s:
+        v = Vendedor(id_vendedor=1, nombre="V", email="v@example.com", password="x")
+        s.add(v)
+        s.flush()
+        a = Producto(nombre="A", precio=5.0, stock=30, vendedor_id=v.id)
+        b = Producto(nombre="B", precio=7.0, stock=50, vendedor_id=v.id)
+        s.add_all([a, b])
+        s.commit()
+        ids = a.id, b.id
+
+    def comprar(n):
+        items = [{"producto_id": ids[1], "cantidad": 1}, {"producto_id": ids[0], "cantidad": 1}]
+        with Session(engine) as s:
+            try:
+                crear_pedido(
+                    s, items, comprador_id=n, nombre_cliente="x", email_cliente="x@example.com",
+                    direccion="x", metodo_pago="tarjeta",
+                )
+                return True
+            except StockInsuficiente:
+                return False
+
+    with ThreadPoolExecutor(max_workers=100) as ex:
+        resultados = list(ex.map(comprar, range(100)))
+
+    with Session(engine) as s:
+        assert (s.get(Producto, ids[0]).stock, s.get(Producto, ids[1]).stock) == (0, 20)
+    assert sum(resultados) == 30
+    engine.dispose()
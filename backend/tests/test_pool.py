@@ -0,0 +1,60 @@
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import NullPool
+
+from backend.db.pool import (
+    PoolMedido, estadisticas_pool, es_pgbouncer, instalar_eventos, opciones_engine, preparar_url,
+)
+
+PG = "postgresql+psycopg2://u:p@pooler.example.com:6543/postgres"
+
+
+def test_opciones_por_entorno(monkeypatch):
+    monkeypatch.setenv("DB_POOL_SIZE", "3")
+    monkeypatch.setenv("DB_MAX_OVERFLOW", "2")
+    monkeypatch.setenv("DB_PRE_PING", "never")
+    opts = opciones_engine(PG)
+    assert opts["poolclass"] is PoolMedido
+    assert (opts["pool_size"], opts["max_overflow"]) == (3, 2)
+    assert "pool_pre_ping" not in opts
+
+    monkeypatch.setenv("DB_POOL_MODE", "null")
+    assert opciones_engine(PG)["poolclass"] is NullPool
+
+
+def test_pgbouncer_desactiva_prepared_statements_async(monkeypatch):
+    assert es_pgbouncer(PG)
+    opts = opciones_engine(PG.replace("psycopg2", "asyncpg"), async_=True)
+    assert opts["connect_args"]["statement_cache_size"] == 0
+
+    monkeypatch.setenv("DB_PGBOUNCER", "0")
+    assert "connect_args" not in opciones_engine(PG.replace("psycopg2", "asyncpg"), async_=True)
+
+
+def test_sqlite_wal_y_shared_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("DB_SQLITE_SHARED_CACHE", "1")
+    url = f"sqlite:///{tmp_path / 'wal.db'}"
+    assert "cache=shared" in preparar_url(url)
+
+    engine = create_engine(preparar_url(url), **opciones_engine(url))
+    instalar_eventos(engine, url)
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+
+
+def test_estadisticas_de_espera(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'p.db'}", poolclass=PoolMedido, pool_size=1, max_overflow=0,
+    )
+    with engine.connect() as conn:
+        conn.execute(text("select 1"))
+        stats = estadisticas_pool(engine)
+        assert stats["en_uso"] == 1
+    stats = estadisticas_pool(engine)
+    assert stats["en_uso"] == 0
+    assert stats["espera"]["checkouts"] == 1
+
+
+def test_endpoint_healthz_db(client):
+    r = client.get("/healthz/db")
+    assert r.status_code == 200
+    assert "sync" in r.json()
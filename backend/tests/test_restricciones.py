@@ -0,0 +1,106 @@
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
+
+from backend.db.restricciones import restriccion_violada
+from backend.Modelos.Tienda import Tienda
+from backend.Modelos.Vendedor import Vendedor
+from backend.tests.conftest import engine
+
+
+class _Contador:
+    def __init__(self):
+        self.sentencias = []
+
+    def __call__(self, conn, cursor, statement, *a):
+        self.sentencias.append(statement.split()[0].upper())
+
+    def __enter__(self):
+        event.listen(engine, "before_cursor_execute", self)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(engine, "before_cursor_execute", self)
+
+
+def _vendedor(id_vendedor, email):
+    return {"id_vendedor": id_vendedor, "nombre": "Vendedor Unico", "email": email, "password": "secreto123"}
+
+
+def test_vendedor_duplicado_sin_select_previo(client):
+    assert client.post("/vendedores/", json=_vendedor(950301, "unico@example.com")).status_code == 201
+
+    with _Contador() as c:
+        r = client.post("/vendedores/", json=_vendedor(950301, "otro.unico@example.com"))
+    assert r.status_code == 400
+    assert r.json()["detail"] == "Ya existe un vendedor con ese id_vendedor"
+    assert "SELECT" not in c.sentencias
+
+    r = client.post("/vendedores/", json=_vendedor(950302, "unico@example.com"))
+    assert r.json()["detail"] == "Ya existe un vendedor con ese email"
+
+    client.post("/vendedores/", json=_vendedor(950303, "tercero.unico@example.com"))
+    r = client.put("/vendedores/950303", json={"email": "unico@example.com"})
+    assert r.status_code == 400
+    assert r.json()["detail"] == "Ya existe otro vendedor con ese email"
+
+
+def test_tienda_duplicada(client):
+    client.post("/vendedores/", json=_vendedor(950304, "tienda.unica@example.com"))
+    client.post("/vendedores/", json=_vendedor(950305, "tienda.unica2@example.com"))
+    tienda = {"id_vendedor": 950304, "nombre_negocio": "Única", "slug": "unica-950304"}
+    assert client.post("/tiendas/", json=tienda).status_code == 201
+
+    r = client.post("/tiendas/", json={**tienda, "slug": "otra-950304"})
+    assert r.status_code == 400
+    assert r.json()["detail"] == "El vendedor ya tiene una tienda creada."
+
+    r = client.post("/tiendas/", json={**tienda, "id_vendedor": 950305})
+    assert r.status_code == 400
+    assert r.json()["detail"] == "El slug ya está en uso, elija otro."
+
+    assert client.post("/tiendas/", json={**tienda, "id_vendedor": 950305, "slug": "unica-950305"}).status_code == 201
+    r = client.put("/tiendas/vendedor/950305", json={"slug": "unica-950304"})
+    assert r.status_code == 400
+    assert r.json()["detail"] == "El nuevo slug ya está en uso, elija otro."
+    assert client.get("/tiendas/unica-950305").status_code == 200
+
+
+def test_categoria_y_admin_duplicados(client):
+    assert client.post("/categorias/", json={"nombre": "Única 950306"}).status_code == 201
+    r = client.post("/categorias/", json={"nombre": "Única 950306"})
+    assert (r.status_code, r.json()["detail"]) == (400, "La categoría ya existe")
+
+    otra = client.post("/categorias/", json={"nombre": "Otra 950306"}).json()
+    r = client.put(f"/categorias/{otra['id']}", json={"nombre": "Única 950306"})
+    assert (r.status_code, r.json()["detail"]) == (400, "Ya existe una categoría con ese nombre")
+
+    admin = {"id_admin": 950307, "nombre": "Admin", "email": "admin.unico@example.com",
+             "password": "secreto123", "nivel_acceso": "total"}
+    assert client.post("/administradores/", json=admin).status_code == 200
+    r = client.post("/administradores/", json={**admin, "id_admin": 950308})
+    assert (r.status_code, r.json()["detail"]) == (400, "El email ya está en uso")
+
+
+class _Diag:
+    constraint_name = "uq_vendedores_email"
+
+
+class _ErrorPostgres(Exception):
+    diag = _Diag()
+
+
+def test_restriccion_por_nombre_o_columnas():
+    e = IntegrityError("INSERT ...", {}, _ErrorPostgres("duplicate key"))
+    assert restriccion_violada(e, Vendedor.__table__) == "uq_vendedores_email"
+
+    # Restricción creada con otro nombre: se reconoce por las columnas del DETAIL
+    orig = Exception('duplicate key value violates unique constraint "tiendas_slug_key"\n'
+                     'DETAIL:  Key (slug)=(x) already exists.')
+    e = IntegrityError("INSERT ...", {}, orig)
+    assert restriccion_violada(e, Tienda.__table__) == "ix_tiendas_slug"
+
+    e = IntegrityError("INSERT ...", {}, Exception("UNIQUE constraint failed: tiendas.vendedor_id"))
+    assert restriccion_violada(e, Tienda.__table__) == "ix_tiendas_vendedor_id"
+
+    e = IntegrityError("INSERT ...", {}, Exception("FOREIGN KEY constraint failed"))
+    assert restriccion_violada(e, Tienda.__table__) is None
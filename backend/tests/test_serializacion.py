@@ -0,0 +1,37 @@
+from sqlmodel import Session, select
+
+from backend.Modelos import Comprador, Producto
+from backend.Routers.Compradores import CompradorRead
+from backend.Routers.Productos import ProductoRead
+from backend.tests.conftest import engine
+
+
+def _clasico(modelo, esquema, ids):
+    with Session(engine) as s:
+        objs = s.exec(select(modelo).where(modelo.id.in_(ids))).all()
+        return {o.id: esquema.model_validate(o, from_attributes=True).model_dump(mode="json") for o in objs}
+
+
+def test_productos_igual_que_el_camino_clasico(client):
+    client.post("/vendedores/", json={
+        "id_vendedor": 940001, "nombre": "Vendedor Json", "email": "json@example.com", "password": "secreto123",
+    })
+    for i in range(3):
+        client.post("/productos/", json={
+            "nombre": f"Json {i}", "precio": 2.5 * i, "stock": i, "id_vendedor": 940001, "destacado": i == 1,
+        })
+    r = client.get("/productos/", params={"id_vendedor": 940001, "cursor": "", "limit": 2})
+    assert r.headers["content-type"] == "application/json"
+    assert "ETag" in r.headers and "X-Next-Cursor" in r.headers
+
+    rapidos = {p["id"]: p for p in r.json()}
+    assert rapidos == _clasico(Producto, ProductoRead, list(rapidos))
+
+
+def test_compradores_igual_que_el_camino_clasico(client):
+    client.post("/compradores/", json={
+        "id_comprador": 940001, "nombre": "Json", "email": "json-c@example.com", "password": "x",
+        "direccion": "Calle Json",
+    })
+    rapidos = {c["id"]: c for c in client.get("/compradores/", params={"direccion": "calle json"}).json()}
+    assert rapidos and rapidos == _clasico(Comprador, CompradorRead, list(rapidos))
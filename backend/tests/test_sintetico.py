@@ -0,0 +1,109 @@
+# backend/tests/test_sintetico.py
+import csv
+import io
+
+import pytest
+from sqlalchemy import func
+from sqlmodel import Session, create_engine, select
+
+from backend.bench import sintetico
+from backend.bench.sintetico import Volumen, generar
+from backend.Modelos import Pedido, PedidoDetalle, Producto, Vendedor
+from backend.Modelos.common import EstadoCuenta
+
+VOLUMEN = Volumen(vendedores=8, productos=500, categorias=4, compradores=30, pedidos=120)
+
+
+def _engine(tmp_path, nombre="sintetico.db"):
+    return create_engine(f"sqlite:///{tmp_path / nombre}")
+
+
+def _catalogo(engine):
+    with Session(engine) as s:
+        return s.exec(select(Producto.nombre, Producto.precio, Producto.vendedor_id).order_by(Producto.id)).all()
+
+
+def test_generar_carga_filas_legibles_por_el_orm(tmp_path):
+    engine = _engine(tmp_path)
+    res = generar(engine, VOLUMEN, semilla=3, motor="python", tamano_bloque=64)
+    assert res["productos"]["filas"] == 500 and res["pedidos"]["filas"] == 120
+    assert res["pedido_items"]["filas"] >= 120
+
+    with Session(engine) as s:
+        vendedor = s.get(Vendedor, 1)
+        assert vendedor.estado_cuenta == EstadoCuenta.activo
+        producto = s.get(Producto, 500)
+        assert producto.created_at.year == 2025 and isinstance(producto.destacado, bool)
+        # Cola larga: la tienda más grande tiene bastante más que el promedio
+        mayor = s.exec(
+            select(func.count()).select_from(Producto).group_by(Producto.vendedor_id).order_by(func.count().desc())
+        ).first()
+        assert mayor > 500 / 8
+        # El total de cada pedido cuadra con sus líneas
+        pedido = s.get(Pedido, 1)
+        lineas = s.exec(select(PedidoDetalle).where(PedidoDetalle.pedido_id == 1)).all()
+        assert pedido.total == pytest.approx(sum(l.precio * l.cantidad for l in lineas), abs=0.01)
+
+
+def test_generar_es_determinista_por_semilla(tmp_path):
+    a, b, c = _engine(tmp_path, "a.db"), _engine(tmp_path, "b.db"), _engine(tmp_path, "c.db")
+    generar(a, VOLUMEN, semilla=3, motor="python", tamano_bloque=64)
+    generar(b, VOLUMEN, semilla=3, motor="python", tamano_bloque=64)
+    generar(c, VOLUMEN, semilla=4, motor="python", tamano_bloque=64)
+    assert _catalogo(a) == _catalogo(b)
+    assert _catalogo(a) != _catalogo(c)
+
+
+def test_generar_rechaza_bd_con_datos(tmp_path):
+    engine = _engine(tmp_path)
+    generar(engine, VOLUMEN, motor="python")
+    with pytest.raises(ValueError):
+        generar(engine, VOLUMEN, motor="python")
+    with Session(engine) as s:
+        assert s.exec(select(func.count()).select_from(Producto)).one() == 500  # nada a medias
+
+
+def test_motor_numpy(tmp_path, monkeypatch):
+    if sintetico.np is None:
+        with pytest.raises(RuntimeError):
+            sintetico.elegir_motor("numpy")
+        assert sintetico.elegir_motor("auto").motor == "python"
+        return
+    engine = _engine(tmp_path)
+    assert generar(engine, VOLUMEN, motor="numpy")["productos"]["filas"] == 500
+    monkeypatch.setattr(sintetico, "np", None)
+    assert sintetico.elegir_motor("auto").motor == "python"
+
+
+def test_motor_numpy_arma_productos_y_pedidos_por_columnas(tmp_path):
+    pytest.importorskip("numpy")
+    a, b = _engine(tmp_path, "a.db"), _engine(tmp_path, "b.db")
+    res = generar(a, VOLUMEN, semilla=3, motor="numpy", tamano_bloque=64)
+    generar(b, VOLUMEN, semilla=3, motor="numpy", tamano_bloque=64)
+    assert res["productos"]["filas"] == 500 and res["pedidos"]["filas"] == 120
+    assert _catalogo(a) == _catalogo(b)
+
+    with Session(a) as s:
+        producto = s.get(Producto, 500)
+        assert producto.nombre.endswith(" 500") and producto.descripcion.startswith(tuple(sintetico.ADJETIVOS))
+        assert producto.created_at.year == 2025 and isinstance(producto.destacado, bool)
+        assert s.exec(select(func.count()).select_from(Producto).where(Producto.category_id == None)).one() == 0
+        for pedido_id in (1, 120):
+            pedido = s.get(Pedido, pedido_id)
+            lineas = s.exec(select(PedidoDetalle).where(PedidoDetalle.pedido_id == pedido_id)).all()
+            assert lineas and pedido.total == pytest.approx(sum(l.precio * l.cantidad for l in lineas), abs=0.01)
+            assert pedido.email_cliente == f"comprador{pedido.comprador_id - sintetico.ID_COMPRADOR_BASE}@bench.example.com"
+            assert all(l.nombre.endswith(f" {l.producto_id}") for l in lineas)
+
+
+def test_csv_por_columnas_igual_al_de_csv_writer():
+    pytest.importorskip("numpy")
+    volumen = Volumen(vendedores=3, productos=40, categorias=0, compradores=5, pedidos=10)
+    gen = sintetico._GeneradorNumpy(volumen, 1, sintetico.elegir_motor("numpy"), 16)
+    bloques = [("productos", b) for b in gen.productos()] + list(gen.pedidos())
+    for tabla, bloque in bloques:
+        filas = list(bloque.filas())
+        assert len(filas) == len(bloque) and len(filas[0]) == len(sintetico._COLUMNAS[tabla])
+        esperado = io.StringIO()
+        csv.writer(esperado, lineterminator="\n").writerows(filas)
+        assert bloque.csv() == esperado.getvalue()
@@ -0,0 +1,99 @@
+import os
+import subprocess
+import sys
+
+import pytest
+from sqlalchemy import event
+
+from backend.core import tokens
+from backend.tests.conftest import engine
+
+
+def _login_vendedor(client, email="token@example.com"):
+    r = client.post("/vendedores/login", json={"email": email, "password": "secreto123"})
+    assert r.status_code == 200
+    return r.json()
+
+
+@pytest.fixture(scope="module")
+def vendedor(client):
+    client.post("/vendedores/", json={
+        "id_vendedor": 950201,
+        "nombre": "Vendedor Token",
+        "email": "token@example.com",
+        "password": "secreto123",
+    })
+
+
+def test_token_firmado_y_verificado():
+    token, sesion = tokens.emitir_token(tokens.ROL_COMPRADOR, 5, 77, "activo")
+    assert tokens.verificar_token(token) == sesion
+
+    cuerpo, firma = token.split(".")
+    with pytest.raises(ValueError):
+        tokens.verificar_token(cuerpo + "." + firma[:-2] + "xx")
+    otro, _ = tokens.emitir_token(tokens.ROL_ADMIN, 5, 77, "activo")
+    with pytest.raises(ValueError):
+        tokens.verificar_token(otro.split(".")[0] + "." + firma)  # cuerpo ajeno
+
+
+def test_token_vencido(monkeypatch):
+    monkeypatch.setattr(tokens, "TTL", -1)
+    token, _ = tokens.emitir_token(tokens.ROL_COMPRADOR, 5, 77, "activo")
+    with pytest.raises(ValueError, match="vencido"):
+        tokens.verificar_token(token)
+
+
+def test_login_entrega_token_y_sesion_sin_consultas(client, vendedor):
+    datos = _login_vendedor(client)
+    assert datos["token_type"] == "bearer" and datos["id_vendedor"] == 950201
+
+    consultas = []
+    contar = lambda *a, **k: consultas.append(1)
+    event.listen(engine, "before_cursor_execute", contar)
+    try:
+        r = client.get("/sesion/", headers={"Authorization": f"Bearer {datos['token']}"})
+    finally:
+        event.remove(engine, "before_cursor_execute", contar)
+    assert r.status_code == 200
+    assert r.json()["rol"] == "vendedor" and r.json()["id_manual"] == 950201
+    assert consultas == []
+
+    assert client.get("/sesion/").status_code == 401
+    assert client.get("/sesion/", headers={"Authorization": "Bearer basura"}).status_code == 401
+
+
+def test_bloquear_cuenta_revoca_tokens(client, vendedor):
+    token = _login_vendedor(client)["token"]
+    cabecera = {"Authorization": f"Bearer {token}"}
+    assert client.get("/sesion/", headers=cabecera).status_code == 200
+
+    r = client.put("/vendedores/950201/estado", json={"estado_cuenta": "bloqueado"})
+    assert r.status_code == 200
+    r = client.get("/sesion/", headers=cabecera)
+    assert r.status_code == 401
+    assert r.json()["detail"] == "Sesión revocada"
+
+    # Reactivada: los tokens nuevos valen, el viejo sigue revocado
+    client.put("/vendedores/950201/estado", json={"estado_cuenta": "activo"})
+    nuevo = _login_vendedor(client)["token"]
+    assert client.get("/sesion/", headers={"Authorization": f"Bearer {nuevo}"}).status_code == 200
+    assert client.get("/sesion/", headers=cabecera).status_code == 401
+
+
+def test_login_admin_no_expone_password(client):
+    client.post("/administradores/", json={
+        "id_admin": 950202, "nombre": "Admin Token", "email": "admin.token@example.com",
+        "password": "secreto123", "nivel_acceso": "total",
+    })
+    r = client.post("/administradores/login", json={"email": "admin.token@example.com", "password": "secreto123"})
+    assert r.status_code == 200
+    assert "password" not in r.json()
+    sesion = client.get("/sesion/", headers={"Authorization": f"Bearer {r.json()['token']}"}).json()
+    assert sesion["rol"] == "admin" and sesion["id_manual"] == 950202
+
+
+def test_varios_workers_sin_cache_compartido_no_arranca():
+    env = {**os.environ, "TESTING": "1", "WEB_CONCURRENCY": "2", "CACHE_BACKEND": "memoria"}
+    r = subprocess.run([sys.executable, "-c", "import backend.core.tokens"], capture_output=True, text=True, env=env)
+    assert r.returncode != 0 and "CACHE_BACKEND" in r.stderr